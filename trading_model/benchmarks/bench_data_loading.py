@@ -0,0 +1,133 @@
+"""
+bench_data_loading.py
+
+Benchmarks for the CSV loading path of the data pipeline.
+
+Benchmarks:
+    - Cold load: `pd.read_csv` on the raw CryptoDataDownload export (what load_csv_data does without a cache).
+    - Cache build: first load through the columnar cache (parse + write).
+    - Warm load: later loads served from the columnar cache.
+    - Memory: resident size of the default load versus the lean schema (float64 and float32).
+    - Time window: loading the most recent 30 days versus loading everything and slicing.
+
+Usage:
+    Run from the trading_model directory:
+        python -m benchmarks.bench_data_loading [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic_data import make_ohlcv_frame, write_ohlcv_csv
+from src.data_cache import load_csv_cached, invalidate_cache
+from src.data_pipeline import load_csv_data
+
+
+def _best_of(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_cache(rows):
+    """
+    Compare cold CSV parsing with cache build and warm cached loads.
+
+    Parameters:
+        rows (int): Number of hourly bars in the synthetic CSV.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_file = os.path.join(tmp, "Binance_BTCUSDT_1h.csv")
+        cache_dir = os.path.join(tmp, "cache")
+        write_ohlcv_csv(make_ohlcv_frame(rows), csv_file)
+
+        cold = _best_of(lambda: pd.read_csv(csv_file, skiprows=1))
+
+        def build():
+            invalidate_cache(cache_dir, csv_file)
+            load_csv_cached(csv_file, cache_dir, skiprows=1)
+
+        build_time = _best_of(build)
+        warm = _best_of(lambda: load_csv_cached(csv_file, cache_dir, skiprows=1))
+
+    print(f"Columnar cache ({rows:,} rows, file {os.path.basename(csv_file)})")
+    print(f"  cold read_csv : {cold * 1000:9.1f} ms")
+    print(f"  cache build   : {build_time * 1000:9.1f} ms")
+    print(f"  warm cached   : {warm * 1000:9.1f} ms  ({cold / warm:.1f}x faster than cold)")
+
+
+def bench_memory(rows):
+    """
+    Compare the memory held by the default loader and the lean schema.
+
+    Parameters:
+        rows (int): Number of hourly bars in the synthetic CSV.
+
+    Notes:
+        - "frame" is the DataFrame's deep memory usage; "peak" is the peak traced allocation while loading.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_file = os.path.join(tmp, "Binance_BTCUSDT_1h.csv")
+        write_ohlcv_csv(make_ohlcv_frame(rows), csv_file)
+
+        print(f"Loader memory ({rows:,} rows)")
+        baseline = None
+        for label, kwargs in [("default", {}), ("lean", {"lean": True}), ("lean float32", {"lean": True, "float32": True})]:
+            tracemalloc.start()
+            start = time.perf_counter()
+            df, _ = load_csv_data(csv_file, csv_file, **kwargs)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            frame_bytes = df.memory_usage(deep=True).sum()
+            baseline = baseline or frame_bytes
+            print(f"  {label:<13}: frame {frame_bytes / 2**20:8.1f} MiB ({frame_bytes / baseline:6.1%})"
+                  f"  peak {peak / 2**20:8.1f} MiB  time {elapsed * 1000:8.1f} ms (both files)")
+            del df
+
+
+def bench_window(rows, days=30):
+    """
+    Compare loading a recent time window with loading the full history and slicing it.
+
+    Parameters:
+        rows (int): Number of hourly bars in the synthetic CSV.
+        days (int, optional): Length of the requested window in days. Default is 30.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_file = os.path.join(tmp, "Binance_BTCUSDT_1h.csv")
+        frame = make_ohlcv_frame(rows)
+        write_ohlcv_csv(frame, csv_file)
+        end = int(frame["Unix"].iloc[-1])
+        start = end - days * 86_400_000
+
+        def full_then_slice():
+            df, _ = load_csv_data(csv_file, csv_file)
+            return df[(df["Unix"] >= start) & (df["Unix"] <= end)]
+
+        cache_dir = os.path.join(tmp, "cache")
+        store_dir = os.path.join(tmp, "store")
+        load_csv_data(csv_file, csv_file, cache_dir=cache_dir)
+        load_csv_data(csv_file, csv_file, store_dir=store_dir)
+
+        print(f"Time window ({days} days of {rows:,} hourly rows, both files)")
+        baseline = _best_of(full_then_slice)
+        print(f"  full load + slice : {baseline * 1000:9.1f} ms")
+        for label, kwargs in [("chunked CSV", {}), ("columnar cache", {"cache_dir": cache_dir}),
+                              ("ingestion store", {"store_dir": store_dir})]:
+            elapsed = _best_of(lambda: load_csv_data(csv_file, csv_file, start=start, end=end, **kwargs))
+            print(f"  {label:<17} : {elapsed * 1000:9.1f} ms  ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    bench_cache(rows)
+    bench_memory(rows)
+    bench_window(rows)
@@ -0,0 +1,102 @@
+"""
+bench_data_normalize.py
+
+Benchmarks for feature normalization.
+
+Benchmarks:
+    - Refit versus reuse: sklearn MinMaxScaler.fit_transform on every run (the previous
+      normalize_data) versus Normalizer.partial_fit over chunks once, then transform_array in place
+      on a float32 matrix.
+    - Rolling: pandas rolling mean/std and min/max over a frame versus normalize_data's rolling_zscore
+      and rolling_minmax, and RollingNormalizer updates per bar.
+
+Usage:
+    Run from the trading_model directory:
+        python -m benchmarks.bench_data_normalize [rows]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+
+from src.data_normalize import Normalizer, RollingNormalizer, normalize_data
+
+
+def _best_of(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_normalizer(rows, columns=20):
+    """
+    Compare refitting sklearn's scaler with a fitted Normalizer.
+
+    Parameters:
+        rows (int): Number of rows.
+        columns (int, optional): Number of feature columns. Default is 20.
+    """
+    values = np.random.default_rng(0).normal(size=(rows, columns))
+    features = values.astype(np.float32)
+    print(f"Normalization ({rows:,} rows x {columns} columns)")
+    refit = _best_of(lambda: MinMaxScaler().fit_transform(values))
+    print(f"  sklearn fit_transform      : {refit * 1000:8.1f} ms")
+
+    def fit_chunks():
+        normalizer = Normalizer("minmax")
+        for start in range(0, rows, 100_000):
+            normalizer.partial_fit(values[start:start + 100_000])
+        return normalizer
+
+    fit = _best_of(fit_chunks)
+    print(f"  Normalizer partial_fit     : {fit * 1000:8.1f} ms  (once, chunks of 100,000)")
+    normalizer = fit_chunks()
+    apply = _best_of(lambda: normalizer.transform_array(features))
+    print(f"  transform_array float32    : {apply * 1000:8.1f} ms  ({refit / apply:.1f}x vs refit)")
+
+
+def bench_rolling(rows, columns=10, window=168):
+    """
+    Compare pandas rolling normalization with the rolling methods of normalize_data.
+
+    Parameters:
+        rows (int): Number of rows.
+        columns (int, optional): Number of feature columns. Default is 10.
+        window (int, optional): Window length in bars. Default is 168 (one week of hourly bars).
+    """
+    values = 30000 + np.cumsum(np.random.default_rng(0).normal(0, 50, (rows, columns)), axis=0)
+    frame = pd.DataFrame(values, columns=[f"feature{i}" for i in range(columns)])
+    print(f"Rolling normalization ({rows:,} rows x {columns} columns, window {window})")
+
+    def pandas_zscore():
+        rolling = frame.rolling(window)
+        return (frame - rolling.mean()) / rolling.std(ddof=0)
+
+    def pandas_minmax():
+        low = frame.rolling(window).min()
+        return (frame - low) / (frame.rolling(window).max() - low)
+
+    for method, reference in [("rolling_zscore", pandas_zscore), ("rolling_minmax", pandas_minmax)]:
+        loop = _best_of(reference)
+        elapsed = _best_of(lambda: normalize_data(frame.copy(deep=False), method=method, window=window))
+        print(f"  {method:<15}: pandas {loop * 1000:8.1f} ms  normalize_data {elapsed * 1000:8.1f} ms  "
+              f"({loop / elapsed:.1f}x)")
+        streaming = RollingNormalizer(window, method)
+        streaming.update_many(values[:window])
+        updates = 10_000
+        start = time.perf_counter()
+        for row in values[window:window + updates]:
+            streaming.update(row)
+        per_update = (time.perf_counter() - start) / updates
+        print(f"  {'':<15}  streaming update {per_update * 1e6:6.1f} us per bar ({columns} columns)")
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    bench_normalizer(rows)
+    bench_rolling(rows)
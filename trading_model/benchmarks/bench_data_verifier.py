@@ -0,0 +1,61 @@
+"""
+bench_data_verifier.py
+
+Benchmarks for the integrity scan of the data verifier.
+
+Benchmarks:
+    - Clean data: scan_integrity on newest-first bars with no problems (the common case on ingest).
+    - Damaged data: the same bars with swapped rows, duplicates, gaps and bad prices, which forces the
+      argsort fallback for the timestamp checks.
+
+Usage:
+    Run from the trading_model directory:
+        python -m benchmarks.bench_data_verifier [rows]
+"""
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic_data import make_ohlcv_frame
+from src.data_verifier import scan_integrity
+
+
+def _best_of(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_scan(rows):
+    """
+    Time scan_integrity on clean and damaged bars.
+
+    Parameters:
+        rows (int): Number of hourly bars.
+    """
+    clean = make_ohlcv_frame(rows, labels=False).iloc[::-1].reset_index(drop=True)
+    damaged = clean.copy()
+    rng = np.random.default_rng(0)
+    picks = rng.choice(rows - 3, size=(5, 100), replace=False)
+    unix = damaged["Unix"].to_numpy(copy=True)
+    unix[picks[0]] = unix[picks[0] + 1]
+    unix[picks[4]], unix[picks[4] + 2] = unix[picks[4] + 2], unix[picks[4]]
+    damaged["Unix"] = unix
+    damaged.loc[picks[1], "Volume BTC"] = 0.0
+    damaged.loc[picks[2], "High"] = damaged.loc[picks[2], "Low"] - 1
+    damaged.loc[picks[3], "Close"] = damaged.loc[picks[3], "High"] + 1
+
+    print(f"Integrity scan ({rows:,} rows)")
+    for label, frame in [("clean", clean), ("damaged", damaged)]:
+        elapsed = _best_of(lambda: scan_integrity(frame))
+        counts = scan_integrity(frame)["counts"]
+        found = ", ".join(f"{name}={count}" for name, count in counts.items() if count)
+        print(f"  {label:<8}: {elapsed * 1000:8.1f} ms  ({rows / elapsed / 1e6:6.1f} M rows/s)  {found or 'no issues'}")
+
+
+if __name__ == "__main__":
+    bench_scan(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
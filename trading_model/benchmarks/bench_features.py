@@ -0,0 +1,59 @@
+"""
+bench_features.py
+
+Benchmarks for lagged window features.
+
+Benchmarks:
+    - Lag matrix: one `shift(k)` column per lag and feature (concatenated, cast to float32) versus
+      `build_lag_features` over strided views, wall time and peak traced allocations.
+
+Usage:
+    Run from the trading_model directory:
+        python -m benchmarks.bench_features [rows]
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.features import build_lag_features
+
+
+def _measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def bench_lag_matrix(rows, features=10, lags=24):
+    """
+    Compare shift-based lag columns with the strided-view feature builder.
+
+    Parameters:
+        rows (int): Number of bars.
+        features (int, optional): Number of feature columns. Default is 10.
+        lags (int, optional): Number of lags. Default is 24.
+    """
+    data = pd.DataFrame(np.random.default_rng(0).random((rows, features)),
+                        columns=[f"feature{i}" for i in range(features)])
+    output_mib = (rows - lags + 1) * features * lags * 4 / 2**20
+    print(f"Lag matrix ({rows:,} rows x {features} features x {lags} lags, float32 output {output_mib:.0f} MiB)")
+
+    def shifted():
+        columns = {f"{column}_lag{lag}": data[column].shift(lag) for lag in range(lags) for column in data.columns}
+        return pd.concat(columns, axis=1).iloc[lags - 1:].astype(np.float32)
+
+    _, loop, loop_peak = _measure(shifted)
+    print(f"  shift per lag      : {loop * 1000:9.1f} ms  peak {loop_peak / 2**20:8.1f} MiB")
+    _, elapsed, peak = _measure(lambda: build_lag_features(data, lags=lags, returns=()))
+    print(f"  build_lag_features : {elapsed * 1000:9.1f} ms  peak {peak / 2**20:8.1f} MiB  ({loop / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    bench_lag_matrix(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,56 @@
+"""
+bench_hyperparameter_search.py
+
+Benchmarks for the RandomForest hyperparameter search.
+
+Benchmarks:
+    - Full grid versus successive halving, wall time and best score.
+    - Resuming a finished search from its result cache (no retraining), wall time.
+
+Usage:
+    Run from the trading_model directory:
+        python -m benchmarks.bench_hyperparameter_search [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.hyperparameter_search import grid_candidates, search
+from src.validation import walk_forward_splits
+
+
+def bench_search(rows, features=20):
+    """
+    Compare full-grid, halving and resumed searches.
+
+    Parameters:
+        rows (int): Number of bars.
+        features (int, optional): Number of feature columns. Default is 20.
+    """
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(rows, features)), columns=[f"feature{i}" for i in range(features)])
+    y = (X["feature0"] + X["feature1"] * X["feature2"] + rng.normal(size=rows) > 0).astype(int)
+    folds = walk_forward_splits(rows, n_splits=3, purge=24)
+    candidates = grid_candidates({"n_estimators": [50, 100], "max_depth": [4, 8, None],
+                                  "min_samples_leaf": [1, 20], "max_features": ["sqrt", 0.5]})
+    print(f"Hyperparameter search ({rows:,} rows x {features} features, {len(candidates)} candidates, "
+          f"{len(folds)} folds, {os.cpu_count()} CPUs)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, "search.jsonl")
+        for label, kwargs in (("full grid", {"cache_path": cache_path}), ("halving", {"halving": True}),
+                              ("resumed grid", {"cache_path": cache_path})):
+            start = time.perf_counter()
+            results = search(X, y, candidates, folds, **kwargs)
+            elapsed = time.perf_counter() - start
+            best = results.iloc[0]
+            print(f"  {label:<12}: {elapsed:7.2f} s  {len(results):3d} scored  best accuracy "
+                  f"{best['mean_score']:.3f}  cached folds {int(results['cached'].sum())}")
+
+
+if __name__ == "__main__":
+    bench_search(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,196 @@
+"""
+bench_indicators.py
+
+Benchmarks for indicator computation.
+
+Benchmarks:
+    - SMA sweep: windows 5..200, one `rolling().mean()` per window versus `sma_batch` (float64 and float32).
+    - EMA sweep: spans 5..100, one `ewm().mean()` per window versus `ema_batch`.
+    - Backends: add_technical_indicators with the pandas and numpy backends (float64 and float32) on
+      1M and 10M bars, wall time and peak traced allocations.
+    - Panel: add_panel_indicators on a (time x symbol) matrix versus add_technical_indicators per symbol.
+    - Extrema: pandas rolling max/min versus the O(n) rolling_max/rolling_min kernels for short and long
+      windows, plus add_range_indicators on 1M bars.
+    - Volume: rolling/session VWAP, OBV and MFI kernels versus the usual pandas formulations
+      (rolling sums, groupby-cumsum and groupby-apply for the daily reset) on 1M bars.
+
+Usage:
+    Run from the trading_model directory:
+        python -m benchmarks.bench_indicators [sweep_rows]
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic_data import make_ohlcv_frame
+from src.indicators import sma_batch, ema_batch, add_technical_indicators, add_panel_indicators, add_range_indicators
+from src.indicators import rolling_vwap, session_vwap, on_balance_volume, money_flow_index
+from src.indicators_numpy import compute_indicator_arrays, allocate_outputs, rolling_max, rolling_min
+
+
+def _best_of(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_sweeps(rows):
+    """
+    Compare per-window pandas loops with the batched SMA/EMA functions.
+
+    Parameters:
+        rows (int): Number of hourly bars.
+    """
+    close = make_ohlcv_frame(rows, labels=False)["Close"]
+    windows = list(range(5, 201))
+    spans = list(range(5, 101))
+
+    print(f"Indicator sweeps ({rows:,} rows)")
+    loop = _best_of(lambda: [close.rolling(window).mean().to_numpy() for window in windows])
+    print(f"  SMA x{len(windows)} pandas loop : {loop * 1000:9.1f} ms")
+    for label, dtype in [("float64", np.float64), ("float32", np.float32)]:
+        batch = _best_of(lambda: sma_batch(close, windows, dtype=dtype))
+        print(f"  SMA x{len(windows)} sma_batch {label:<7}: {batch * 1000:9.1f} ms  ({loop / batch:.1f}x)")
+
+    loop = _best_of(lambda: [close.ewm(span=span, adjust=False).mean().to_numpy() for span in spans])
+    print(f"  EMA x{len(spans)} pandas loop  : {loop * 1000:9.1f} ms")
+    batch = _best_of(lambda: ema_batch(close, spans))
+    print(f"  EMA x{len(spans)} ema_batch    : {batch * 1000:9.1f} ms  ({loop / batch:.1f}x)")
+
+
+def bench_backends(rows):
+    """
+    Compare the pandas and numpy backends of add_technical_indicators.
+
+    Parameters:
+        rows (int): Number of hourly bars.
+
+    Notes:
+        - "peak" is the peak traced allocation above the input frame while the call runs; both backends
+          include the final dropna copy. "arrays only" reuses preallocated buffers across calls.
+    """
+    close = make_ohlcv_frame(rows, labels=False)["Close"].to_numpy()
+    print(f"Indicator backends ({rows:,} rows)")
+    baseline = None
+    for label, backend, dtype in [("pandas", "pandas", np.float64), ("numpy", "numpy", np.float64),
+                                  ("numpy float32", "numpy", np.float32)]:
+        frame = pd.DataFrame({"Close_1h": close.astype(dtype)})
+        start = time.perf_counter()
+        tracemalloc.start()
+        add_technical_indicators(frame.copy(deep=False), backend=backend)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        elapsed = _best_of(lambda: add_technical_indicators(frame.copy(deep=False), backend=backend), repeat=2)
+        baseline = baseline or elapsed
+        print(f"  {label:<14}: {elapsed * 1000:9.1f} ms ({baseline / elapsed:4.1f}x)  peak {peak / 2**20:8.1f} MiB")
+
+    buffers = allocate_outputs(rows)
+    elapsed = _best_of(lambda: compute_indicator_arrays(close, out=buffers))
+    tracemalloc.start()
+    compute_indicator_arrays(close, out=buffers)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {'arrays only':<14}: {elapsed * 1000:9.1f} ms ({baseline / elapsed:4.1f}x)  peak {peak / 2**20:8.1f} MiB")
+
+
+def bench_panel(rows, symbols):
+    """
+    Compare panel indicators with a per-symbol loop over add_technical_indicators.
+
+    Parameters:
+        rows (int): Number of hourly bars in the panel.
+        symbols (int): Number of symbols; each is listed at a random row in the first half.
+    """
+    rng = np.random.default_rng(0)
+    matrix = np.column_stack([make_ohlcv_frame(rows, labels=False, seed=seed)["Close"].to_numpy()
+                              for seed in range(symbols)])
+    listing = rng.integers(0, rows // 2, symbols)
+    matrix[np.arange(rows)[:, None] < listing] = np.nan
+    closes = pd.DataFrame(matrix, columns=[f"SYM{i}" for i in range(symbols)])
+
+    def per_symbol():
+        return {symbol: add_technical_indicators(closes[[symbol]].dropna().rename(columns={symbol: "Close_1h"}))
+                for symbol in closes.columns}
+
+    print(f"Panel indicators ({rows:,} rows x {symbols} symbols)")
+    loop = _best_of(per_symbol)
+    print(f"  per-symbol loop : {loop * 1000:9.1f} ms")
+    for output in ("panel", "long"):
+        elapsed = _best_of(lambda: add_panel_indicators(closes, output=output))
+        print(f"  panel ({output:<5})   : {elapsed * 1000:9.1f} ms  ({loop / elapsed:.1f}x)")
+
+
+def bench_extrema(rows):
+    """
+    Compare pandas rolling max/min with the O(n) kernels, and time add_range_indicators.
+
+    Parameters:
+        rows (int): Number of hourly bars.
+    """
+    frame = make_ohlcv_frame(rows, labels=False)
+    high, low = frame["High"], frame["Low"]
+    print(f"Rolling extrema ({rows:,} rows)")
+    for window in (14, 200, 5_000):
+        loop = _best_of(lambda: (high.rolling(window).max().to_numpy(), low.rolling(window).min().to_numpy()))
+        kernel = _best_of(lambda: (rolling_max(high.to_numpy(), window), rolling_min(low.to_numpy(), window)))
+        print(f"  window {window:>5}: pandas {loop * 1000:8.1f} ms  kernels {kernel * 1000:8.1f} ms  "
+              f"({loop / kernel:.1f}x)")
+    data = pd.DataFrame({"High_1h": high, "Low_1h": low, "Close_1h": frame["Close"]})
+    elapsed = _best_of(lambda: add_range_indicators(data.copy()))
+    print(f"  add_range_indicators: {elapsed * 1000:8.1f} ms")
+
+
+def bench_volume(rows):
+    """
+    Compare the cumulative-sum volume kernels with pandas formulations.
+
+    Parameters:
+        rows (int): Number of hourly bars.
+    """
+    frame = make_ohlcv_frame(rows, labels=False)
+    high, low, close, volume = (frame[column] for column in ("High", "Low", "Close", "Volume BTC"))
+    unix = frame["Unix"].to_numpy()
+    day = pd.Series(unix - unix % 86_400_000)
+    typical = (high + low + close) / 3
+    flow = typical * volume
+
+    def pandas_mfi():
+        change = typical.diff()
+        positive = flow.where(change > 0, 0).rolling(14).sum()
+        negative = flow.where(change < 0, 0).rolling(14).sum()
+        return 100 - 100 / (1 + positive / negative)
+
+    cases = [
+        ("rolling VWAP", lambda: flow.rolling(24).sum() / volume.rolling(24).sum(),
+         lambda: rolling_vwap(high.to_numpy(), low.to_numpy(), close.to_numpy(), volume.to_numpy())),
+        ("session VWAP (groupby-cumsum)", lambda: flow.groupby(day).cumsum() / volume.groupby(day).cumsum(),
+         lambda: session_vwap(high.to_numpy(), low.to_numpy(), close.to_numpy(), volume.to_numpy(), unix)),
+        ("session VWAP (groupby-apply)",
+         lambda: pd.DataFrame({"flow": flow, "volume": volume}).groupby(day, group_keys=False).apply(
+             lambda group: group["flow"].cumsum() / group["volume"].cumsum()),
+         lambda: session_vwap(high.to_numpy(), low.to_numpy(), close.to_numpy(), volume.to_numpy(), unix)),
+        ("OBV", lambda: (np.sign(close.diff()).fillna(0) * volume).cumsum(),
+         lambda: on_balance_volume(close.to_numpy(), volume.to_numpy())),
+        ("MFI", pandas_mfi,
+         lambda: money_flow_index(high.to_numpy(), low.to_numpy(), close.to_numpy(), volume.to_numpy())),
+    ]
+    print(f"Volume indicators ({rows:,} rows)")
+    for label, reference, kernel in cases:
+        loop = _best_of(reference, repeat=1 if "apply" in label else 3)
+        elapsed = _best_of(kernel)
+        print(f"  {label:<30}: pandas {loop * 1000:8.1f} ms  kernel {elapsed * 1000:7.1f} ms  ({loop / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    bench_sweeps(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+    for rows in (1_000_000, 10_000_000):
+        bench_backends(rows)
+    bench_panel(20_000, 200)
+    bench_extrema(1_000_000)
+    bench_volume(1_000_000)
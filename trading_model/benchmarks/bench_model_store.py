@@ -0,0 +1,63 @@
+"""
+bench_model_store.py
+
+Benchmarks for saving and loading models with the model store.
+
+Benchmarks:
+    - Retraining the forest versus loading it from the store (fully read, memory-mapped, LRU cache hit).
+    - Peak Python-traced memory of each load.
+
+Usage:
+    Run from the trading_model directory:
+        python -m benchmarks.bench_model_store [rows]
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.model_store import ModelCache, load_model, save_model
+from src.models import train_model
+
+
+def bench_model_store(rows, features=20, n_estimators=100):
+    """
+    Compare retraining with loading a stored forest.
+
+    Parameters:
+        rows (int): Number of training rows.
+        features (int, optional): Number of feature columns. Default is 20.
+        n_estimators (int, optional): Number of trees. Default is 100.
+    """
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(rows, features)).astype(np.float32),
+                     columns=[f"feature{i}" for i in range(features)])
+    y = (X["feature0"] + rng.normal(size=rows) > 0).astype(int)
+    print(f"Model store ({rows:,} rows x {features} features, {n_estimators} trees)")
+
+    start = time.perf_counter()
+    model = train_model(X, y, n_estimators=n_estimators)
+    print(f"  {'train':<16}: {time.perf_counter() - start:8.3f} s")
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        start = time.perf_counter()
+        save_model(model, store_dir, "forest", X.columns)
+        print(f"  {'save':<16}: {time.perf_counter() - start:8.3f} s")
+
+        cache = ModelCache()
+        for label, mmap_mode, use_cache in (("load (read)", None, None), ("load (mmap)", "r", cache),
+                                            ("load (cache hit)", "r", cache)):
+            tracemalloc.start()
+            start = time.perf_counter()
+            load_model(store_dir, "forest", mmap_mode=mmap_mode, cache=use_cache)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+            print(f"  {label:<16}: {elapsed:8.3f} s  peak traced {peak:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    bench_model_store(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
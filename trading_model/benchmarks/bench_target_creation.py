@@ -0,0 +1,59 @@
+"""
+bench_target_creation.py
+
+Benchmarks for target labeling.
+
+Benchmarks:
+    - Triple barrier: a per-bar Python scan (simulate_trading's exit rule) on a sample versus
+      `triple_barrier_labels` on 1M and 10M bars, for 24 and 168-bar horizons.
+
+Usage:
+    Run from the trading_model directory:
+        python -m benchmarks.bench_target_creation [rows]
+"""
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic_data import make_ohlcv_frame
+from src.target_creation import triple_barrier_labels
+
+
+def scan_barriers(close, profit_target, stop_loss, horizon):
+    """Per-bar reference scan: the first close within the horizon that crosses a barrier."""
+    labels = np.zeros(len(close), dtype=np.int8)
+    for entry in range(len(close)):
+        for position in range(entry + 1, min(entry + horizon, len(close) - 1) + 1):
+            change = close[position] / close[entry] - 1
+            if change >= profit_target or change <= -stop_loss:
+                labels[entry] = 1 if change >= profit_target else -1
+                break
+    return labels
+
+
+def bench_triple_barrier(rows, sample_rows=100_000):
+    """
+    Compare the per-bar scan with the vectorized triple-barrier labeler.
+
+    Parameters:
+        rows (int): Number of hourly bars for the vectorized labeler.
+        sample_rows (int, optional): Bars labeled by the Python scan (extrapolated to `rows`).
+            Default is 100,000.
+    """
+    close = make_ohlcv_frame(rows, labels=False)["Close"].to_numpy()
+    print(f"Triple-barrier labels ({rows:,} rows, 2% / 1% barriers)")
+    for horizon in (24, 168):
+        start = time.perf_counter()
+        scan_barriers(close[:sample_rows], 0.02, 0.01, horizon)
+        scan = (time.perf_counter() - start) * rows / sample_rows
+        start = time.perf_counter()
+        triple_barrier_labels(close, 0.02, 0.01, horizon)
+        elapsed = time.perf_counter() - start
+        print(f"  horizon {horizon:>3}: per-bar scan ~{scan:8.1f} s (extrapolated)  "
+              f"vectorized {elapsed:6.2f} s  ({scan / elapsed:.0f}x)")
+
+
+if __name__ == "__main__":
+    for rows in ([int(sys.argv[1])] if len(sys.argv) > 1 else [1_000_000, 10_000_000]):
+        bench_triple_barrier(rows)
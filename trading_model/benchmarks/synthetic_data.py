@@ -0,0 +1,65 @@
+"""
+synthetic_data.py
+
+This module generates synthetic OHLCV data for the benchmark scripts, so benchmarks can run at
+sizes well beyond the sample files shipped in data/.
+
+Functions:
+    - make_ohlcv_frame: Builds a random-walk OHLCV DataFrame in the CryptoDataDownload schema.
+    - write_ohlcv_csv: Writes a DataFrame as a CryptoDataDownload CSV (source line, header, newest first).
+"""
+import numpy as np
+import pandas as pd
+
+HOUR_MS = 3_600_000
+
+
+def make_ohlcv_frame(rows, interval_ms=HOUR_MS, symbol="BTCUSDT", start_unix=1_500_000_000_000, seed=0, labels=True):
+    """
+    Build a random-walk OHLCV DataFrame in the CryptoDataDownload schema.
+
+    Parameters:
+        rows (int): Number of bars.
+        interval_ms (int, optional): Bar interval in milliseconds. Default is one hour.
+        symbol (str, optional): Value of the Symbol column. Default is "BTCUSDT".
+        start_unix (int, optional): Open time of the first bar in milliseconds.
+        seed (int, optional): Random seed. Default is 0.
+        labels (bool, optional): Include the Date and Symbol string columns. Default is True; pass False
+            for multi-million-row numeric benchmarks, where formatting dates dominates.
+
+    Returns:
+        pd.DataFrame: Bars in ascending time order with the columns validated by load_csv_data.
+    """
+    rng = np.random.default_rng(seed)
+    unix = start_unix + np.arange(rows, dtype=np.int64) * interval_ms
+    close = 10_000 * np.exp(np.cumsum(rng.normal(0, 0.005, rows)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = np.abs(rng.normal(0, 0.003, rows)) * close
+    volume = rng.gamma(2.0, 50.0, rows)
+    frame = pd.DataFrame({
+        "Unix": unix,
+        "Open": open_,
+        "High": np.maximum(open_, close) + spread,
+        "Low": np.minimum(open_, close) - spread,
+        "Close": close,
+        "Volume BTC": volume,
+        "Volume USDT": volume * close,
+        "tradecount": rng.integers(100, 10_000, rows),
+    })
+    if labels:
+        frame.insert(1, "Date", pd.to_datetime(unix, unit="ms").strftime("%Y-%m-%d %H:%M:%S"))
+        frame.insert(2, "Symbol", symbol)
+    return frame
+
+
+def write_ohlcv_csv(df, path):
+    """
+    Write a DataFrame as a CryptoDataDownload CSV (source line, header, newest row first).
+
+    Parameters:
+        df (pd.DataFrame): Bars in ascending time order.
+        path (str): Destination path.
+    """
+    with open(path, "w") as handle:
+        handle.write("https://www.CryptoDataDownload.com\n")
+        df.iloc[::-1].to_csv(handle, index=False)
@@ -0,0 +1,149 @@
+"""
+alignment.py
+
+This module aligns bars of two different timeframes without lookahead.
+
+Key Features:
+    - Attaches to every bar of a base timeframe (e.g. 1h) the most recent *completed* bar of another
+      timeframe (e.g. daily): a backward as-of merge on bar close times.
+    - Works for any pair of timeframes; bar intervals are inferred from the Unix column if not given.
+    - Runs as vectorized NumPy on sorted Unix arrays (one searchsorted pass plus column gathers),
+      so the full hourly history is kept at a predictable cost.
+
+Functions:
+    - infer_interval: Infers the bar interval of a Unix timestamp array.
+    - sort_by_unix: Orders bars by ascending Unix time (cheaply for already sorted or reversed input).
+    - asof_positions: Finds, for each base bar, the row of the latest completed other bar.
+    - align_asof: Builds the aligned DataFrame of two timeframes.
+
+Use Case:
+    - Replace an exact-timestamp inner join, which keeps only the hourly bars that share a timestamp
+      with a daily bar, with a merge that keeps every hourly bar.
+"""
+import numpy as np
+import pandas as pd
+
+
+def infer_interval(unix):
+    """
+    Infer the bar interval of a Unix timestamp array.
+
+    Parameters:
+        unix (array-like): Unix timestamps in milliseconds, in any order.
+
+    Returns:
+        int: The most common positive spacing between consecutive sorted timestamps (milliseconds).
+
+    Raises:
+        ValueError: If fewer than two distinct timestamps are given.
+    """
+    values = np.unique(np.asarray(unix, dtype=np.int64))
+    if len(values) < 2:
+        raise ValueError("At least two distinct timestamps are needed to infer a bar interval.")
+    diffs, counts = np.unique(np.diff(values), return_counts=True)
+    return int(diffs[np.argmax(counts)])
+
+
+def asof_positions(base_unix, other_unix, base_interval, other_interval):
+    """
+    Find, for each base bar, the row of the latest other bar completed when the base bar closes.
+
+    Parameters:
+        base_unix (np.ndarray): Sorted (ascending) open times of the base bars, in milliseconds.
+        other_unix (np.ndarray): Sorted (ascending) open times of the other bars, in milliseconds.
+        base_interval (int): Base bar interval in milliseconds.
+        other_interval (int): Other bar interval in milliseconds.
+
+    Returns:
+        np.ndarray: Row positions into `other_unix` (int64), or -1 where no other bar has completed yet.
+
+    Notes:
+        - An other bar opened at `o` is complete at `o + other_interval`; a base bar opened at `b`
+          can use it once `o + other_interval <= b + base_interval`. A daily bar is therefore first
+          attached to the 23:00 hourly bar of its own day, never earlier.
+    """
+    base_close = np.asarray(base_unix, dtype=np.int64) + base_interval
+    other_close = np.asarray(other_unix, dtype=np.int64) + other_interval
+    return np.searchsorted(other_close, base_close, side="right") - 1
+
+
+def sort_by_unix(df):
+    """
+    Return a DataFrame ordered by ascending Unix, reversing or sorting only when needed.
+
+    Parameters:
+        df (pd.DataFrame): Bars with a 'Unix' column.
+
+    Returns:
+        pd.DataFrame: `df` itself if already ascending, a reversed view if descending, else a sorted copy.
+    """
+    unix = df["Unix"]
+    if unix.is_monotonic_increasing:
+        return df
+    if unix.is_monotonic_decreasing:
+        return df.iloc[::-1]
+    return df.sort_values("Unix", kind="stable")
+
+
+def align_asof(base, other, base_interval=None, other_interval=None, suffixes=("_1h", "_d"),
+               drop_columns=("Date", "Symbol"), drop_incomplete=False):
+    """
+    Attach to every base bar the latest completed bar of another timeframe.
+
+    Parameters:
+        base (pd.DataFrame): Bars of the faster timeframe, with a 'Unix' column (milliseconds).
+        other (pd.DataFrame): Bars of the slower timeframe, with a 'Unix' column (milliseconds).
+        base_interval (int, optional): Base bar interval in milliseconds. Inferred if None (which needs at
+            least two distinct timestamps; pass it for single-bar input).
+        other_interval (int, optional): Other bar interval in milliseconds. Inferred if None, as above.
+        suffixes (tuple, optional): Suffixes for base and other columns. Default is ("_1h", "_d").
+        drop_columns (tuple, optional): Columns left out of the result. Default is ("Date", "Symbol").
+        drop_incomplete (bool, optional): Drop the leading base bars that precede the first completed
+            other bar instead of filling their other columns with NaN (keeps integer dtypes). Default is False.
+
+    Returns:
+        pd.DataFrame: One row per base bar in ascending time order, indexed by 'time' (base open time).
+            Other columns are NaN for base bars that precede the first completed other bar.
+
+    Example:
+        aligned = align_asof(hourly_data, daily_data)
+        aligned[["Close_1h", "Close_d"]].tail()
+    """
+    base = sort_by_unix(base)
+    other = sort_by_unix(other)
+    base_unix = base["Unix"].to_numpy(dtype=np.int64)
+    other_unix = other["Unix"].to_numpy(dtype=np.int64)
+    if base_interval is None:
+        base_interval = infer_interval(base_unix)
+    if other_interval is None:
+        other_interval = infer_interval(other_unix)
+
+    positions = asof_positions(base_unix, other_unix, base_interval, other_interval)
+    if drop_incomplete:
+        # Positions never decrease along sorted base bars, so the incomplete rows form a prefix
+        first = int(np.searchsorted(positions, 0, side="left"))
+        base = base.iloc[first:]
+        base_unix = base_unix[first:]
+        positions = positions[first:]
+    missing = positions < 0
+    take = np.where(missing, 0, positions)
+
+    columns = {}
+    for column in base.columns:
+        if column not in drop_columns:
+            columns[f"{column}{suffixes[0]}"] = base[column].to_numpy()
+    for column in other.columns:
+        if column in drop_columns:
+            continue
+        values = other[column].to_numpy()
+        if len(values) == 0:
+            gathered = np.full(len(take), np.nan)
+        else:
+            gathered = values[take]
+            if missing.any():
+                gathered = gathered.astype(np.float64) if gathered.dtype.kind in "iub" else gathered.copy()
+                gathered[missing] = np.nan
+        columns[f"{column}{suffixes[1]}"] = gathered
+
+    index = pd.DatetimeIndex(pd.to_datetime(base_unix, unit="ms"), name="time")
+    return pd.DataFrame(columns, index=index, copy=False)
@@ -42,14 +42,16 @@ def simulate_trading(data, model, initial_capital=10000, risk_per_trade=0.01, pr
     Notes:
         - The function assumes a "Close_1h" column is present in the data for trade pricing.
         - Predictions are generated if the "predicted" column is missing.
+        - The input is not copied: the result shares its price columns with `data`, so frames backed
+          by a memory-mapped OHLCVStore can be backtested without materializing them.
 
     Example:
         metrics, result_data = simulate_trading(data, trained_model)
         print("Total Profit:", metrics["total_profit"])
         print("Final Balance:", metrics["final_balance"])
     """
-    # Ensure the time column is included
-    data = data.copy()
+    # Ensure the time column is included (shallow copy: price columns stay views of the caller's data)
+    data = data.copy(deep=False)
     if "time" not in data.columns:
         data["time"] = range(len(data))  # Add a dummy time column if missing
 
@@ -66,12 +68,14 @@ def simulate_trading(data, model, initial_capital=10000, risk_per_trade=0.01, pr
     position = 0  # Units held
     entry_price = 0
     trade_log = []  # To track individual trades
-    data["PnL"] = 0.0
+    prices = data["Close_1h"].to_numpy()
+    predictions = data["predicted"].to_numpy()
+    pnl = np.zeros(len(data))
 
     # Simulate trades
     for i in range(len(data)):
-        price = data["Close_1h"].iloc[i]
-        prediction = data["predicted"].iloc[i]
+        price = prices[i]
+        prediction = predictions[i]
 
         # Entry logic
         if prediction == 1 and position == 0:  # Enter a trade
@@ -85,10 +89,12 @@ def simulate_trading(data, model, initial_capital=10000, risk_per_trade=0.01, pr
             if (price / entry_price - 1) >= profit_target or (price / entry_price - 1) <= -stop_loss:
                 profit = position * (price - entry_price)
                 balance += profit  # Add profit/loss to balance
-                data.loc[i, "PnL"] = profit
+                pnl[i] = profit
                 trade_log.append(profit)
                 position = 0  # Reset position
 
+    data["PnL"] = pnl
+
     # Final metrics
     total_profit = balance - initial_capital
     win_rate = np.mean([1 if p > 0 else 0 for p in trade_log]) if trade_log else 0
@@ -0,0 +1,334 @@
+"""
+data_cache.py
+
+This module provides an on-disk columnar cache for the CSV files consumed by the data pipeline.
+
+Key Features:
+    - Converts a CSV file to one typed NumPy (.npy) file per column the first time it is loaded.
+    - Keys every cache entry by the source file's absolute path, size and modification time
+      (optionally a content hash as well) and by the `pd.read_csv` options it was parsed with.
+    - Serves later loads from the binary cache, skipping CSV parsing entirely.
+    - Supports explicit invalidation of a single file or of the whole cache directory.
+    - Loads a time window with a binary search over the sorted Unix column, reading only the
+      requested rows from memory-mapped column files.
+
+Cache Layout:
+    <cache_dir>/
+        <file stem>-<path hash>/
+            meta.json       # Source fingerprint, read options, column names, row count, Unix sort order.
+            col_000.npy     # One fixed-width array per column, in CSV column order.
+            col_001.npy
+            ...
+
+Functions:
+    - to_unix_ms: Converts a timestamp-like value to Unix milliseconds.
+    - sorted_range: Finds the slice of a sorted Unix array that falls inside a time window.
+    - file_fingerprint: Computes the fingerprint (path, size, mtime, optional hash) of a source file.
+    - read_options_key: Returns a stable hash of the `pd.read_csv` options a file is parsed with.
+    - cache_entry_dir: Returns the cache directory used for a given source file.
+    - write_cache: Writes a DataFrame to the columnar cache for a source file.
+    - read_cache: Reads a cached DataFrame (optionally a time window) if its fingerprint still matches the source file.
+    - load_csv_cached: Loads a CSV through the cache, building the cache entry on a miss.
+    - invalidate_cache: Removes the cache entry of one file, or every entry in the cache directory.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+META_FILE = "meta.json"
+CACHE_FORMAT_VERSION = 1
+
+
+def to_unix_ms(value):
+    """
+    Convert a timestamp-like value to Unix milliseconds.
+
+    Parameters:
+        value (int, str, datetime or pd.Timestamp): Integers are taken as Unix milliseconds already;
+            anything else is parsed with `pd.Timestamp` (naive values are treated as UTC).
+
+    Returns:
+        int or None: Unix time in milliseconds, or None if `value` is None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return pd.Timestamp(value).value // 1_000_000
+
+
+def sorted_range(unix, start=None, end=None, order="ascending"):
+    """
+    Find the slice of a sorted Unix array that falls inside a time window.
+
+    Parameters:
+        unix (np.ndarray): Unix timestamps sorted in `order` (a memory-mapped array works without loading it).
+        start (int, optional): Inclusive lower bound in Unix milliseconds. Unbounded if None.
+        end (int, optional): Inclusive upper bound in Unix milliseconds. Unbounded if None.
+        order (str, optional): "ascending" or "descending". Default is "ascending".
+
+    Returns:
+        slice: Positions of `unix` whose values lie in [start, end], found in O(log n).
+    """
+    n = len(unix)
+    values = unix if order == "ascending" else unix[::-1]
+    lo = 0 if start is None else int(np.searchsorted(values, start, side="left"))
+    hi = n if end is None else int(np.searchsorted(values, end, side="right"))
+    hi = max(lo, hi)
+    if order == "ascending":
+        return slice(lo, hi)
+    return slice(n - hi, n - lo)
+
+
+def file_fingerprint(file, use_hash=False):
+    """
+    Compute the fingerprint of a source file.
+
+    Parameters:
+        file (str): Path to the source file.
+        use_hash (bool, optional): If True, include a SHA-1 hash of the file contents. Slower, but
+            detects rewrites that preserve size and modification time. Default is False.
+
+    Returns:
+        dict: Fingerprint with keys 'path', 'size', 'mtime_ns' and (if requested) 'sha1'.
+    """
+    stat = os.stat(file)
+    fingerprint = {
+        "path": os.path.abspath(file),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+    if use_hash:
+        digest = hashlib.sha1()
+        with open(file, "rb") as handle:
+            for block in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(block)
+        fingerprint["sha1"] = digest.hexdigest()
+    return fingerprint
+
+
+def read_options_key(read_csv_kwargs):
+    """
+    Return a stable hash of `pd.read_csv` options.
+
+    Parameters:
+        read_csv_kwargs (dict): Keyword arguments passed to `pd.read_csv`.
+
+    Returns:
+        str: Hex digest, independent of argument order.
+    """
+    options = json.dumps(sorted(read_csv_kwargs.items()), default=repr)
+    return hashlib.sha1(options.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_entry_dir(file, cache_dir):
+    """
+    Return the cache directory used for a given source file.
+
+    Parameters:
+        file (str): Path to the source file.
+        cache_dir (str): Root directory of the cache.
+
+    Returns:
+        str: Path of the entry directory (it may not exist yet).
+    """
+    abspath = os.path.abspath(file)
+    path_hash = hashlib.sha1(abspath.encode("utf-8")).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(abspath))[0]
+    return os.path.join(cache_dir, f"{stem}-{path_hash}")
+
+
+def _read_meta(entry_dir):
+    meta_path = os.path.join(entry_dir, META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _unix_order(df):
+    """Return "ascending"/"descending" if the Unix column is sorted that way, else None."""
+    if "Unix" not in df.columns:
+        return None
+    unix = df["Unix"]
+    if unix.is_monotonic_increasing:
+        return "ascending"
+    if unix.is_monotonic_decreasing:
+        return "descending"
+    return None
+
+
+def write_cache(df, file, cache_dir, fingerprint=None, read_options=None):
+    """
+    Write a DataFrame to the columnar cache for a source file.
+
+    Parameters:
+        df (pd.DataFrame): Data parsed from `file`.
+        file (str): Path to the source file the data came from.
+        cache_dir (str): Root directory of the cache.
+        fingerprint (dict, optional): Precomputed fingerprint of `file`. Computed if None.
+        read_options (str, optional): `read_options_key` of the options `df` was parsed with.
+
+    Returns:
+        str: Path of the written entry directory.
+
+    Notes:
+        - Numeric columns keep their dtype; text columns are stored as fixed-width unicode arrays
+          so no pickling is needed to read them back.
+        - The entry is written to a temporary directory and moved into place, so a crash never
+          leaves a half-written entry behind.
+    """
+    if fingerprint is None:
+        fingerprint = file_fingerprint(file)
+    entry_dir = cache_entry_dir(file, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=cache_dir)
+    try:
+        for i, column in enumerate(df.columns):
+            values = df[column].to_numpy()
+            if values.dtype == object or not np.issubdtype(values.dtype, np.number):
+                values = df[column].to_numpy(dtype=str)
+            np.save(os.path.join(tmp_dir, f"col_{i:03d}.npy"), values, allow_pickle=False)
+
+        meta = {
+            "version": CACHE_FORMAT_VERSION,
+            "fingerprint": fingerprint,
+            "read_options": read_options,
+            "columns": list(df.columns),
+            "rows": len(df),
+            "order": _unix_order(df),
+        }
+        with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as handle:
+            json.dump(meta, handle)
+
+        if os.path.exists(entry_dir):
+            shutil.rmtree(entry_dir)
+        os.replace(tmp_dir, entry_dir)
+    finally:
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return entry_dir
+
+
+def read_cache(file, cache_dir, fingerprint=None, start=None, end=None, read_options=None):
+    """
+    Read a cached DataFrame if its fingerprint still matches the source file.
+
+    Parameters:
+        file (str): Path to the source file.
+        cache_dir (str): Root directory of the cache.
+        fingerprint (dict, optional): Precomputed fingerprint of `file`. Computed if None.
+        start (optional): Inclusive start of the time window (Unix ms or timestamp-like). Default is None.
+        end (optional): Inclusive end of the time window (Unix ms or timestamp-like). Default is None.
+        read_options (str, optional): `read_options_key` the entry must have been parsed with. Not
+            checked if None.
+
+    Returns:
+        pd.DataFrame or None: The cached data, or None on a cache miss or stale entry.
+
+    Notes:
+        - With `start`/`end`, the column files are memory-mapped and only the matching rows are read.
+          For a sorted Unix column the window is located by binary search, so the cost depends on the
+          window size rather than on the length of the history.
+    """
+    if fingerprint is None:
+        fingerprint = file_fingerprint(file)
+    entry_dir = cache_entry_dir(file, cache_dir)
+    meta = _read_meta(entry_dir)
+    if meta is None or meta.get("version") != CACHE_FORMAT_VERSION or meta.get("fingerprint") != fingerprint:
+        return None
+    if read_options is not None and meta.get("read_options") != read_options:
+        return None
+
+    windowed = start is not None or end is not None
+    mmap_mode = "r" if windowed else None
+    arrays = [np.load(os.path.join(entry_dir, f"col_{i:03d}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+              for i in range(len(meta["columns"]))]
+
+    rows = slice(None)
+    if windowed:
+        unix = arrays[meta["columns"].index("Unix")]
+        start, end = to_unix_ms(start), to_unix_ms(end)
+        if meta.get("order") is not None:
+            rows = sorted_range(unix, start, end, order=meta["order"])
+        else:
+            mask = np.ones(len(unix), dtype=bool)
+            if start is not None:
+                mask &= unix >= start
+            if end is not None:
+                mask &= unix <= end
+            rows = np.flatnonzero(mask)
+
+    columns = {}
+    for column, values in zip(meta["columns"], arrays):
+        values = np.asarray(values[rows]) if windowed else values
+        if values.dtype.kind == "U":
+            values = values.astype(object)
+        columns[column] = values
+    return pd.DataFrame(columns, copy=windowed)
+
+
+def load_csv_cached(file, cache_dir, use_hash=False, start=None, end=None, **read_csv_kwargs):
+    """
+    Load a CSV file through the columnar cache.
+
+    Parameters:
+        file (str): Path to the CSV file.
+        cache_dir (str): Root directory of the cache.
+        use_hash (bool, optional): Include a content hash in the fingerprint. Default is False.
+        start (optional): Inclusive start of the time window (Unix ms or timestamp-like). Default is None.
+        end (optional): Inclusive end of the time window (Unix ms or timestamp-like). Default is None.
+        **read_csv_kwargs: Extra arguments passed to `pd.read_csv` on a cache miss
+            (e.g. skiprows=1 for CryptoDataDownload exports).
+
+    Returns:
+        pd.DataFrame: The file contents, served from the cache when the entry is fresh and was parsed
+            with the same `read_csv_kwargs` (otherwise the entry is rebuilt).
+
+    Example:
+        df = load_csv_cached("data/Binance_BTCUSDT_d.csv", "data/.cache", skiprows=1)
+    """
+    fingerprint = file_fingerprint(file, use_hash=use_hash)
+    options = read_options_key(read_csv_kwargs)
+    df = read_cache(file, cache_dir, fingerprint=fingerprint, start=start, end=end, read_options=options)
+    if df is None:
+        write_cache(pd.read_csv(file, **read_csv_kwargs), file, cache_dir, fingerprint=fingerprint,
+                    read_options=options)
+        df = read_cache(file, cache_dir, fingerprint=fingerprint, start=start, end=end, read_options=options)
+    return df
+
+
+def invalidate_cache(cache_dir, file=None):
+    """
+    Remove cache entries.
+
+    Parameters:
+        cache_dir (str): Root directory of the cache.
+        file (str, optional): Source file whose entry should be removed. If None, every entry in
+            `cache_dir` is removed.
+
+    Returns:
+        int: Number of entries removed.
+    """
+    if not os.path.isdir(cache_dir):
+        return 0
+    if file is not None:
+        entry_dir = cache_entry_dir(file, cache_dir)
+        if os.path.isdir(entry_dir):
+            shutil.rmtree(entry_dir)
+            return 1
+        return 0
+
+    removed = 0
+    for name in os.listdir(cache_dir):
+        entry_dir = os.path.join(cache_dir, name)
+        if os.path.isdir(entry_dir) and os.path.exists(os.path.join(entry_dir, META_FILE)):
+            shutil.rmtree(entry_dir)
+            removed += 1
+    return removed
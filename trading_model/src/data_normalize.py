@@ -6,19 +6,469 @@ This module provides functionality for normalizing numerical data in pandas Data
 Features:
     - Normalize numerical data using Min-Max scaling or Z-score normalization.
     - Supports selective normalization for specific columns or all numerical columns.
+    - A persistable `Normalizer` fitted on a training range only (no future statistics leak into
+      training), updated chunk by chunk with running min/max and Welford statistics, and applied to
+      later data as an in-place affine transform.
+    - Rolling-window z-score and min-max over the last N bars for non-stationary prices, in O(n) for
+      many columns at once (prefix sums of x and x^2, block-wise running extrema), plus O(1)
+      streaming updates for live data.
+
+Functions:
+    - normalize_data: Normalizes columns of a DataFrame (global or rolling-window methods).
+    - rolling_zscore: Rolling z-score of every column of a 2-D array.
+    - rolling_minmax: Rolling min-max scaling of every column of a 2-D array.
+
+Classes:
+    - Normalizer: Min-max or z-score parameters with fit, partial_fit, transform and save/load.
+    - RollingNormalizer: Rolling z-score or min-max of a feature vector updated one bar at a time.
 
 Use Cases:
     - Preprocessing data for machine learning models.
     - Standardizing data to a common scale for better interpretability and model performance.
+    - Fitting scaling parameters once on training data and reusing them at inference.
 
 Notes:
     - If Min-Max scaling unsuitable to interpret original magnitudes consider Z-score normalization.
 """
 
+import json
+import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler, StandardScaler
+from src.indicators_numpy import rolling_mean, rolling_max, rolling_min
+
+METHODS = ("minmax", "zscore")
+ROLLING_METHODS = ("rolling_zscore", "rolling_minmax")
+
+
+class Normalizer:
+    """
+    Min-max or z-score normalization parameters that are fitted once and reused.
+
+    Parameters:
+        method (str, optional): "minmax" (scale to [0, 1]) or "zscore" (mean 0, standard deviation 1).
+            Default is "minmax".
+        columns (list, optional): Columns to normalize. If None, the float64/int64 columns of the first
+            fitted DataFrame.
+
+    Notes:
+        - `partial_fit` keeps running minima/maxima and Welford mean/variance (merged per chunk with
+          Chan's formula), so fitting chunk by chunk gives the same parameters as one `fit`.
+        - Results match sklearn's MinMaxScaler/StandardScaler (population variance; constant columns
+          are only shifted). NaNs are ignored when fitting and stay NaN when transforming.
+        - The state is a few numbers per column and saves to JSON.
+
+    Example:
+        normalizer = Normalizer("zscore").fit(data.iloc[:train_rows])
+        train = normalizer.transform(data.iloc[:train_rows])
+        normalizer.save("normalizer.json")
+        ...
+        normalizer = Normalizer.load("normalizer.json")
+        normalizer.transform_array(live_features)        # float32 array, in place
+    """
+
+    def __init__(self, method="minmax", columns=None):
+        if method not in METHODS:
+            raise ValueError(f"Unsupported normalization method: {method}")
+        self.method = method
+        self.columns = list(columns) if columns is not None else None
+        self.count = None
+        self.mean = None
+        self.m2 = None
+        self.min = None
+        self.max = None
+
+    def _values(self, data):
+        if isinstance(data, pd.DataFrame):
+            if self.columns is None:
+                self.columns = data.select_dtypes(include=["float64", "int64"]).columns.tolist()
+            return data[self.columns].to_numpy(dtype=np.float64)
+        values = np.asarray(data, dtype=np.float64)
+        values = values[:, None] if values.ndim == 1 else values
+        if self.columns is None:
+            self.columns = list(range(values.shape[1]))
+        return values
+
+    def fit(self, data):
+        """
+        Fit the parameters on `data`, discarding any previous state.
+
+        Parameters:
+            data (pd.DataFrame or np.ndarray): Training data (rows x columns).
+
+        Returns:
+            Normalizer: self.
+        """
+        self.count = None
+        return self.partial_fit(data)
+
+    def partial_fit(self, data):
+        """
+        Update the parameters with another chunk of training data.
+
+        Parameters:
+            data (pd.DataFrame or np.ndarray): Chunk with the same columns as the previous ones.
+
+        Returns:
+            Normalizer: self.
+        """
+        values = self._values(data)
+        missing = np.isnan(values)
+        if missing.any():
+            count = (~missing).sum(axis=0).astype(np.float64)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = np.where(count > 0, np.nansum(values, axis=0) / count, 0.0)
+            m2 = np.nansum((values - mean) ** 2, axis=0)
+        else:
+            count = np.full(values.shape[1], float(len(values)))
+            mean = values.mean(axis=0) if len(values) else np.zeros(values.shape[1])
+            deviations = values - mean
+            m2 = np.einsum("ij,ij->j", deviations, deviations)
+        low = np.fmin.reduce(values, axis=0) if len(values) else np.full(values.shape[1], np.nan)
+        high = np.fmax.reduce(values, axis=0) if len(values) else np.full(values.shape[1], np.nan)
+
+        if self.count is None:
+            self.count, self.mean, self.m2, self.min, self.max = count, mean, m2, low, high
+            return self
+        total = self.count + count
+        delta = mean - self.mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(total > 0, count / total, 0.0)
+            self.m2 = self.m2 + m2 + np.where(total > 0, delta ** 2 * self.count * weight, 0.0)
+        self.mean = self.mean + delta * weight
+        self.count = total
+        self.min = np.fmin(self.min, low)
+        self.max = np.fmax(self.max, high)
+        return self
+
+    @property
+    def fitted(self):
+        """bool: True once the normalizer has seen data."""
+        return self.count is not None
+
+    def parameters(self, dtype=np.float64):
+        """
+        Return the affine parameters: normalized = (value - offset) / spread.
+
+        Parameters:
+            dtype (np.dtype, optional): Dtype of the returned arrays. Default is float64.
+
+        Returns:
+            tuple: (offset, spread) arrays, one value per column (spread is 1 for constant columns).
+
+        Raises:
+            ValueError: If the normalizer is not fitted.
+        """
+        if not self.fitted:
+            raise ValueError("Normalizer is not fitted.")
+        if self.method == "minmax":
+            offset, spread = self.min, self.max - self.min
+        else:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                offset, spread = self.mean, np.sqrt(self.m2 / self.count)
+        spread = np.where((spread == 0) | ~np.isfinite(spread), 1.0, spread)
+        return offset.astype(dtype), spread.astype(dtype)
+
+    def transform(self, data, inplace=False):
+        """
+        Normalize the fitted columns of a DataFrame.
+
+        Parameters:
+            data (pd.DataFrame): Data with the fitted columns.
+            inplace (bool, optional): Overwrite the columns of `data`. Default is False (the other
+                columns of the returned frame are shared with `data`, not copied).
+
+        Returns:
+            pd.DataFrame: Data with normalized columns.
+        """
+        offset, spread = self.parameters()
+        result = data if inplace else data.copy(deep=False)
+        for position, column in enumerate(self.columns):
+            result[column] = (data[column].to_numpy(dtype=np.float64) - offset[position]) / spread[position]
+        return result
+
+    def transform_array(self, values, out=None):
+        """
+        Normalize a (rows x columns) array in the fitted column order with one in-place affine pass.
+
+        Parameters:
+            values (np.ndarray): Float32 or float64 array.
+            out (np.ndarray, optional): Destination. Defaults to `values` itself (in place).
+
+        Returns:
+            np.ndarray: The normalized array.
+        """
+        out = values if out is None else out
+        offset, spread = self.parameters(dtype=out.dtype)
+        np.subtract(values, offset, out=out)
+        np.divide(out, spread, out=out)
+        return out
+
+    def to_dict(self):
+        """
+        Return the state as a JSON-compatible dict.
+
+        Returns:
+            dict: Method, columns and per-column count, mean, M2, min and max.
+        """
+        state = {"method": self.method, "columns": self.columns}
+        for name in ("count", "mean", "m2", "min", "max"):
+            values = getattr(self, name)
+            state[name] = None if values is None else [None if np.isnan(v) else float(v) for v in values]
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Rebuild a normalizer from `to_dict` output.
+
+        Parameters:
+            state (dict): Saved state.
+
+        Returns:
+            Normalizer: Normalizer with the saved parameters.
+        """
+        normalizer = cls(state["method"], state["columns"])
+        for name in ("count", "mean", "m2", "min", "max"):
+            if state[name] is not None:
+                setattr(normalizer, name, np.array([np.nan if v is None else v for v in state[name]], dtype=np.float64))
+        return normalizer
+
+    def save(self, path):
+        """
+        Write the normalizer to a JSON file.
+
+        Parameters:
+            path (str): Destination file.
+        """
+        with open(path, "w") as handle:
+            json.dump(self.to_dict(), handle)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a normalizer written by `save`.
+
+        Parameters:
+            path (str): Normalizer file.
+
+        Returns:
+            Normalizer: Restored normalizer.
+        """
+        with open(path) as handle:
+            return cls.from_dict(json.load(handle))
+
+
+def _as_2d_float(values):
+    values = np.asarray(values)
+    if values.dtype not in (np.float32, np.float64):
+        values = values.astype(np.float64)
+    return values[:, None] if values.ndim == 1 else values
+
 
-def normalize_data(data: pd.DataFrame, method: str = "minmax", columns: list=None) -> pd.DataFrame:
+def rolling_zscore(values, window, out=None):
+    """
+    Compute the rolling z-score (x - rolling mean) / rolling std of every column in O(n).
+
+    Parameters:
+        values (np.ndarray): (time x columns) array in ascending time order (1-D is one column).
+        window (int): Window length in bars.
+        out (np.ndarray, optional): Output of the same shape; may be `values` itself. Allocated if None.
+
+    Returns:
+        np.ndarray: Z-scores; NaN for the first `window - 1` rows and windows containing NaN, 0 for
+            constant windows.
+
+    Notes:
+        - Mean and mean of squares come from prefix sums of x - x0 and (x - x0)^2, with x0 the first
+          finite value of each column, which keeps the sums small for prices far from zero.
+        - The standard deviation is the population one (ddof=0), as in the global "zscore" method.
+        - Windows whose minimum equals their maximum count as constant, as do windows whose variance
+          is within the rounding error of the prefix sums of squares (a few eps times the prefix sum at
+          the window end, divided by the window). Low-variance windows far from x0 keep their z-scores.
+    """
+    values = _as_2d_float(values)
+    first = np.argmax(np.isfinite(values), axis=0)
+    origin = values[first, np.arange(values.shape[1])]
+    centered = np.subtract(values, origin, order="F", dtype=np.float64)
+    mean = rolling_mean(centered, window)
+    square = np.square(centered)
+    # Rounding error of a window sum taken from prefix sums grows with the prefix sum itself
+    tolerance = np.nancumsum(square, axis=0)
+    tolerance *= 8 * np.finfo(np.float64).eps / window
+    rolling_mean(square, window, out=square)
+    # variance = E[x^2] - E[x]^2, computed in the buffer of the squares
+    variance = np.subtract(square, np.square(mean), out=square)
+    constant = variance <= tolerance
+    constant |= rolling_max(values, window) == rolling_min(values, window)
+    variance[constant] = 1.0
+    spread = np.sqrt(variance, out=variance)
+    out = np.empty_like(values) if out is None else out
+    np.subtract(centered, mean, out=out, casting="same_kind")
+    np.divide(out, spread, out=out, casting="same_kind")
+    out[constant] = 0.0
+    return out
+
+
+def rolling_minmax(values, window, out=None):
+    """
+    Compute rolling min-max scaling (x - rolling min) / (rolling max - rolling min) of every column in O(n).
+
+    Parameters:
+        values (np.ndarray): (time x columns) array in ascending time order (1-D is one column).
+        window (int): Window length in bars.
+        out (np.ndarray, optional): Output of the same shape; may be `values` itself. Allocated if None.
+
+    Returns:
+        np.ndarray: Values in [0, 1]; NaN for the first `window - 1` rows and windows containing NaN,
+            0 for constant windows.
+    """
+    values = _as_2d_float(values)
+    low = rolling_min(values, window)
+    spread = rolling_max(values, window)
+    spread -= low
+    spread[spread == 0] = 1.0
+    out = np.empty_like(values) if out is None else out
+    np.subtract(values, low, out=out)
+    np.divide(out, spread, out=out)
+    return out
+
+
+ROLLING_KERNELS = {"rolling_zscore": rolling_zscore, "rolling_minmax": rolling_minmax}
+
+
+class RollingNormalizer:
+    """
+    Rolling z-score or min-max of a feature vector, updated one bar at a time.
+
+    Parameters:
+        window (int): Window length in bars.
+        method (str, optional): "rolling_zscore" or "rolling_minmax". Default is "rolling_zscore".
+
+    Notes:
+        - Values equal `rolling_zscore`/`rolling_minmax` on the same history (up to float rounding).
+        - Every column is updated at once with NumPy: running sums of x - x0 and (x - x0)^2 (recomputed
+          from the ring buffer on each wrap to bound drift) for the z-score; for min-max, the running
+          extreme of the current block of `window` bars combined with the suffix extremes of the
+          previous block, computed once per block. Both are amortized O(1) per bar and column.
+
+    Example:
+        normalizer = RollingNormalizer(168, "rolling_minmax")
+        normalizer.update_many(history[feature_columns].to_numpy())
+        live_row = normalizer.update(latest_features)
+    """
+
+    def __init__(self, window, method="rolling_zscore"):
+        if method not in ROLLING_METHODS:
+            raise ValueError(f"Unsupported rolling normalization method: {method}")
+        self.window = window
+        self.method = method
+        self.count = 0
+        self.buffer = None
+
+    def _start(self, columns):
+        window = self.window
+        self.buffer = np.full((window, columns), np.nan)
+        self.origin = None
+        self.sum = np.zeros(columns)
+        self.square_sum = np.zeros(columns)
+        self.missing = np.zeros(columns, dtype=np.int64)
+        self.block_low = np.full(columns, np.inf)
+        self.block_high = np.full(columns, -np.inf)
+        self.suffix_low = np.full((window, columns), np.inf)
+        self.suffix_high = np.full((window, columns), -np.inf)
+
+    def update(self, values):
+        """
+        Add one bar and return its normalized values.
+
+        Parameters:
+            values (array-like): Feature values of the bar, in a fixed column order.
+
+        Returns:
+            np.ndarray: Normalized values (NaN until the window is full or while it holds a NaN).
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if self.buffer is None:
+            self._start(len(values))
+        slot = self.count % self.window
+        previous = self.buffer[slot].copy()
+        if self.count >= self.window:
+            self.missing -= np.isnan(previous)
+        missing = np.isnan(values)
+        self.missing += missing
+        self.buffer[slot] = values
+
+        if self.method == "rolling_zscore":
+            if self.origin is None:
+                self.origin = values.copy()
+            self.origin = np.where(np.isnan(self.origin), values, self.origin)
+            if self.count >= self.window:
+                old = np.nan_to_num(previous - self.origin)
+                self.sum -= old
+                self.square_sum -= old * old
+            new = np.nan_to_num(values - self.origin)
+            self.sum += new
+            self.square_sum += new * new
+        else:
+            self.block_low = np.where(slot == 0, np.inf, self.block_low)
+            self.block_high = np.where(slot == 0, -np.inf, self.block_high)
+            self.block_low = np.fmin(self.block_low, values)
+            self.block_high = np.fmax(self.block_high, values)
+
+        self.count += 1
+        result = self._value(values, slot)
+        if slot == self.window - 1:
+            self._end_block()
+        return result
+
+    def _end_block(self):
+        # The ring buffer holds the completed block in order: resync sums, store suffix extremes
+        if self.method == "rolling_zscore":
+            centered = np.nan_to_num(self.buffer - self.origin)
+            self.sum = centered.sum(axis=0)
+            self.square_sum = np.square(centered).sum(axis=0)
+        else:
+            self.suffix_low = np.fmin.accumulate(self.buffer[::-1], axis=0)[::-1]
+            self.suffix_high = np.fmax.accumulate(self.buffer[::-1], axis=0)[::-1]
+
+    def _value(self, values, slot):
+        if self.count < self.window:
+            return np.full(len(values), np.nan)
+        if self.method == "rolling_zscore":
+            mean = self.sum / self.window
+            square = self.square_sum / self.window
+            variance = square - mean * mean
+            # Sums are resynced every block, so their rounding error stays near window * eps * E[x^2]
+            constant = variance <= 8 * self.window * np.finfo(np.float64).eps * square
+            spread = np.sqrt(np.where(constant, 1.0, variance))
+            result = (values - self.origin - mean) / spread
+            result[constant] = 0.0
+        else:
+            low, high = self.block_low, self.block_high
+            if slot < self.window - 1:
+                low = np.fmin(low, self.suffix_low[slot + 1])
+                high = np.fmax(high, self.suffix_high[slot + 1])
+            spread = high - low
+            spread[spread == 0] = 1.0
+            result = (values - low) / spread
+        result[self.missing > 0] = np.nan
+        return result
+
+    def update_many(self, values):
+        """
+        Add several bars.
+
+        Parameters:
+            values (array-like): (bars x columns) values in time order.
+
+        Returns:
+            np.ndarray: Normalized values after every bar.
+        """
+        return np.array([self.update(row) for row in _as_2d_float(values)])
+
+
+def normalize_data(data: pd.DataFrame, method: str = "minmax", columns: list=None, normalizer: Normalizer=None,
+                   fit_rows: int=None, window: int=None, chunk_columns: int=16) -> pd.DataFrame:
     """
     Normalize numerical data using the specified method.
 
@@ -27,7 +477,18 @@ def normalize_data(data: pd.DataFrame, method: str = "minmax", columns: list=Non
         method (str): Normalization method. Options are:
             - "minmax": Scales values to the range [0, 1].
             - "zscore": Standardizes values to have a mean of 0 and standard deviation of 1.
+            - "rolling_zscore": Z-score against the mean and standard deviation of the last `window` bars.
+            - "rolling_minmax": Scales values to [0, 1] within the range of the last `window` bars.
         columns (list, optional): List of columns to normalize. If None, all numerical columns are normalized.
+        normalizer (Normalizer, optional): Normalizer to use. If it is already fitted it is only applied
+            (e.g. to test or live data); otherwise it is fitted here and can be saved afterwards.
+        fit_rows (int, optional): Fit on the first `fit_rows` rows only (the training range) and apply
+            the parameters to all rows. Default is None (fit on all rows, which leaks statistics of
+            later rows into earlier ones).
+        window (int, optional): Window length in bars for the rolling methods (required for them).
+            Rolling methods only use past bars, so they need no fitting.
+        chunk_columns (int, optional): Columns processed together by the rolling methods, bounding the
+            temporary memory. Default is 16.
 
     Returns:
         pd.DataFrame: DataFrame with normalized data.
@@ -41,19 +502,37 @@ def normalize_data(data: pd.DataFrame, method: str = "minmax", columns: list=Non
         
         # Normalize specific columns using Z-score normalization
         normalized_data = normalize_data(data, method="zscore", columns=["price", "volume"])
+
+        # Fit on the training range only, keep the parameters for later data
+        normalizer = Normalizer("minmax")
+        normalized_data = normalize_data(data, normalizer=normalizer, fit_rows=train_rows)
+        normalizer.save("normalizer.json")
+
+        # Scale against the last week of hourly bars; the first 167 rows become NaN
+        normalized_data = normalize_data(data, method="rolling_zscore", window=168)
     """
-    if columns is None:
-        # Select all numerical columns
-        columns = data.select_dtypes(include=["float64", "int64"]).columns.tolist()
-    
-    if method == "minmax":
-        scaler = MinMaxScaler()
-    elif method == "zscore":
-        scaler = StandardScaler()
-    else:
-        raise ValueError(f"Unsupported normalization method: {method}")
-    
-    # Apply the scaler to the specified columns
-    data[columns] = scaler.fit_transform(data[columns])
-    
-    return data
+    if method in ROLLING_METHODS:
+        if window is None:
+            raise ValueError(f"Method {method} needs a window.")
+        if columns is None:
+            columns = data.select_dtypes(include=["float64", "int64"]).columns.tolist()
+        kernel = ROLLING_KERNELS[method]
+        for start in range(0, len(columns), chunk_columns):
+            group = list(columns[start:start + chunk_columns])
+            values = np.array(data[group], dtype=np.float64, order="F")
+            kernel(values, window, out=values)
+            # Each column of the Fortran-ordered block is contiguous and is stored without another copy
+            for position, column in enumerate(group):
+                data[column] = values[:, position]
+        return data
+
+    if normalizer is None:
+        normalizer = Normalizer(method, columns)
+    if not normalizer.fitted:
+        if normalizer.columns is None:
+            # Select all numerical columns
+            normalizer.columns = data.select_dtypes(include=["float64", "int64"]).columns.tolist()
+        normalizer.fit(data if fit_rows is None else data.iloc[:fit_rows])
+
+    # Apply the parameters to the specified columns
+    return normalizer.transform(data, inplace=True)
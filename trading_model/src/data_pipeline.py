@@ -5,23 +5,146 @@ This module handles data loading, merging, and cleaning for the trading model.
 
 Key Features:
     - Loads hourly and daily data from CSV files.
-    - Merges the data and performs pre-indicator cleaning steps.
+    - Merges the data (as-of alignment of completed daily bars onto hourly bars) and performs
+      pre-indicator cleaning steps.
     - Ensures compatibility and readiness for further processing by verifying required columns.
+    - Optionally serves CSV files from an on-disk columnar cache (see data_cache.py).
+    - Optionally ingests only new rows into a persistent binary store (see ingestion.py).
+    - Optional memory-lean loading with a fixed schema (int64 Unix, float32 prices, categorical Symbol).
+    - Parallel loading of a multi-symbol universe with per-file error reporting.
 
 Functions:
+    - lean_schema: Returns the fixed column dtypes used by the memory-lean loading mode.
     - load_csv_data: Loads hourly and daily data from specified CSV files into pandas DataFrames.
     - merge_and_clean_data: Merges hourly/daily data, cleans, and prepares it for further analysis.
+    - load_universe: Loads and merges the hourly/daily pairs of many symbols in a process pool.
 """
+import glob
 import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
+from src.alignment import align_asof, infer_interval
+from src.data_cache import load_csv_cached, to_unix_ms
+from src.ingestion import REQUIRED_COLUMNS, ingest_csv, parse_symbol_timeframe
+from src.resampling import timeframe_ms
 
-def load_csv_data(hourly_file, daily_file):
+PRICE_VOLUME_COLUMNS = ["Open", "High", "Low", "Close", "Volume BTC", "Volume USDT"]
+
+def lean_schema(float32=False):
+    """
+    Return the fixed column dtypes used by the lean loading mode.
+
+    Parameters:
+        float32 (bool, optional): Store price and volume columns as float32 instead of float64. Default is False.
+
+    Returns:
+        dict: Mapping of column name to dtype (int64 Unix/tradecount, categorical Symbol, float price/volume).
+    """
+    float_dtype = "float32" if float32 else "float64"
+    schema = {"Unix": "int64", "Symbol": "category", "tradecount": "int64"}
+    schema.update({col: float_dtype for col in PRICE_VOLUME_COLUMNS})
+    return schema
+
+def _lean_usecols(usecols):
+    """Resolve the columns kept by the lean mode (Date is dropped unless requested, Unix is always kept)."""
+    if usecols is None:
+        return [col for col in REQUIRED_COLUMNS if col != "Date"]
+    return ["Unix"] + [col for col in usecols if col != "Unix"]
+
+def _apply_lean_schema(df, float32=False, usecols=None):
+    """Prune and cast an already-loaded DataFrame to the lean schema."""
+    schema = lean_schema(float32)
+    keep = set(_lean_usecols(usecols))
+    df = df[[col for col in df.columns if col in keep]]
+    return df.astype({col: dtype for col, dtype in schema.items() if col in df.columns})
+
+def _read_csv_window(file, start=None, end=None, chunksize=10_000, **read_csv_kwargs):
+    """
+    Read a CryptoDataDownload CSV, keeping only rows whose Unix value lies in [start, end].
+
+    The file is read in chunks and reading stops as soon as a chunk passes the window, so a recent
+    window of a newest-first export (or an early window of an oldest-first one) is read without
+    parsing the rest of the file.
+    """
+    start, end = to_unix_ms(start), to_unix_ms(end)
+    if start is None and end is None:
+        return pd.read_csv(file, skiprows=1, **read_csv_kwargs)
+
+    kept = []
+    order = None
+    with pd.read_csv(file, skiprows=1, chunksize=chunksize, **read_csv_kwargs) as reader:
+        for chunk in reader:
+            unix = chunk["Unix"].to_numpy()
+            if order is None and len(unix) > 1 and unix[0] != unix[-1]:
+                order = "descending" if unix[0] > unix[-1] else "ascending"
+            mask = np.ones(len(unix), dtype=bool)
+            if start is not None:
+                mask &= unix >= start
+            if end is not None:
+                mask &= unix <= end
+            kept.append(chunk[mask])
+            if order == "descending" and start is not None and unix[-1] < start:
+                break
+            if order == "ascending" and end is not None and unix[-1] > end:
+                break
+    if not kept:
+        # Header-only file: no chunks, but keep the columns and dtypes
+        return pd.read_csv(file, skiprows=1, nrows=0, **read_csv_kwargs)
+    df = pd.concat(kept, ignore_index=True)
+    for column in df.columns:
+        # Chunks parsed as category get their own category sets; concat falls back to object for those
+        if isinstance(kept[0][column].dtype, pd.CategoricalDtype) and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = union_categoricals([chunk[column] for chunk in kept])
+    return df
+
+def _load_one_file(file, cache_dir=None, store_dir=None, lean=False, float32=False, usecols=None, start=None, end=None):
+    """Load and validate a single CSV file (see `load_csv_data` for the options). Raises on failure."""
+    if store_dir is not None:
+        df = ingest_csv(file, store_dir, start=start, end=end)
+    elif cache_dir is not None:
+        df = load_csv_cached(file, cache_dir, start=start, end=end, skiprows=1)
+    elif lean:
+        # Validate the header first, then parse only the requested columns with fixed dtypes
+        header = pd.read_csv(file, skiprows=1, nrows=0).columns
+        if not set(REQUIRED_COLUMNS).issubset(header):
+            raise ValueError(f"Missing required columns in {file}. Found: {header}")
+        columns = _lean_usecols(usecols)
+        schema = lean_schema(float32)
+        return _read_csv_window(file, start, end, usecols=columns,
+                                dtype={col: schema[col] for col in columns if col in schema})
+    else:
+        df = _read_csv_window(file, start, end)
+    # Validate columns based on actual data
+    if not set(REQUIRED_COLUMNS).issubset(df.columns):
+        raise ValueError(f"Missing required columns in {file}. Found: {df.columns}")
+    if lean:
+        df = _apply_lean_schema(df, float32=float32, usecols=usecols)
+    return df
+
+def load_csv_data(hourly_file, daily_file, cache_dir=None, store_dir=None, lean=False, float32=False, usecols=None,
+                  start=None, end=None):
     """
     Load hourly and daily CSV files into pandas DataFrames.
 
     Parameters:
         hourly_file (str): Path to the hourly data CSV file.
         daily_file (str): Path to the daily data CSV file.
+        cache_dir (str, optional): Directory of the columnar cache. If given, each CSV is parsed once
+            and later loads are served from the cache until the source file changes. Default is None
+            (always parse the CSV).
+        store_dir (str, optional): Directory of the incremental ingestion store. If given, only rows
+            newer than the last ingested Unix timestamp are parsed and the full history is read
+            from the store (in ascending time order). Takes precedence over `cache_dir`. Default is None.
+        lean (bool, optional): Load with a fixed, memory-lean schema (see `lean_schema`): int64 Unix,
+            categorical Symbol, and the Date column dropped unless listed in `usecols`. Default is False.
+        float32 (bool, optional): In lean mode, store price and volume columns as float32. Default is False.
+        usecols (list, optional): In lean mode, the columns to keep (returned in file order). Unix is
+            always kept. Defaults to every required column except Date.
+        start (int, str or datetime, optional): Inclusive start of the time window to load, as Unix
+            milliseconds or anything `pd.Timestamp` accepts. Default is None (from the first row).
+        end (int, str or datetime, optional): Inclusive end of the time window. Default is None (to the last row).
 
     Returns:
         tuple: A tuple containing two pandas DataFrames:
@@ -31,18 +154,19 @@ def load_csv_data(hourly_file, daily_file):
     Notes:
         - The function validates that required columns are present in each CSV file.
         - If a file cannot be loaded or has invalid columns, None is returned for that file, and an error is logged.
+        - Cached loads go through the same column validation as fresh CSV loads.
+        - In lean mode, validation runs on the CSV header, so pruned columns must still exist in the file.
+          Date can be rebuilt from Unix when needed (e.g. pd.to_datetime(df["Unix"], unit="ms")).
+        - Time windows are applied as early as possible: by binary search over the sorted Unix column
+          of the cache or store, or by chunked CSV reads that stop once past the window.
     """
     csv_files = [hourly_file, daily_file]
     dataframes = []
 
     for file in csv_files:
         try:
-            df = pd.read_csv(file, skiprows=1)
-            # Validate columns based on actual data
-            required_cols={"Unix","Date","Symbol","Open","High","Low","Close","Volume BTC","Volume USDT","tradecount"}
-            if not required_cols.issubset(df.columns):
-                raise ValueError(f"Missing required columns in {file}. Found: {df.columns}")
-            dataframes.append(df)
+            dataframes.append(_load_one_file(file, cache_dir=cache_dir, store_dir=store_dir, lean=lean,
+                                             float32=float32, usecols=usecols, start=start, end=end))
         except Exception as e:
             print(f"Error in {file}: {e}")
             dataframes.append(None)
@@ -51,7 +175,16 @@ def load_csv_data(hourly_file, daily_file):
     hourly_data, daily_data = dataframes
     return hourly_data, daily_data
 
-def merge_and_clean_data(hourly_data, daily_data):
+def _bar_interval(data, interval, default_timeframe):
+    """Bar interval in milliseconds: given (timeframe or ms), inferred from 2+ timestamps, else the default."""
+    if interval is None:
+        unix = data["Unix"].to_numpy(dtype=np.int64)
+        if len(np.unique(unix)) >= 2:
+            return infer_interval(unix)
+        interval = default_timeframe
+    return timeframe_ms(interval)[0]
+
+def merge_and_clean_data(hourly_data, daily_data, how="asof", hourly_interval=None, daily_interval=None):
     """
     Merge hourly and daily data, and perform pre-indicator cleaning.
 
@@ -59,6 +192,16 @@ def merge_and_clean_data(hourly_data, daily_data):
         hourly_data (pd.DataFrame): DataFrame containing hourly data.
         daily_data (pd.DataFrame): DataFrame containing daily data. 
         If None, only hourly data is returned.
+        how (str, optional): Merge method. Options are:
+            - "asof" (default): Keep every hourly bar and attach the most recent *completed* daily bar
+              (see alignment.align_asof). No lookahead: a daily bar is used only once it has closed.
+            - "inner": Legacy exact-timestamp inner join, which keeps only hourly bars sharing a
+              timestamp with a daily bar.
+        hourly_interval (str or int, optional): Hourly bar interval for the "asof" merge, as a timeframe
+            ("1h", see resampling.TIMEFRAMES) or milliseconds. Inferred from the Unix column if None, or
+            one hour if there are fewer than two distinct timestamps.
+        daily_interval (str or int, optional): Daily bar interval, as for `hourly_interval`. Inferred if
+            None, or one day if there are fewer than two distinct timestamps (e.g. a single daily bar).
 
     Returns:
         pd.DataFrame: A merged and cleaned DataFrame ready for further processing.
@@ -69,6 +212,7 @@ def merge_and_clean_data(hourly_data, daily_data):
         - Drops unnecessary columns (e.g., duplicated symbols and dates).
         - Removes rows with NaN values to ensure data integrity.
         - If daily data is unavailable, proceeds with hourly data only.
+        - The "asof" merge returns rows in ascending time order and does not modify its inputs.
 
     Raises:
         ValueError: If input data is invalid or merging fails.
@@ -77,6 +221,15 @@ def merge_and_clean_data(hourly_data, daily_data):
         print("Daily data is missing. Proceeding with hourly data only.")
         return hourly_data.copy()
 
+    if how == "asof":
+        merged_data = align_asof(hourly_data, daily_data, _bar_interval(hourly_data, hourly_interval, "1h"),
+                                 _bar_interval(daily_data, daily_interval, "d"), suffixes=("_1h", "_d"),
+                                 drop_incomplete=True)
+        merged_data.dropna(inplace=True)
+        return merged_data
+    if how != "inner":
+        raise ValueError(f"Unsupported merge method: {how}")
+
     # Convert timestamps
     hourly_data["time"] = pd.to_datetime(hourly_data["Unix"], unit="ms")
     daily_data["time"] = pd.to_datetime(daily_data["Unix"], unit="ms")
@@ -94,6 +247,105 @@ def merge_and_clean_data(hourly_data, daily_data):
 
     return merged_data
 
+def _find_universe_files(paths_or_glob):
+    """Resolve a glob pattern, a directory or a list of paths into a sorted list of CSV files."""
+    if isinstance(paths_or_glob, (str, os.PathLike)):
+        pattern = os.fspath(paths_or_glob)
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*.csv")
+        return sorted(glob.glob(pattern))
+    return sorted(os.fspath(path) for path in paths_or_glob)
+
+def _load_universe_symbol(symbol, hourly_file, daily_file, load_kwargs):
+    """Worker task: load, validate and merge one symbol. Returns (symbol, merged data, {file: error})."""
+    errors = {}
+    frames = {}
+    for label, file in (("hourly", hourly_file), ("daily", daily_file)):
+        if file is None:
+            continue
+        try:
+            frames[label] = _load_one_file(file, **load_kwargs)
+        except Exception as e:
+            errors[file] = f"{type(e).__name__}: {e}"
+
+    if "hourly" not in frames:
+        if hourly_file is None:
+            errors[f"<{symbol} hourly>"] = "FileNotFoundError: no hourly file found for this symbol"
+        return symbol, None, errors
+    try:
+        merged = merge_and_clean_data(frames["hourly"], frames.get("daily"))
+        if merged.index.name != "time":
+            # Hourly-only data comes back unindexed; index it by time like merged data
+            merged.index = pd.to_datetime(merged["Unix"], unit="ms").rename("time")
+    except Exception as e:
+        errors[hourly_file] = f"{type(e).__name__}: {e}"
+        return symbol, None, errors
+    return symbol, merged, errors
+
+def load_universe(paths_or_glob, workers=None, as_panel=False, hourly_timeframe="1h", daily_timeframe="d", **load_kwargs):
+    """
+    Load, validate and merge the hourly/daily pair of every symbol in a universe, in parallel.
+
+    Parameters:
+        paths_or_glob (str or list): Glob pattern (e.g. "data/Binance_*.csv"), directory, or list of CSV
+            paths. Files are paired by the symbol in their <exchange>_<symbol>_<timeframe>.csv name.
+        workers (int, optional): Number of worker processes. None uses one per CPU; 1 loads serially
+            in the calling process. Default is None.
+        as_panel (bool, optional): If True, return one DataFrame with a (symbol, time) MultiIndex
+            instead of a dict of frames. Default is False.
+        hourly_timeframe (str, optional): Timeframe suffix of the hourly files. Default is "1h".
+        daily_timeframe (str, optional): Timeframe suffix of the daily files. Default is "d".
+        **load_kwargs: Loading options forwarded per file (cache_dir, store_dir, lean, float32,
+            usecols, start, end), as in `load_csv_data`.
+
+    Returns:
+        tuple:
+            - dict or pd.DataFrame: Merged data per symbol ({symbol: DataFrame}), or a single
+              (symbol, time) panel if `as_panel` is True. Symbols that failed are left out.
+            - dict: Errors keyed by file path, with the exception type and message.
+
+    Notes:
+        - Unlike `load_csv_data`, failures are collected and returned rather than printed, so one bad
+          file does not hide the others.
+        - Files whose names do not follow the naming pattern are reported in the errors.
+        - A symbol without a (valid) daily file keeps its hourly data only, indexed by time.
+
+    Example:
+        frames, errors = load_universe("data/Binance_*.csv", workers=8)
+        panel, errors = load_universe("data/", as_panel=True)
+    """
+    errors = {}
+    pairs = {}
+    for file in _find_universe_files(paths_or_glob):
+        try:
+            symbol, timeframe = parse_symbol_timeframe(file)
+        except ValueError as e:
+            errors[file] = f"ValueError: {e}"
+            continue
+        if timeframe == hourly_timeframe:
+            pairs.setdefault(symbol, [None, None])[0] = file
+        elif timeframe == daily_timeframe:
+            pairs.setdefault(symbol, [None, None])[1] = file
+
+    tasks = [(symbol, hourly, daily, load_kwargs) for symbol, (hourly, daily) in sorted(pairs.items())]
+    if workers == 1 or len(tasks) <= 1:
+        results = [_load_universe_symbol(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_load_universe_symbol, *zip(*tasks)))
+
+    frames = {}
+    for symbol, merged, symbol_errors in results:
+        errors.update(symbol_errors)
+        if merged is not None:
+            frames[symbol] = merged
+
+    if as_panel:
+        if not frames:
+            return pd.DataFrame(), errors
+        return pd.concat(frames, names=["symbol"]), errors
+    return frames, errors
+
 # Standalone execution block for isolated manual testing and debugging
 if __name__ == "__main__":
     # Absolute paths to your data folder
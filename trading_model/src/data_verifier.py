@@ -7,14 +7,31 @@ Key Features:
     - Check for missing values.
     - Validate column data types against expected types.
     - Provide a quick summary of dataset structure and content.
+    - Scan OHLCV bars for timestamp and price integrity problems in one vectorized pass.
     - Run comprehensive data verification checks for preprocessing.
+    - Verify arbitrarily large histories chunk by chunk in bounded memory, with running state that
+      merges across partitions so verification can run in parallel.
 
 Functions:
     - check_missing_values: Identifies missing values in a DataFrame.
     - check_column_types: Verifies column data types match expectations.
+    - scan_integrity: Reports non-monotonic, duplicate and missing bars and inconsistent prices.
     - print_dataset_summary: Prints a quick overview of the dataset for inspection.
     - verify_dataset: Runs a set of checks to ensure dataset integrity.
+    - verify_chunks: Runs the streaming verifier over an iterable of DataFrame chunks.
+
+Classes:
+    - QuantileSketch: Small mergeable sketch for approximate quantiles.
+    - StreamingVerifier: Mergeable running statistics and integrity counts over DataFrame chunks.
 """
+import copy
+
+import numpy as np
+import pandas as pd
+from src.alignment import infer_interval
+
+INTEGRITY_CHECKS = ("non_monotonic", "duplicate_unix", "gaps", "zero_volume", "high_below_low", "close_outside_range")
+
 def check_missing_values(df):
     """
     Check for missing values in the dataset.
@@ -60,6 +77,108 @@ def check_column_types(df, expected_types):
             mismatched.append((column, None, expected_type))
     return mismatched
 
+def scan_integrity(df, interval=None, ascending=None, volume_columns=("Volume BTC", "Volume USDT")):
+    """
+    Scan OHLCV bars for timestamp and price integrity problems.
+
+    Args:
+        df (pd.DataFrame): Bars with a 'Unix' column (milliseconds) and, if present, High, Low, Close
+            and volume columns.
+        interval (int, optional): Bar interval in milliseconds. Inferred from the first 100,000 rows if None;
+            if those rows share one timestamp, no interval is inferred and gaps are not checked.
+        ascending (bool, optional): Expected time order. Inferred from the first and last Unix if None
+            (CryptoDataDownload exports are newest first).
+        volume_columns (tuple, optional): Columns checked for zero volume. Missing columns are skipped.
+
+    Returns:
+        dict: Integrity report, including:
+            - rows (int), ascending (bool), interval (int or None).
+            - issues (dict): Positional row indices (np.ndarray of int64) per check:
+                - non_monotonic: Rows whose Unix goes against the expected order.
+                - duplicate_unix: Repeats of a Unix value seen earlier in time order.
+                - gaps: Rows that follow a jump larger than the bar interval.
+                - zero_volume: Rows with a zero in any volume column.
+                - high_below_low: Rows with High < Low.
+                - close_outside_range: Rows with Close outside [Low, High].
+            - counts (dict): Number of offending rows per check.
+            - missing_bars (int): Bars missing inside all gaps.
+            - ok (bool): True if no check found a problem.
+
+    Notes:
+        - Every check is one vectorized NumPy expression over the column arrays. Well-ordered data needs
+          no sort; only non-monotonic input falls back to an argsort for the duplicate and gap checks.
+        - Use df.index[report["issues"][name]] to get index labels.
+    """
+    unix = df["Unix"].to_numpy(dtype=np.int64)
+    rows = len(unix)
+    if ascending is None:
+        ascending = rows < 2 or bool(unix[-1] >= unix[0])
+    if interval is None and rows >= 2:
+        sample = unix[:100_001]
+        if sample.min() != sample.max():
+            interval = infer_interval(sample)
+
+    step = np.diff(unix)
+    if not ascending:
+        np.negative(step, out=step)
+    non_monotonic = np.flatnonzero(step < 0) + 1
+    if len(non_monotonic):
+        # Out-of-order rows: evaluate duplicates and gaps in time order
+        order = np.argsort(unix, kind="stable")
+        if not ascending:
+            order = order[::-1]
+        step = np.abs(np.diff(unix[order]))
+        following = order[1:]
+    else:
+        following = None
+
+    def rows_after(mask):
+        positions = np.flatnonzero(mask)
+        return following[positions] if following is not None else positions + 1
+
+    duplicate_unix = rows_after(step == 0)
+    if interval:
+        gap_mask = step > interval
+        gaps = rows_after(gap_mask)
+        missing_bars = int((step[gap_mask] // interval - 1).sum())
+    else:
+        gaps = np.empty(0, dtype=np.int64)
+        missing_bars = 0
+
+    no_rows = np.zeros(rows, dtype=bool)
+    zero_volume = no_rows
+    for column in volume_columns:
+        if column in df.columns:
+            zero_volume = zero_volume | (df[column].to_numpy() == 0)
+    high_below_low = no_rows
+    close_outside_range = no_rows
+    if "High" in df.columns and "Low" in df.columns:
+        high = df["High"].to_numpy()
+        low = df["Low"].to_numpy()
+        high_below_low = high < low
+        if "Close" in df.columns:
+            close = df["Close"].to_numpy()
+            close_outside_range = (close < low) | (close > high)
+
+    issues = {
+        "non_monotonic": non_monotonic,
+        "duplicate_unix": np.sort(duplicate_unix),
+        "gaps": np.sort(gaps),
+        "zero_volume": np.flatnonzero(zero_volume),
+        "high_below_low": np.flatnonzero(high_below_low),
+        "close_outside_range": np.flatnonzero(close_outside_range),
+    }
+    counts = {name: len(indices) for name, indices in issues.items()}
+    return {
+        "rows": rows,
+        "ascending": ascending,
+        "interval": interval,
+        "issues": issues,
+        "counts": counts,
+        "missing_bars": missing_bars,
+        "ok": not any(counts.values()),
+    }
+
 def print_dataset_summary(df):
     """
     Print a summary of the dataset for quick inspection.
@@ -79,22 +198,324 @@ def print_dataset_summary(df):
     print("\nData Types:")
     print(df.dtypes)
 
-def verify_dataset(df, expected_types=None):
+def verify_dataset(df, expected_types=None, interval=None):
     """
     Run all dataset verification checks.
 
     Args:
         df (pd.DataFrame): Input DataFrame.
         expected_types (dict, optional): Expected column types. Defaults to None.
+        interval (int, optional): Bar interval in milliseconds for the gap check. Inferred if None.
 
     Returns:
         dict: Results of the verification checks, including:
             - missing_values: Summary of missing values.
             - type_mismatches (optional): List of columns with mismatched data types.
+            - integrity (optional): Report of `scan_integrity`, if the DataFrame has a 'Unix' column.
     """
     results = {
         "missing_values": check_missing_values(df),
     }
     if expected_types:
         results["type_mismatches"] = check_column_types(df, expected_types)
-    return results
\ No newline at end of file
+    if "Unix" in df.columns:
+        results["integrity"] = scan_integrity(df, interval=interval)
+    return results
+
+class QuantileSketch:
+    """
+    Small mergeable sketch for approximate quantiles (a KLL-style compactor hierarchy).
+
+    Args:
+        k (int, optional): Capacity of each level. The rank error is roughly log2(n / k) / k. Defaults to 256.
+
+    Notes:
+        - Level h holds values that each stand for 2**h inputs. A full level is sorted and every other
+          value is promoted to the next level, so memory stays O(k log(n / k)).
+        - NaN values are ignored.
+    """
+
+    def __init__(self, k=256):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self._offset = 0
+
+    def update(self, values):
+        """
+        Add values to the sketch.
+
+        Args:
+            values (array-like): New values.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.levels[0] = np.concatenate((self.levels[0], values))
+            self._compact()
+
+    def merge(self, other):
+        """
+        Merge another sketch into this one.
+
+        Args:
+            other (QuantileSketch): Sketch built on another part of the data.
+
+        Returns:
+            QuantileSketch: self.
+        """
+        for height, items in enumerate(other.levels):
+            if height == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[height] = np.concatenate((self.levels[height], items))
+        self._compact()
+        return self
+
+    def _compact(self):
+        height = 0
+        while height < len(self.levels):
+            items = self.levels[height]
+            if len(items) > self.k:
+                items = np.sort(items)
+                paired = len(items) - len(items) % 2
+                # Alternate the kept half so the rounding errors cancel out over compactions
+                promoted = items[self._offset:paired:2]
+                self._offset ^= 1
+                self.levels[height] = items[paired:]
+                if height + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[height + 1] = np.concatenate((self.levels[height + 1], promoted))
+            height += 1
+
+    def count(self):
+        """
+        Return the (weighted) number of values summarized.
+
+        Returns:
+            int: Total weight of the retained values.
+        """
+        return int(sum(len(items) << height for height, items in enumerate(self.levels)))
+
+    def quantile(self, q):
+        """
+        Return approximate quantiles.
+
+        Args:
+            q (float or array-like): Quantiles in [0, 1].
+
+        Returns:
+            float or np.ndarray: Approximate values at the requested quantiles (NaN if the sketch is empty).
+        """
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** height) for height, items in enumerate(self.levels)])
+        q_array = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if len(values) == 0:
+            result = np.full(len(q_array), np.nan)
+        else:
+            order = np.argsort(values, kind="stable")
+            cumulative = np.cumsum(weights[order])
+            ranks = q_array * (cumulative[-1] - 1)
+            result = values[order][np.minimum(np.searchsorted(cumulative, ranks, side="right"), len(values) - 1)]
+        return result if np.ndim(q) else float(result[0])
+
+class StreamingVerifier:
+    """
+    Mergeable running statistics and integrity counts over DataFrame chunks.
+
+    Args:
+        interval (int, optional): Bar interval in milliseconds. Inferred from the first chunk if None.
+        ascending (bool, optional): Time order of the chunks. Inferred from the first chunk if None;
+            pass it explicitly if the first chunk may hold a single row.
+        quantiles (tuple, optional): Quantiles reported in the summary. Defaults to (0.01, 0.5, 0.99).
+        sketch_size (int, optional): Level capacity of the quantile sketches. Defaults to 256.
+
+    Notes:
+        - State per column: NaN count, min/max, count/mean/M2 (Welford, merged with Chan's formula) and a
+          quantile sketch; plus the first/last Unix and integrity counts for the timestamp checks.
+        - Memory does not grow with the number of rows, apart from the sketches' logarithmic growth.
+        - Partitions must be merged in time order (earlier.merge(later)) so the timestamp checks see the
+          boundary between them.
+
+    Example:
+        verifier = StreamingVerifier(ascending=False)
+        for chunk in pd.read_csv("data/Binance_BTCUSDT_1h.csv", skiprows=1, chunksize=100_000):
+            verifier.update(chunk)
+        report = verifier.summary()
+    """
+
+    def __init__(self, interval=None, ascending=None, quantiles=(0.01, 0.5, 0.99), sketch_size=256):
+        self.interval = interval
+        self.ascending = ascending
+        self.quantiles = tuple(quantiles)
+        self.sketch_size = sketch_size
+        self.rows = 0
+        self.nan_counts = {}
+        self.numeric_columns = []
+        self.count = self.mean = self.m2 = self.minimum = self.maximum = None
+        self.sketches = {}
+        self.first_unix = self.last_unix = None
+        self.integrity = {name: 0 for name in INTEGRITY_CHECKS}
+        self.integrity["missing_bars"] = 0
+
+    def update(self, chunk):
+        """
+        Add a chunk of rows.
+
+        Args:
+            chunk (pd.DataFrame): Next rows, in the same time order as the previous chunks.
+
+        Returns:
+            StreamingVerifier: self.
+        """
+        if len(chunk) == 0:
+            return self
+        if not self.nan_counts:
+            self.nan_counts = {column: 0 for column in chunk.columns}
+            self.numeric_columns = [column for column in chunk.columns if pd.api.types.is_numeric_dtype(chunk[column])]
+            width = len(self.numeric_columns)
+            self.count = np.zeros(width, dtype=np.int64)
+            self.mean, self.m2 = np.zeros(width), np.zeros(width)
+            self.minimum, self.maximum = np.full(width, np.inf), np.full(width, -np.inf)
+            self.sketches = {column: QuantileSketch(self.sketch_size) for column in self.numeric_columns}
+
+        for column, missing in chunk.isna().sum().items():
+            self.nan_counts[column] = self.nan_counts.get(column, 0) + int(missing)
+        values = chunk[self.numeric_columns].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values)
+        count = valid.sum(axis=0)
+        filled = np.where(valid, values, 0.0)
+        mean = np.divide(filled.sum(axis=0), count, out=np.zeros(len(count)), where=count > 0)
+        m2 = (np.where(valid, values - mean, 0.0) ** 2).sum(axis=0)
+        minimum = np.where(valid, values, np.inf).min(axis=0)
+        maximum = np.where(valid, values, -np.inf).max(axis=0)
+        self._merge_moments(count, mean, m2, minimum, maximum)
+        for position, column in enumerate(self.numeric_columns):
+            self.sketches[column].update(values[:, position])
+        self.rows += len(chunk)
+
+        if "Unix" in chunk.columns:
+            report = scan_integrity(chunk, interval=self.interval, ascending=self.ascending)
+            self.interval = self.interval or report["interval"]
+            self.ascending = report["ascending"]
+            unix = chunk["Unix"].to_numpy(dtype=np.int64)
+            self._merge_integrity(report["counts"], report["missing_bars"], int(unix[0]), int(unix[-1]))
+        return self
+
+    def merge(self, other):
+        """
+        Merge the state of a verifier that saw the rows following this one's.
+
+        Args:
+            other (StreamingVerifier): Verifier of the next partition.
+
+        Returns:
+            StreamingVerifier: self.
+
+        Raises:
+            ValueError: If the verifiers saw different columns.
+        """
+        if not other.rows:
+            return self
+        if not self.rows:
+            # Deep copy, so later updates of this verifier never change other's sketches and counts
+            self.__dict__.update(copy.deepcopy(other.__dict__))
+            return self
+        if other.numeric_columns != self.numeric_columns:
+            raise ValueError("Cannot merge verifiers over different columns.")
+        for column, missing in other.nan_counts.items():
+            self.nan_counts[column] = self.nan_counts.get(column, 0) + missing
+        self._merge_moments(other.count, other.mean, other.m2, other.minimum, other.maximum)
+        for column, sketch in other.sketches.items():
+            self.sketches[column].merge(sketch)
+        self.rows += other.rows
+        self.interval = self.interval or other.interval
+        if self.ascending is None:
+            self.ascending = other.ascending
+        if other.first_unix is not None:
+            counts = {name: other.integrity[name] for name in INTEGRITY_CHECKS}
+            self._merge_integrity(counts, other.integrity["missing_bars"], other.first_unix, other.last_unix)
+        return self
+
+    def _merge_moments(self, count, mean, m2, minimum, maximum):
+        total = self.count + count
+        delta = mean - self.mean
+        share = np.divide(count, total, out=np.zeros(len(total)), where=total > 0)
+        self.mean = self.mean + delta * share
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * share
+        self.count = total
+        self.minimum = np.minimum(self.minimum, minimum)
+        self.maximum = np.maximum(self.maximum, maximum)
+
+    def _merge_integrity(self, counts, missing_bars, first_unix, last_unix):
+        for name, count in counts.items():
+            self.integrity[name] += count
+        self.integrity["missing_bars"] += missing_bars
+        if self.last_unix is not None:
+            # The step across the boundary between the previous rows and these
+            step = first_unix - self.last_unix if self.ascending is not False else self.last_unix - first_unix
+            if step < 0:
+                self.integrity["non_monotonic"] += 1
+            elif step == 0:
+                self.integrity["duplicate_unix"] += 1
+            elif self.interval and step > self.interval:
+                self.integrity["gaps"] += 1
+                self.integrity["missing_bars"] += step // self.interval - 1
+        else:
+            self.first_unix = first_unix
+        self.last_unix = last_unix
+
+    def summary(self):
+        """
+        Summarize everything seen so far.
+
+        Returns:
+            dict: Verification summary, including:
+                - rows (int): Rows seen.
+                - missing_values: Same layout as `check_missing_values`.
+                - statistics (pd.DataFrame): Per numeric column count, mean, std, min, quantiles and max.
+                - integrity (dict): Counts of the `scan_integrity` checks, missing bars, first/last Unix,
+                  interval and order.
+        """
+        total_missing = sum(self.nan_counts.values())
+        statistics = pd.DataFrame(index=pd.Index(self.numeric_columns, name="column"))
+        if self.numeric_columns:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                std = np.sqrt(self.m2 / (self.count - 1))
+            statistics["count"] = self.count
+            statistics["mean"] = np.where(self.count > 0, self.mean, np.nan)
+            statistics["std"] = np.where(self.count > 1, std, np.nan)
+            statistics["min"] = np.where(self.count > 0, self.minimum, np.nan)
+            for q in self.quantiles:
+                statistics[f"{q:.0%}"] = [self.sketches[column].quantile(q) for column in self.numeric_columns]
+            statistics["max"] = np.where(self.count > 0, self.maximum, np.nan)
+        integrity = dict(self.integrity)
+        integrity.update(first_unix=self.first_unix, last_unix=self.last_unix,
+                         interval=self.interval, ascending=self.ascending)
+        return {
+            "rows": self.rows,
+            "missing_values": {
+                "total_missing": total_missing,
+                "missing_by_column": {column: count for column, count in self.nan_counts.items() if count > 0},
+            },
+            "statistics": statistics,
+            "integrity": integrity,
+        }
+
+def verify_chunks(chunks, **kwargs):
+    """
+    Run the streaming verifier over an iterable of DataFrame chunks.
+
+    Args:
+        chunks (iterable): DataFrames in time order, e.g. `pd.read_csv(..., chunksize=100_000)`.
+        **kwargs: Passed to `StreamingVerifier`.
+
+    Returns:
+        dict: The verifier's summary.
+
+    Example:
+        report = verify_chunks(pd.read_csv(path, skiprows=1, chunksize=100_000))
+        print(report["statistics"])
+    """
+    verifier = StreamingVerifier(**kwargs)
+    for chunk in chunks:
+        verifier.update(chunk)
+    return verifier.summary()
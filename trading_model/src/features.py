@@ -0,0 +1,142 @@
+"""
+features.py
+
+This module builds lagged window features (the last k values of closes, returns and indicators)
+for the models without copying the data once per lag.
+
+Key Features:
+    - Exposes a (rows x lags x features) window over a feature matrix as a strided view
+      (`numpy.lib.stride_tricks.sliding_window_view`), so no lag is copied until training needs it.
+    - Materializes the contiguous training matrix (float32 by default) exactly once, chunk by chunk,
+      into a preallocated (or caller-provided, e.g. memory-mapped) buffer.
+    - Lag 0 is the current bar, lag k the bar k rows earlier, matching `shift(k)` columns.
+
+Functions:
+    - lag_window_view: Zero-copy (rows x lags x features) view of a 2-D array.
+    - lag_feature_names: Column names of the flattened lag matrix.
+    - build_lag_matrix: Contiguous (rows x lags * features) matrix from a view, chunk by chunk.
+    - build_lag_features: Lagged feature DataFrame from selected columns of a DataFrame.
+
+Use Case:
+    - X, y = prepare_features_and_target(data, "target", lags=24) trains on the last 24 bars of every
+      feature instead of only the current one.
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def lag_window_view(values, lags):
+    """
+    Return a zero-copy (rows x lags x features) view of lagged windows.
+
+    Parameters:
+        values (np.ndarray): (time x features) array in ascending time order (1-D is treated as one feature).
+        lags (int): Number of bars per window, including the current one.
+
+    Returns:
+        np.ndarray: Read-only view of shape (time - lags + 1, lags, features); window[i, k] is the row
+            `lags - 1 + i - k` of `values` (k = 0 is the current bar).
+
+    Raises:
+        ValueError: If there are fewer rows than lags.
+    """
+    values = np.asarray(values)
+    if values.ndim == 1:
+        values = values[:, None]
+    if lags < 1 or len(values) < lags:
+        raise ValueError(f"Need at least {lags} rows for {lags} lags, got {len(values)}.")
+    # sliding_window_view puts the window on the last axis, oldest first: (n, features, lags)
+    windows = sliding_window_view(values, lags, axis=0)
+    return windows.transpose(0, 2, 1)[:, ::-1, :]
+
+
+def lag_feature_names(columns, lags):
+    """
+    Return the column names of a flattened lag matrix.
+
+    Parameters:
+        columns (list): Feature names.
+        lags (int): Number of lags.
+
+    Returns:
+        list: Names "<column>_lag<k>", lag-major (all features of lag 0, then lag 1, ...).
+    """
+    return [f"{column}_lag{lag}" for lag in range(lags) for column in columns]
+
+
+def build_lag_matrix(values, lags, dtype=np.float32, chunk_rows=100_000, out=None):
+    """
+    Materialize the lagged windows of an array as one contiguous matrix.
+
+    Parameters:
+        values (np.ndarray): (time x features) array in ascending time order.
+        lags (int): Number of bars per window, including the current one.
+        dtype (np.dtype, optional): Output dtype. Default is float32.
+        chunk_rows (int, optional): Rows written per step. Default is 100,000.
+        out (np.ndarray, optional): C-contiguous output of shape (time - lags + 1, lags * features),
+            e.g. a `np.memmap`. Allocated if None.
+
+    Returns:
+        np.ndarray: Matrix whose row i holds window i flattened lag-major (see `lag_feature_names`).
+
+    Notes:
+        - Each chunk is copied straight from the strided view into the output, so the only allocation
+          is the output itself.
+    """
+    windows = lag_window_view(values, lags)
+    rows, _, features = windows.shape
+    if out is None:
+        out = np.empty((rows, lags * features), dtype=dtype)
+    elif out.shape != (rows, lags * features) or not out.flags.c_contiguous:
+        raise ValueError(f"out must be a C-contiguous array of shape {(rows, lags * features)}.")
+    target = out.reshape(rows, lags, features)
+    for start in range(0, rows, chunk_rows):
+        stop = min(start + chunk_rows, rows)
+        np.copyto(target[start:stop], windows[start:stop], casting="unsafe")
+    return out
+
+
+def build_lag_features(data, columns=None, lags=24, returns=("Close_1h",), dtype=np.float32,
+                       chunk_rows=100_000):
+    """
+    Build lagged window features from columns of a DataFrame.
+
+    Parameters:
+        data (pd.DataFrame): Input data in ascending time order (e.g. merged data with indicators).
+        columns (list, optional): Feature columns. Defaults to all numeric columns.
+        lags (int, optional): Number of bars per window, including the current one. Default is 24.
+        returns (tuple, optional): Columns whose one-bar simple returns are added as extra features
+            ("<column>_return"). Default is ("Close_1h",); columns not present are skipped.
+        dtype (np.dtype, optional): Dtype of the feature matrix. Default is float32.
+        chunk_rows (int, optional): Rows materialized per step. Default is 100,000.
+
+    Returns:
+        pd.DataFrame: One row per bar from the `lags`-th on (indexed like `data`), with columns
+            "<column>_lag<k>" backed by a single contiguous array.
+
+    Notes:
+        - Memory: one (time x features) copy of the selected columns in `dtype`, plus the output.
+          Shifting each column per lag would allocate a full copy per lag and column.
+        - Rows whose window contains NaN (e.g. the first return) keep the NaN; drop them as needed.
+
+    Example:
+        X_lagged = build_lag_features(data, ["Close_1h", "rsi", "macd"], lags=12)
+    """
+    if columns is None:
+        columns = data.select_dtypes(include=["number"]).columns.tolist()
+    columns = list(columns)
+    extra = [column for column in returns if column in data.columns]
+
+    source = np.empty((len(data), len(columns) + len(extra)), dtype=dtype)
+    for position, column in enumerate(columns):
+        source[:, position] = data[column].to_numpy()
+    for position, column in enumerate(extra, start=len(columns)):
+        prices = data[column].to_numpy(dtype=np.float64)
+        source[0, position] = np.nan
+        np.divide(prices[1:], prices[:-1], out=source[1:, position], casting="unsafe")
+        source[1:, position] -= 1
+
+    names = columns + [f"{column}_return" for column in extra]
+    matrix = build_lag_matrix(source, lags, dtype=dtype, chunk_rows=chunk_rows)
+    return pd.DataFrame(matrix, index=data.index[lags - 1:], columns=lag_feature_names(names, lags), copy=False)
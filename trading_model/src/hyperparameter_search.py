@@ -0,0 +1,318 @@
+"""
+hyperparameter_search.py
+
+This module searches RandomForestClassifier settings (n_estimators, max_depth, min_samples_leaf,
+max_features) with walk-forward or hold-out folds from `validation`.
+
+Key Features:
+    - Grid candidates (every combination) or random candidates (lists or scipy.stats distributions).
+    - Optional successive halving: every candidate is first scored on a fraction of the most recent
+      training rows of each fold, and only the best 1/factor go on to the next, larger, fraction.
+    - (candidate, fold) tasks run in a process pool. The float32 feature matrix and target are
+      written once to .npy files that every worker memory-maps, so tasks only carry parameters and
+      fold boundaries.
+    - Finished (params, fold, data fingerprint) results are appended to a JSON-lines cache as they
+      complete, so an interrupted search resumes without retraining what already finished, and a
+      changed dataset never reuses stale scores.
+
+Functions:
+    - grid_candidates: Every combination of a parameter grid.
+    - random_candidates: Candidates sampled from a parameter space.
+    - data_fingerprint: Content hash of the feature matrix and target.
+    - search: Scores candidates on folds and ranks them.
+
+Classes:
+    - SearchCache: JSON-lines cache of finished (candidate, fold) results.
+
+Use Case:
+    - Tune the model before training it in the pipeline:
+      results = search(X, y, grid_candidates(DEFAULT_GRID), walk_forward_splits(len(X), purge=24),
+                       cache_path="search.jsonl")
+      model = train_model(X_train, y_train, **results["params"].iloc[0])
+"""
+import hashlib
+import itertools
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from src.validation import score_fold, score_fold_memmap, shared_arrays
+
+# Default grid over the RandomForestClassifier settings worth tuning
+DEFAULT_GRID = {
+    "n_estimators": [100, 200, 400],
+    "max_depth": [None, 8, 16],
+    "min_samples_leaf": [1, 5, 20],
+    "max_features": ["sqrt", 0.3, 0.6],
+}
+
+SCORINGS = ("accuracy", "precision", "recall")
+
+
+def grid_candidates(grid):
+    """
+    Return every combination of a parameter grid.
+
+    Parameters:
+        grid (dict): Parameter name -> list of values.
+
+    Returns:
+        list: One dict of parameters per combination.
+
+    Example:
+        grid_candidates({"max_depth": [None, 8], "min_samples_leaf": [1, 5]})  # 4 candidates
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def _plain(value):
+    # NumPy scalars -> Python scalars, so candidates are JSON-serializable and valid sklearn params
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def random_candidates(space, n_candidates, seed=42):
+    """
+    Sample distinct candidates from a parameter space.
+
+    Parameters:
+        space (dict): Parameter name -> list of values (sampled uniformly) or an object with an
+            `rvs(random_state=...)` method, such as `scipy.stats.randint(1, 50)`.
+        n_candidates (int): Number of candidates.
+        seed (int, optional): Seed of the sampler. Default is 42.
+
+    Returns:
+        list: Up to `n_candidates` distinct dicts of parameters (fewer if the space is smaller).
+    """
+    rng = np.random.default_rng(seed)
+    candidates, seen = [], set()
+    for _ in range(n_candidates * 10):
+        if len(candidates) == n_candidates:
+            break
+        params = {}
+        for name, values in space.items():
+            if hasattr(values, "rvs"):
+                params[name] = _plain(values.rvs(random_state=rng))
+            else:
+                params[name] = _plain(values[rng.integers(len(values))])
+        key = _params_key(params)
+        if key not in seen:
+            seen.add(key)
+            candidates.append(params)
+    return candidates
+
+
+def data_fingerprint(X, y):
+    """
+    Return a content hash of a feature matrix and its target.
+
+    Parameters:
+        X (np.ndarray): Feature matrix.
+        y (np.ndarray): Target.
+
+    Returns:
+        str: Hex digest; equal only for identical values, shapes and dtypes.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for values in (X, y):
+        values = np.ascontiguousarray(values)
+        digest.update(f"{values.dtype}{values.shape}".encode())
+        digest.update(values.view(np.uint8))
+    return digest.hexdigest()
+
+
+def _params_key(params):
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+class SearchCache:
+    """
+    JSON-lines cache of finished (candidate, fold) results.
+
+    Parameters:
+        path (str, optional): File the results are appended to. None keeps them in memory only.
+
+    Notes:
+        - Each result is written and flushed as soon as it finishes; a truncated last line (from an
+          interrupted write) is ignored on load.
+        - Keys are (params, fold ranges, random_state, data fingerprint).
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        if path is not None and os.path.exists(path):
+            with open(path) as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.entries[record["key"]] = record["metrics"]
+
+    @staticmethod
+    def key(params, fold, random_state, fingerprint):
+        ranges = [fold.train_start, fold.train_stop, fold.test_start, fold.test_stop]
+        return json.dumps([_params_key(params), ranges, random_state, fingerprint])
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def put(self, key, metrics):
+        self.entries[key] = metrics
+        if self.path is not None:
+            with open(self.path, "a") as handle:
+                handle.write(json.dumps({"key": key, "metrics": metrics}, default=float) + "\n")
+
+
+def _halving_stages(candidates, factor):
+    # Number of halving rounds until at most `factor` candidates remain for the full-data stage
+    rounds = 0
+    while candidates > factor:
+        candidates = math.ceil(candidates / factor)
+        rounds += 1
+    return rounds
+
+
+def _shrink(fold, fraction):
+    # Keep the most recent `fraction` of the training window; the test window is unchanged
+    rows = max(int(round((fold.train_stop - fold.train_start) * fraction)), 1)
+    return fold._replace(train_start=fold.train_stop - rows)
+
+
+def _fold_stats(values):
+    # Mean and standard deviation over folds, skipping NaN (precision/recall of single-class folds)
+    values = np.array(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return np.nan, np.nan
+    return float(values.mean()), float(values.std())
+
+
+def search(X, y, candidates, folds, scoring="accuracy", workers=None, random_state=42, halving=False,
+           factor=3, cache_path=None, dtype=np.float32, temp_dir=None):
+    """
+    Score hyperparameter candidates on walk-forward or hold-out folds and rank them.
+
+    Parameters:
+        X (pd.DataFrame): Features in ascending time order (numeric columns are used, as in train_model).
+        y (pd.Series or np.ndarray): Target, aligned with X.
+        candidates (list): Parameter dicts from `grid_candidates` or `random_candidates`.
+        folds (list): Folds from `validation.walk_forward_splits` or `validation.holdout_split`.
+        scoring (str, optional): Metric to rank by: "accuracy", "precision" or "recall" (of class 1),
+            averaged over the folds. Default is "accuracy".
+        workers (int, optional): Number of worker processes. None uses one per CPU; 1 runs serially
+            in this process. Default is None.
+        random_state (int, optional): Random state passed to train_model. Default is 42.
+        halving (bool, optional): Use successive halving. Default is False (every candidate is scored
+            on the full training windows).
+        factor (int, optional): Halving factor: each stage keeps the best 1/factor of the candidates
+            and multiplies the training fraction by `factor`. Default is 3.
+        cache_path (str, optional): JSON-lines file caching finished results across runs. Default is
+            None (no persistence).
+        dtype (np.dtype, optional): Dtype of the shared feature matrix. Default is float32.
+        temp_dir (str, optional): Parent directory of the shared .npy files. Default is the system one.
+
+    Returns:
+        pd.DataFrame: One row per (stage, candidate) with params (dict), one "param_<name>" column per
+            parameter, stage, fraction, mean_score, std_score, mean_accuracy, mean_precision,
+            mean_recall (each over the folds where the metric is defined), fit_seconds and cached
+            (number of folds read from the cache). Sorted by stage (last first), then mean_score, so the
+            first row is the best candidate.
+
+    Raises:
+        ValueError: If the scoring is unknown, there are no candidates or a candidate sets random_state.
+
+    Notes:
+        - Halving stages train on the most recent factor**(stage - last) share of every training window,
+          so early stages are cheap and the last stage uses the full windows.
+        - Cached results are only reused for identical params, fold ranges, random_state and data.
+
+    Example:
+        folds = walk_forward_splits(len(X), n_splits=3, purge=24)
+        candidates = random_candidates(DEFAULT_GRID, 30)
+        results = search(X, y, candidates, folds, halving=True, cache_path="search.jsonl")
+        best_params = results["params"].iloc[0]
+    """
+    if scoring not in SCORINGS:
+        raise ValueError(f"Unsupported scoring: {scoring}")
+    if not candidates:
+        raise ValueError("No candidates to search.")
+    if any("random_state" in params for params in candidates):
+        raise ValueError("Candidates must not set random_state; pass it to search() instead.")
+
+    numeric = X.select_dtypes(include=["number"])
+    columns = list(numeric.columns)
+    values = np.ascontiguousarray(numeric.to_numpy(dtype=dtype))
+    target = np.ascontiguousarray(np.asarray(y))
+    fingerprint = data_fingerprint(values, target)
+    cache = SearchCache(cache_path)
+
+    rounds = _halving_stages(len(candidates), factor) if halving else 0
+    parallel = workers != 1 and len(candidates) * len(folds) > 1
+
+    def run(score_task):
+        rows, remaining = [], list(candidates)
+        for stage in range(rounds + 1):
+            fraction = float(factor) ** (stage - rounds)
+            stage_folds = [_shrink(fold, fraction) for fold in folds] if fraction < 1 else list(folds)
+            metrics, pending = {}, []
+            for index, params in enumerate(remaining):
+                for fold in stage_folds:
+                    key = SearchCache.key(params, fold, random_state, fingerprint)
+                    cached = cache.get(key)
+                    if cached is not None:
+                        metrics[index, fold.fold] = (cached, True)
+                    else:
+                        pending.append((index, fold, key))
+            for (index, fold, key), result in score_task(remaining, pending):
+                cache.put(key, result)
+                metrics[index, fold.fold] = (result, False)
+
+            stage_rows = []
+            for index, params in enumerate(remaining):
+                results = [metrics[index, fold.fold] for fold in stage_folds]
+                mean_score, std_score = _fold_stats([result[scoring] for result, _ in results])
+                row = {"params": params}
+                row.update({f"param_{name}": value for name, value in params.items()})
+                row.update(stage=stage, fraction=fraction, mean_score=mean_score, std_score=std_score)
+                for metric in SCORINGS:
+                    row[f"mean_{metric}"] = _fold_stats([result[metric] for result, _ in results])[0]
+                row["fit_seconds"] = sum(result["fit_seconds"] for result, _ in results)
+                row["cached"] = sum(from_cache for _, from_cache in results)
+                stage_rows.append(row)
+            rows.extend(stage_rows)
+
+            if stage < rounds:
+                keep = math.ceil(len(remaining) / factor)
+                scores = np.array([row["mean_score"] for row in stage_rows])
+                ranked = np.argsort(-np.nan_to_num(scores, nan=-np.inf), kind="stable")
+                remaining = [remaining[i] for i in ranked[:keep]]
+        return rows
+
+    if not parallel:
+        def score_task(remaining, pending):
+            for task in pending:
+                index, fold, _ = task
+                yield task, score_fold(fold, values, target, columns, random_state, remaining[index])
+
+        rows = run(score_task)
+    else:
+        with shared_arrays(values, target, temp_dir) as (X_path, y_path):
+            del values
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                def score_task(remaining, pending):
+                    futures = {executor.submit(score_fold_memmap, fold, X_path, y_path, columns, random_state,
+                                               remaining[index]): (index, fold, key)
+                               for index, fold, key in pending}
+                    for future in as_completed(futures):
+                        yield futures[future], future.result()
+
+                rows = run(score_task)
+
+    results = pd.DataFrame(rows)
+    results = results.sort_values(["stage", "mean_score"], ascending=False, na_position="last", kind="stable")
+    return results.reset_index(drop=True)
@@ -0,0 +1,301 @@
+"""
+indicator_registry.py
+
+This module computes technical indicators requested by name from a declarative registry.
+
+Key Features:
+    - Each registered indicator states its inputs (price columns or other indicators) and parameters,
+      e.g. "rsi" depends on "gain" and "loss", which both depend on "close_diff".
+    - A planner resolves the requested names into a dependency graph (DAG) with one node per unique
+      (indicator, params), so every intermediate (close_diff, gain/loss series, individual EMAs) is
+      computed at most once per call.
+    - A memo cache keyed by (input column fingerprint, indicator, params) reuses results across calls,
+      so sweeping many parameterizations does not recompute shared pieces.
+    - Names carry their parameters: "sma_20", "ema_12", "rsi_14", "macd_12_26", "signal_line_12_26_9",
+      "highest_20", "lowest_20", "stoch_k_14", "williams_r_14", "atr_14", "vwap_24", "obv", "mfi_14";
+      without parameters the defaults of `add_technical_indicators` apply.
+
+Functions:
+    - register_indicator: Adds an indicator definition to the registry.
+    - parse_request: Splits a requested name into indicator and parameters.
+    - plan_indicators: Builds the ordered computation plan for a set of requested names.
+    - compute_indicators: Computes requested indicators and adds them to a DataFrame.
+
+Classes:
+    - IndicatorCache: Bounded memo cache of computed indicator series.
+
+Use Case:
+    - compute_indicators(data, ["sma_20", "sma_50", "rsi", "macd", "signal_line"]) gives the same
+      columns as `add_technical_indicators` (without dropping the warmup rows).
+"""
+import hashlib
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+from src.indicators import average_true_range, rolling_vwap, on_balance_volume, money_flow_index
+from src.indicators_numpy import rolling_max, rolling_min, true_range
+
+IndicatorSpec = namedtuple("IndicatorSpec", ["func", "inputs", "params", "defaults"])
+
+# Registered indicators by name
+INDICATORS = {}
+
+# Price inputs and the columns they read by default
+DEFAULT_SOURCES = {"close": "Close_1h", "high": "High_1h", "low": "Low_1h", "volume": "Volume BTC_1h"}
+
+
+def register_indicator(name, func, inputs=(), params=(), defaults=()):
+    """
+    Add an indicator definition to the registry.
+
+    Parameters:
+        name (str): Indicator name (must not end in a number, which is read as a parameter).
+        func (callable): Called as func(*input_series, *param_values); returns a pd.Series.
+        inputs (tuple): Inputs in call order. Each is a price source name ("close", "high", ...) or a
+            tuple (indicator_name, param_names) whose parameters are taken from this indicator's.
+        params (tuple): Parameter names.
+        defaults (tuple): Default parameter values, same length as `params`.
+
+    Returns:
+        IndicatorSpec: The registered definition.
+
+    Example:
+        register_indicator("momentum", lambda close, n: close.diff(n), inputs=("close",),
+                           params=("period",), defaults=(10,))
+    """
+    if len(params) != len(defaults):
+        raise ValueError(f"Indicator {name} needs one default per parameter.")
+    spec = IndicatorSpec(func, tuple(inputs), tuple(params), tuple(defaults))
+    INDICATORS[name] = spec
+    return spec
+
+
+register_indicator("close_diff", lambda close: close.diff(1), inputs=("close",))
+register_indicator("gain", lambda diff, period: diff.clip(lower=0).rolling(period).mean(),
+                   inputs=(("close_diff", ()),), params=("period",), defaults=(14,))
+register_indicator("loss", lambda diff, period: -diff.clip(upper=0).rolling(period).mean(),
+                   inputs=(("close_diff", ()),), params=("period",), defaults=(14,))
+register_indicator("rsi", lambda gain, loss, period: 100 - (100 / (1 + (gain / loss))),
+                   inputs=(("gain", ("period",)), ("loss", ("period",))), params=("period",), defaults=(14,))
+register_indicator("sma", lambda close, window: close.rolling(window=window).mean(),
+                   inputs=("close",), params=("window",), defaults=(20,))
+register_indicator("ema", lambda close, span: close.ewm(span=span, adjust=False).mean(),
+                   inputs=("close",), params=("span",), defaults=(12,))
+register_indicator("macd", lambda fast, slow, fast_span, slow_span: fast - slow,
+                   inputs=(("ema", ("fast",)), ("ema", ("slow",))), params=("fast", "slow"), defaults=(12, 26))
+register_indicator("signal_line", lambda macd, fast, slow, signal: macd.ewm(span=signal, adjust=False).mean(),
+                   inputs=(("macd", ("fast", "slow")),), params=("fast", "slow", "signal"), defaults=(12, 26, 9))
+
+
+def _series_kernel(kernel):
+    # Wraps an array kernel so it takes and returns pd.Series aligned on the first input's index
+    def compute(*args):
+        series = [arg for arg in args if isinstance(arg, pd.Series)]
+        params = args[len(series):]
+        arrays = [item.to_numpy(dtype=np.float64) for item in series]
+        return pd.Series(kernel(*arrays, *params), index=series[0].index)
+    return compute
+
+
+register_indicator("highest", _series_kernel(rolling_max), inputs=("high",), params=("window",), defaults=(20,))
+register_indicator("lowest", _series_kernel(rolling_min), inputs=("low",), params=("window",), defaults=(20,))
+register_indicator("true_range", _series_kernel(true_range), inputs=("high", "low", "close"))
+register_indicator("atr", _series_kernel(average_true_range), inputs=("high", "low", "close"),
+                   params=("period",), defaults=(14,))
+register_indicator("stoch_k", lambda highest, lowest, close, window:
+                   (100 * (close - lowest) / (highest - lowest)).replace([np.inf, -np.inf], np.nan),
+                   inputs=(("highest", ("window",)), ("lowest", ("window",)), "close"),
+                   params=("window",), defaults=(14,))
+register_indicator("williams_r", lambda highest, lowest, close, window:
+                   (-100 * (highest - close) / (highest - lowest)).replace([np.inf, -np.inf], np.nan),
+                   inputs=(("highest", ("window",)), ("lowest", ("window",)), "close"),
+                   params=("window",), defaults=(14,))
+register_indicator("vwap", _series_kernel(rolling_vwap), inputs=("high", "low", "close", "volume"),
+                   params=("window",), defaults=(24,))
+register_indicator("obv", _series_kernel(on_balance_volume), inputs=("close", "volume"))
+register_indicator("mfi", _series_kernel(money_flow_index), inputs=("high", "low", "close", "volume"),
+                   params=("period",), defaults=(14,))
+
+
+def parse_request(request):
+    """
+    Split a requested name into indicator name and parameters.
+
+    Parameters:
+        request (str): Name such as "sma_20", "macd_12_26" or "rsi" (defaults apply).
+
+    Returns:
+        tuple: (indicator_name, params) with params as a tuple of ints.
+
+    Raises:
+        KeyError: If the indicator is not registered.
+        ValueError: If the number of parameters does not match the indicator.
+    """
+    parts = request.split("_")
+    values = []
+    while parts and parts[-1].lstrip("-").isdigit():
+        values.insert(0, int(parts.pop()))
+    name = "_".join(parts)
+    if name not in INDICATORS:
+        raise KeyError(f"Unknown indicator: {request}")
+    spec = INDICATORS[name]
+    if not values:
+        return name, spec.defaults
+    if len(values) != len(spec.params):
+        raise ValueError(f"{name} takes parameters {spec.params}, got {tuple(values)} in '{request}'.")
+    return name, tuple(values)
+
+
+def plan_indicators(requests):
+    """
+    Build the computation plan for a set of requested indicators.
+
+    Parameters:
+        requests (list): Requested names, e.g. ["sma_20", "rsi", "macd_8_21"].
+
+    Returns:
+        tuple: (plan, targets, sources) where
+            - plan (list): Unique (name, params) nodes in dependency order.
+            - targets (dict): Requested name -> its (name, params) node.
+            - sources (dict): Node -> frozenset of price sources it depends on (for cache keys).
+    """
+    plan, sources = [], {}
+
+    def visit(node, path):
+        if node in sources:
+            return sources[node]
+        if node in path:
+            raise ValueError(f"Cyclic indicator dependency at {node}.")
+        spec = INDICATORS[node[0]]
+        values = dict(zip(spec.params, node[1]))
+        used = set()
+        for item in spec.inputs:
+            if isinstance(item, str):
+                used.add(item)
+            else:
+                dependency = (item[0], tuple(values[param] for param in item[1]))
+                used |= visit(dependency, path | {node})
+        sources[node] = frozenset(used)
+        plan.append(node)
+        return sources[node]
+
+    targets = {}
+    for request in requests:
+        targets[request] = parse_request(request)
+        visit(targets[request], frozenset())
+    return plan, targets, sources
+
+
+def _fingerprint(values):
+    values = np.ascontiguousarray(values)
+    digest = hashlib.blake2b(values.view(np.uint8), digest_size=16)
+    digest.update(str(values.dtype).encode())
+    return digest.hexdigest()
+
+
+class IndicatorCache:
+    """
+    Bounded memo cache of computed indicator series.
+
+    Parameters:
+        maxsize (int, optional): Maximum number of cached series; least recently used ones are evicted.
+            Default is 256.
+
+    Notes:
+        - Keys are (input column fingerprints, indicator name, params), so a cached value is reused for
+          any DataFrame whose input columns hold the same values, and never for changed data.
+        - Values are stored as NumPy arrays and re-wrapped with the caller's index.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, values):
+        self.entries[key] = values
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+
+def compute_indicators(data, requests, sources=None, cache=None, dropna=False):
+    """
+    Compute the requested indicators and add them to a DataFrame.
+
+    Parameters:
+        data (pd.DataFrame): Input DataFrame with the price columns the indicators need.
+        requests (list): Indicator names, e.g. ["sma_20", "sma_50", "rsi", "macd", "signal_line"].
+            Each becomes a column of the same name.
+        sources (dict, optional): Price source -> column overrides, e.g. {"close": "Close"}.
+            Defaults to DEFAULT_SOURCES (the merged "_1h" columns).
+        cache (IndicatorCache, optional): Memo cache shared across calls. Without it, intermediates are
+            still shared within the call.
+        dropna (bool, optional): Drop rows with NaNs (the warmup), as `add_technical_indicators` does.
+            Default is False.
+
+    Returns:
+        pd.DataFrame: The input DataFrame with the requested columns added (modified in place).
+
+    Example:
+        cache = IndicatorCache()
+        sweep = [f"sma_{window}" for window in range(5, 201, 5)] + ["macd_8_21", "macd_12_26"]
+        data = compute_indicators(data, sweep, cache=cache)
+    """
+    columns = dict(DEFAULT_SOURCES)
+    columns.update(sources or {})
+    plan, targets, node_sources = plan_indicators(requests)
+
+    fingerprints = {}
+    results = {}
+
+    def cache_key(node):
+        for source in node_sources[node]:
+            if source not in fingerprints:
+                fingerprints[source] = _fingerprint(data[columns[source]].to_numpy())
+        return (tuple(sorted((source, fingerprints[source]) for source in node_sources[node])),) + node
+
+    def resolve(node):
+        # Depth-first over the plan: a cached node never touches its dependencies
+        if node in results:
+            return results[node]
+        key = cache_key(node) if cache is not None else None
+        cached = cache.get(key) if key is not None else None
+        if cached is not None:
+            results[node] = pd.Series(cached, index=data.index, copy=False)
+            return results[node]
+
+        spec = INDICATORS[node[0]]
+        values = dict(zip(spec.params, node[1]))
+        arguments = []
+        for item in spec.inputs:
+            if isinstance(item, str):
+                arguments.append(data[columns[item]])
+            else:
+                arguments.append(resolve((item[0], tuple(values[param] for param in item[1]))))
+        results[node] = spec.func(*arguments, *node[1])
+        if key is not None:
+            stored = results[node].to_numpy(copy=True)
+            stored.setflags(write=False)
+            cache.put(key, stored)
+        return results[node]
+
+    for request, node in targets.items():
+        data[request] = resolve(node).to_numpy()
+    if dropna:
+        data.dropna(inplace=True)
+    return data
@@ -9,14 +9,44 @@ Key Features:
     - Simple Moving Averages (SMA) for trend analysis.
     - Relative Strength Index (RSI) for momentum evaluation.
     - Moving Average Convergence Divergence (MACD) and Signal Line for trend reversal detection.
+    - Batched SMA/EMA over many windows in one call for parameter sweeps (time x window arrays).
+    - Panel mode: the standard indicators for a whole (time x symbol) close matrix in one pass.
+    - Range indicators from rolling highs and lows (Donchian channels, stochastic oscillator,
+      Williams %R) on O(n) rolling extrema, and the Average True Range (ATR).
+    - Volume-aware indicators (rolling and session VWAP, OBV, money-flow index, average trade size)
+      from cumulative sums; session VWAP resets at session boundaries with a segmented cumulative
+      sum instead of a groupby-apply.
+
+Functions:
+    - add_technical_indicators: Adds the standard indicator set to a DataFrame.
+    - sma_batch: Simple moving averages for many windows from a single cumulative-sum pass.
+    - ema_batch: Exponential moving averages for many spans with a C-level linear filter per span.
+    - add_panel_indicators: Standard indicators for every symbol of a close matrix, as a panel or long frame.
+    - donchian_channels: Highest high, lowest low and their midpoint over a window.
+    - stochastic_oscillator: %K and %D of the close within the rolling high-low range.
+    - williams_r: Williams %R.
+    - average_true_range: Wilder-smoothed true range.
+    - add_range_indicators: Adds the range indicators and ATR to a DataFrame.
+    - segmented_cumsum: Cumulative sum that restarts at given rows.
+    - rolling_vwap: Volume-weighted average typical price over a window of bars.
+    - session_vwap: VWAP accumulated since the start of each session (e.g. UTC day).
+    - on_balance_volume: On-Balance Volume (OBV).
+    - money_flow_index: Money-flow index (MFI).
+    - average_trade_size: Base volume per trade, per bar or over a window.
+    - add_volume_indicators: Adds the volume-aware indicators to a DataFrame.
 
 Use Case:
     - Enhance raw price data with meaningful technical indicators for trading strategy development.
 """
 
+import numpy as np
 import pandas as pd
+from scipy.signal import lfilter
+from src.indicators_numpy import compute_indicator_arrays, compute_panel_arrays, INDICATOR_COLUMNS
+from src.indicators_numpy import rolling_max, rolling_min, rolling_mean, true_range, ema
+from src.resampling import timeframe_ms, bucket_starts, group_starts
 
-def add_technical_indicators(data: pd.DataFrame) -> pd.DataFrame:
+def add_technical_indicators(data: pd.DataFrame, backend: str = "pandas") -> pd.DataFrame:
     """
     Add technical indicators to the provided DataFrame.
 
@@ -27,6 +57,9 @@ def add_technical_indicators(data: pd.DataFrame) -> pd.DataFrame:
 
     Parameters:
         data (pd.DataFrame): Input DataFrame containing a 'Close_1h' column for hourly close prices.
+        backend (str, optional): "pandas" (default) computes with Series operations; "numpy" uses the
+            raw-array backend in indicators_numpy (same values up to float rounding, fewer allocations,
+            float32 close prices stay float32).
 
     Returns:
         pd.DataFrame: The input DataFrame with added technical indicators.
@@ -39,6 +72,14 @@ def add_technical_indicators(data: pd.DataFrame) -> pd.DataFrame:
         data = pd.DataFrame({"Close_1h": [100, 101, 102, 103, ...]})
         data_with_indicators = add_technical_indicators(data)
     """
+    if backend == "numpy":
+        for column, values in compute_indicator_arrays(data["Close_1h"].to_numpy()).items():
+            data[column] = values
+        data.dropna(inplace=True)
+        return data
+    if backend != "pandas":
+        raise ValueError(f"Unknown indicator backend: {backend}")
+
     # Simple Moving Averages (SMA)
     data["sma_20"] = data["Close_1h"].rolling(window=20).mean()
     data["sma_50"] = data["Close_1h"].rolling(window=50).mean()
@@ -59,3 +100,454 @@ def add_technical_indicators(data: pd.DataFrame) -> pd.DataFrame:
     data.dropna(inplace=True)
     
     return data
+
+
+def sma_batch(close, windows, dtype=np.float64) -> np.ndarray:
+    """
+    Compute simple moving averages for many windows at once.
+
+    Parameters:
+        close (array-like): Close prices in time order.
+        windows (array-like): Window lengths, e.g. range(5, 201).
+        dtype (np.dtype, optional): Output dtype; float32 halves the memory of large sweeps. Default is float64.
+
+    Returns:
+        np.ndarray: Array of shape (len(close), len(windows)); column j equals
+            `pd.Series(close).rolling(windows[j]).mean()` (NaN for the first windows[j] - 1 rows).
+
+    Notes:
+        - One cumulative sum of the (first-value-centered) prices serves every window: each average is
+          a difference of two prefix sums. Centering keeps the prefix sums small, so the rounding error
+          stays near that of pandas' rolling sum.
+        - A NaN price makes every window containing it NaN, as in pandas.
+        - The result is column-major (each window's series is contiguous).
+
+    Example:
+        smas = sma_batch(data["Close_1h"], range(5, 201))
+        sweep = pd.DataFrame(smas, index=data.index, columns=[f"sma_{w}" for w in range(5, 201)])
+    """
+    values = np.asarray(close, dtype=np.float64)
+    windows = np.asarray(windows, dtype=np.int64)
+    rows = len(values)
+    result = np.empty((len(windows), rows), dtype=dtype)
+    if rows == 0:
+        return result.T
+
+    missing = np.isnan(values)
+    has_missing = missing.any()
+    origin = values[~missing][0] if not missing.all() else 0.0
+    prefix = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, values - origin))))
+    if has_missing:
+        missing_prefix = np.concatenate(([0], np.cumsum(missing)))
+
+    for column, window in enumerate(windows):
+        out = result[column]
+        out[:window - 1] = np.nan
+        if window > rows:
+            continue
+        tail = out[window - 1:]
+        np.subtract(prefix[window:], prefix[:-window], out=tail, casting="same_kind")
+        tail *= 1.0 / window
+        tail += origin
+        if has_missing:
+            tail[missing_prefix[window:] - missing_prefix[:-window] > 0] = np.nan
+    return result.T
+
+
+def ema_batch(close, spans, dtype=np.float64) -> np.ndarray:
+    """
+    Compute exponential moving averages for many spans at once.
+
+    Parameters:
+        close (array-like): Close prices in time order.
+        spans (array-like): EMA spans, e.g. range(5, 101).
+        dtype (np.dtype, optional): Output dtype. Default is float64.
+
+    Returns:
+        np.ndarray: Array of shape (len(close), len(spans)); column j equals
+            `pd.Series(close).ewm(span=spans[j], adjust=False).mean()`.
+
+    Notes:
+        - Each span runs the recursion y[t] = a * x[t] + (1 - a) * y[t - 1] as one C-level
+          `scipy.signal.lfilter` call, seeded with the first price like pandas' adjust=False.
+        - Prices containing NaN fall back to pandas' `ewm`, which skips missing values.
+        - The result is column-major (each span's series is contiguous).
+    """
+    values = np.asarray(close, dtype=np.float64)
+    spans = np.asarray(spans, dtype=np.float64)
+    result = np.empty((len(spans), len(values)), dtype=dtype)
+    if len(values) == 0:
+        return result.T
+
+    if np.isnan(values).any():
+        series = pd.Series(values)
+        for column, span in enumerate(spans):
+            result[column] = series.ewm(span=span, adjust=False).mean().to_numpy()
+        return result.T
+
+    for column, span in enumerate(spans):
+        alpha = 2.0 / (span + 1.0)
+        decay = 1.0 - alpha
+        result[column], _ = lfilter([alpha], [1.0, -decay], values, zi=[decay * values[0]])
+    return result.T
+
+
+def add_panel_indicators(closes: pd.DataFrame, output: str = "long", close_column: str = "Close_1h") -> pd.DataFrame:
+    """
+    Compute the standard indicators for every symbol of a (time x symbol) close matrix at once.
+
+    Parameters:
+        closes (pd.DataFrame): Close prices indexed by time (ascending) with one column per symbol;
+            NaN before a symbol's listing. From a `load_universe(..., as_panel=True)` panel:
+            `panel["Close_1h"].unstack("symbol")`.
+        output (str, optional): "long" (default) for one row per (symbol, time) with the warmup rows
+            dropped, like per-symbol `add_technical_indicators` and ready for `add_target`; "panel" for
+            a wide DataFrame with (field, symbol) columns and all rows kept.
+        close_column (str, optional): Name of the close column in the result. Default is "Close_1h".
+
+    Returns:
+        pd.DataFrame: Long frame indexed by (symbol, time), or wide panel with MultiIndex columns.
+
+    Notes:
+        - All symbols are processed together with axis-0 array operations (see
+          indicators_numpy.compute_panel_arrays); there is no Python loop over symbols.
+
+    Example:
+        panel, errors = load_universe("data/", as_panel=True)
+        data = add_panel_indicators(panel["Close_1h"].unstack("symbol"))
+        data = add_target(data)
+    """
+    arrays = compute_panel_arrays(closes.to_numpy())
+    fields = {close_column: closes.to_numpy()}
+    fields.update((column, arrays[column]) for column in INDICATOR_COLUMNS)
+
+    if output == "panel":
+        columns = pd.MultiIndex.from_product([list(fields), closes.columns], names=["field", "symbol"])
+        return pd.DataFrame(np.concatenate(list(fields.values()), axis=1), index=closes.index, columns=columns)
+    if output != "long":
+        raise ValueError(f"Unknown panel output: {output}")
+
+    # Symbol-major flattening: the transposed (symbol x time) layout matches the (symbol, time) index
+    index = pd.MultiIndex.from_product([closes.columns, closes.index],
+                                       names=["symbol", closes.index.name or "time"])
+    data = pd.DataFrame({name: values.T.ravel() for name, values in fields.items()}, index=index)
+    keep = ~np.isnan(data.to_numpy()).any(axis=1)
+    return data[keep]
+
+
+def _as_float_array(values):
+    values = np.asarray(values)
+    return values if values.dtype in (np.float32, np.float64) else values.astype(np.float64)
+
+
+def donchian_channels(high, low, window: int = 20) -> dict:
+    """
+    Compute Donchian channels: the highest high and lowest low over a window, and their midpoint.
+
+    Parameters:
+        high, low (array-like): High and low prices in time order (1-D or time x symbol).
+        window (int, optional): Lookback in bars. Default is 20.
+
+    Returns:
+        dict: 'upper', 'lower' and 'middle' arrays (NaN during the warmup).
+    """
+    upper = rolling_max(_as_float_array(high), window)
+    lower = rolling_min(_as_float_array(low), window)
+    return {"upper": upper, "lower": lower, "middle": (upper + lower) / 2}
+
+
+def stochastic_oscillator(high, low, close, window: int = 14, smooth: int = 3) -> tuple:
+    """
+    Compute the stochastic oscillator.
+
+    Parameters:
+        high, low, close (array-like): Bar prices in time order (1-D or time x symbol).
+        window (int, optional): Lookback of the high-low range. Default is 14.
+        smooth (int, optional): SMA length of %D. Default is 3.
+
+    Returns:
+        tuple: (%K, %D) arrays, where %K = 100 * (close - lowest low) / (highest high - lowest low).
+            A flat range (highest high == lowest low) gives NaN.
+    """
+    close = _as_float_array(close)
+    highest = rolling_max(_as_float_array(high), window)
+    lowest = rolling_min(_as_float_array(low), window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = 100 * (close - lowest) / (highest - lowest)
+    k[~np.isfinite(k)] = np.nan
+    return k, rolling_mean(k, smooth)
+
+
+def williams_r(high, low, close, window: int = 14) -> np.ndarray:
+    """
+    Compute Williams %R: -100 * (highest high - close) / (highest high - lowest low).
+
+    Parameters:
+        high, low, close (array-like): Bar prices in time order (1-D or time x symbol).
+        window (int, optional): Lookback. Default is 14.
+
+    Returns:
+        np.ndarray: Values in [-100, 0] (NaN during the warmup and for flat ranges).
+    """
+    close = _as_float_array(close)
+    highest = rolling_max(_as_float_array(high), window)
+    lowest = rolling_min(_as_float_array(low), window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = -100 * (highest - close) / (highest - lowest)
+    result[~np.isfinite(result)] = np.nan
+    return result
+
+
+def average_true_range(high, low, close, period: int = 14) -> np.ndarray:
+    """
+    Compute the Average True Range with Wilder's smoothing.
+
+    Parameters:
+        high, low, close (array-like): Bar prices in time order (1-D or time x symbol).
+        period (int, optional): Smoothing period. Default is 14.
+
+    Returns:
+        np.ndarray: ATR; the first `period - 1` rows are NaN (warmup).
+
+    Notes:
+        - Wilder's smoothing is an EMA with alpha = 1 / period, i.e. `ewm(span=2 * period - 1, adjust=False)`,
+          seeded with the first true range.
+    """
+    high, low, close = (_as_float_array(values) for values in (high, low, close))
+    atr = ema(true_range(high, low, close), 2 * period - 1)
+    atr[:period - 1] = np.nan
+    return atr
+
+
+def add_range_indicators(data: pd.DataFrame, window: int = 14, donchian_window: int = 20) -> pd.DataFrame:
+    """
+    Add range-based indicators built on rolling highs and lows, plus the ATR.
+
+    Indicators Added:
+        - donchian_upper, donchian_lower, donchian_middle: Donchian channels (donchian_window).
+        - stoch_k, stoch_d: Stochastic oscillator (window, %D over 3 bars).
+        - williams_r: Williams %R (window).
+        - atr: Average True Range (window, Wilder's smoothing).
+
+    Parameters:
+        data (pd.DataFrame): Input DataFrame with 'High_1h', 'Low_1h' and 'Close_1h' columns.
+        window (int, optional): Lookback of the stochastic, Williams %R and ATR. Default is 14.
+        donchian_window (int, optional): Lookback of the Donchian channels. Default is 20.
+
+    Returns:
+        pd.DataFrame: The input DataFrame with the added columns.
+
+    Notes:
+        - Like `add_technical_indicators`, modifies the DataFrame in place and drops rows with NaNs.
+        - Rolling highs and lows use O(n) van Herk/Gil-Werman kernels, whatever the window length.
+
+    Example:
+        data = add_range_indicators(merged_data)
+        data = add_technical_indicators(data)
+    """
+    high = data["High_1h"].to_numpy()
+    low = data["Low_1h"].to_numpy()
+    close = data["Close_1h"].to_numpy()
+    channels = donchian_channels(high, low, donchian_window)
+    data["donchian_upper"] = channels["upper"]
+    data["donchian_lower"] = channels["lower"]
+    data["donchian_middle"] = channels["middle"]
+    data["stoch_k"], data["stoch_d"] = stochastic_oscillator(high, low, close, window)
+    data["williams_r"] = williams_r(high, low, close, window)
+    data["atr"] = average_true_range(high, low, close, window)
+    data.dropna(inplace=True)
+    return data
+
+
+def _ratio(numerator, denominator):
+    # Elementwise ratio with NaN where the denominator is zero
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = numerator / denominator
+    result[denominator == 0] = np.nan
+    return result
+
+
+def segmented_cumsum(values, starts):
+    """
+    Cumulative sum of `values` that restarts at every row in `starts`.
+
+    Parameters:
+        values (np.ndarray): Values in time order.
+        starts (np.ndarray): First row of every segment, ascending, beginning with 0 (e.g. from
+            `resampling.group_starts`).
+
+    Returns:
+        np.ndarray: Running totals within each segment.
+
+    Notes:
+        - One cumulative sum over the whole array, minus the total reached before each segment
+          (spread with `np.repeat`): O(n) with no per-segment Python work.
+    """
+    values = np.asarray(values)
+    if len(values) == 0:
+        return values.astype(np.float64)
+    totals = np.cumsum(values)
+    before = np.concatenate(([0], totals[starts[1:] - 1]))
+    lengths = np.diff(np.concatenate((starts, [len(values)])))
+    return totals - np.repeat(before, lengths)
+
+
+def rolling_vwap(high, low, close, volume, window: int = 24) -> np.ndarray:
+    """
+    Compute the rolling VWAP: sum(typical price * volume) / sum(volume) over the last `window` bars.
+
+    Parameters:
+        high, low, close (array-like): Bar prices in time order; the typical price is (H + L + C) / 3.
+        volume (array-like): Base volume per bar.
+        window (int, optional): Window length in bars. Default is 24 (one day of hourly bars).
+
+    Returns:
+        np.ndarray: VWAP; NaN during the warmup and for windows without volume.
+    """
+    high, low, close, volume = (_as_float_array(values) for values in (high, low, close, volume))
+    typical = (high + low + close) / 3
+    # The 1/window factors of the two rolling means cancel
+    return _ratio(rolling_mean(typical * volume, window), rolling_mean(volume, window))
+
+
+def session_vwap(high, low, close, volume, unix, session="1d") -> np.ndarray:
+    """
+    Compute the VWAP accumulated since the start of each session.
+
+    Parameters:
+        high, low, close (array-like): Bar prices in ascending time order.
+        volume (array-like): Base volume per bar.
+        unix (array-like): Bar open times in milliseconds.
+        session (str or int, optional): Session length as a `resampling` timeframe ("1d", "4h", "1w", ...)
+            or in milliseconds. Default is "1d" (resets at 00:00 UTC).
+
+    Returns:
+        np.ndarray: VWAP of each bar's session so far; NaN while a session has no volume yet.
+
+    Example:
+        daily_vwap = session_vwap(df["High"], df["Low"], df["Close"], df["Volume BTC"], df["Unix"])
+    """
+    high, low, close, volume = (_as_float_array(values) for values in (high, low, close, volume))
+    period_ms, origin_ms = timeframe_ms(session)
+    starts = group_starts(bucket_starts(unix, period_ms, origin_ms))
+    typical = (high + low + close) / 3
+    return _ratio(segmented_cumsum(typical * volume, starts), segmented_cumsum(volume, starts))
+
+
+def on_balance_volume(close, volume) -> np.ndarray:
+    """
+    Compute On-Balance Volume: the running sum of volume signed by the direction of the close.
+
+    Parameters:
+        close (array-like): Close prices in time order.
+        volume (array-like): Base volume per bar.
+
+    Returns:
+        np.ndarray: OBV, starting at 0 on the first bar. Bars with an unchanged (or missing) close add 0.
+    """
+    close, volume = _as_float_array(close), _as_float_array(volume)
+    direction = np.sign(np.diff(close, prepend=close[:1]))
+    return np.cumsum(np.nan_to_num(direction * volume))
+
+
+def money_flow_index(high, low, close, volume, period: int = 14) -> np.ndarray:
+    """
+    Compute the money-flow index: a volume-weighted RSI of the typical price.
+
+    Parameters:
+        high, low, close (array-like): Bar prices in time order.
+        volume (array-like): Base volume per bar.
+        period (int, optional): Lookback in bars. Default is 14.
+
+    Returns:
+        np.ndarray: MFI = 100 * positive flow / (positive + negative flow) over the last `period` price
+            changes; the first `period` rows are NaN, as are windows without any money flow.
+
+    Notes:
+        - Money flow is typical price * volume; it counts as positive when the typical price rose from
+          the previous bar and negative when it fell.
+    """
+    high, low, close, volume = (_as_float_array(values) for values in (high, low, close, volume))
+    typical = (high + low + close) / 3
+    flow = typical * volume
+    change = np.diff(typical, prepend=np.nan)
+    positive = np.where(change > 0, flow, 0.0)
+    negative = np.where(change < 0, flow, 0.0)
+    positive[np.isnan(change)] = np.nan
+    negative[np.isnan(change)] = np.nan
+    positive = rolling_mean(positive, period)
+    negative = rolling_mean(negative, period)
+    return 100 * _ratio(positive, positive + negative)
+
+
+def average_trade_size(volume, tradecount, window=None) -> np.ndarray:
+    """
+    Compute the average base volume per trade.
+
+    Parameters:
+        volume (array-like): Base volume per bar.
+        tradecount (array-like): Number of trades per bar.
+        window (int, optional): If given, total volume / total trades over the last `window` bars;
+            otherwise per bar. Default is None.
+
+    Returns:
+        np.ndarray: Average trade size; NaN for bars (or windows) without trades.
+    """
+    volume, tradecount = _as_float_array(volume), _as_float_array(tradecount)
+    if window is None:
+        return _ratio(volume, tradecount)
+    return _ratio(rolling_mean(volume, window), rolling_mean(tradecount, window))
+
+
+def _session_unix(data):
+    # Bar open times in ms: the Unix column when present, else a DatetimeIndex
+    for column in ("Unix_1h", "Unix"):
+        if column in data.columns:
+            return data[column].to_numpy(dtype=np.int64)
+    if isinstance(data.index, pd.DatetimeIndex):
+        return data.index.as_unit("ms").asi8
+    raise ValueError("Session VWAP needs a 'Unix_1h'/'Unix' column or a DatetimeIndex.")
+
+
+def add_volume_indicators(data: pd.DataFrame, vwap_window: int = 24, mfi_period: int = 14,
+                          session="1d") -> pd.DataFrame:
+    """
+    Add volume-aware indicators computed with cumulative-sum kernels.
+
+    Indicators Added:
+        - vwap: Rolling VWAP over `vwap_window` bars.
+        - session_vwap: VWAP since the start of the session (UTC day by default).
+        - obv: On-Balance Volume.
+        - mfi: Money-flow index (`mfi_period`).
+        - avg_trade_size: Base volume per trade of each bar.
+
+    Parameters:
+        data (pd.DataFrame): Input DataFrame in ascending time order with 'High_1h', 'Low_1h', 'Close_1h',
+            'Volume BTC_1h' and 'tradecount_1h' columns, and a 'Unix_1h'/'Unix' column or a DatetimeIndex
+            for the sessions.
+        vwap_window (int, optional): Rolling VWAP window in bars. Default is 24.
+        mfi_period (int, optional): MFI lookback. Default is 14.
+        session (str or int, optional): Session length for `session_vwap`. Default is "1d".
+
+    Returns:
+        pd.DataFrame: The input DataFrame with the added columns.
+
+    Notes:
+        - Like `add_technical_indicators`, modifies the DataFrame in place and drops rows with NaNs.
+        - Every indicator is O(n): rolling sums come from prefix sums, and the session reset is a
+          segmented cumulative sum rather than a groupby-apply.
+
+    Example:
+        data = add_volume_indicators(merged_data)
+    """
+    high = data["High_1h"].to_numpy()
+    low = data["Low_1h"].to_numpy()
+    close = data["Close_1h"].to_numpy()
+    volume = data["Volume BTC_1h"].to_numpy()
+    data["vwap"] = rolling_vwap(high, low, close, volume, vwap_window)
+    data["session_vwap"] = session_vwap(high, low, close, volume, _session_unix(data), session)
+    data["obv"] = on_balance_volume(close, volume)
+    data["mfi"] = money_flow_index(high, low, close, volume, mfi_period)
+    data["avg_trade_size"] = average_trade_size(volume, data["tradecount_1h"].to_numpy())
+    data.dropna(inplace=True)
+    return data
@@ -0,0 +1,370 @@
+"""
+indicators_numpy.py
+
+This module is the raw-NumPy backend of `indicators.add_technical_indicators`. It computes the
+standard indicator set directly on contiguous float64/float32 arrays, without pandas Series.
+
+Key Features:
+    - Writes into preallocated output buffers and works in place (`out=` ufunc arguments), so each
+      indicator costs one output array instead of a chain of intermediate Series.
+    - Rolling means come from one prefix-sum pass shared by every window over the same input.
+    - EMAs run as a single C-level linear filter (`scipy.signal.lfilter`) per span.
+    - Same results as the pandas backend (up to float rounding), including NaN warmups and the exact
+      zero gain/loss means of flat stretches.
+    - Keeps float32 input in float32 (prefix sums are still accumulated in float64).
+    - Every helper works along axis 0, so a (time x symbol) close matrix is processed for all symbols
+      at once (panel mode), including each symbol's leading NaNs before it was listed. Buffers are
+      column-major, so each symbol's series is contiguous for the prefix sums and filters.
+
+Functions:
+    - allocate_outputs: Preallocates the output buffers for a given length and dtype.
+    - rolling_mean: Rolling mean of one window into a buffer.
+    - ema: Exponential moving average (adjust=False) into a buffer.
+    - rsi: Relative Strength Index into a buffer.
+    - rolling_max / rolling_min: O(n) rolling extrema for any window (van Herk/Gil-Werman).
+    - true_range: True range of high/low/close bars.
+    - compute_indicator_arrays: Computes the full indicator set (SMA 20/50, RSI 14, MACD, signal line).
+    - compute_panel_arrays: Computes the same set for every column of a (time x symbol) matrix.
+
+Use Case:
+    - add_technical_indicators(data, backend="numpy"), or reuse buffers across repeated runs with
+      compute_indicator_arrays(close, out=allocate_outputs(len(close), close.dtype)).
+"""
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+INDICATOR_COLUMNS = ("sma_20", "sma_50", "rsi", "macd", "signal_line")
+
+
+def allocate_outputs(rows, dtype=np.float64):
+    """
+    Preallocate the output buffers of `compute_indicator_arrays`.
+
+    Parameters:
+        rows (int or tuple): Number of bars, or the (time, symbol) shape of a panel.
+        dtype (np.dtype, optional): float64 or float32. Default is float64.
+
+    Returns:
+        dict: One empty array per indicator column.
+    """
+    return {column: np.empty(rows, dtype=dtype, order="F") for column in INDICATOR_COLUMNS}
+
+
+def _buffer(out, shape, dtype):
+    if out is None:
+        return np.empty(shape, dtype=dtype, order="F")
+    if out.shape != shape:
+        raise ValueError(f"Output buffer has shape {out.shape}, expected {shape}.")
+    return out
+
+
+def _with_zero_row(counts):
+    """Prepend a row of zeros along axis 0 (prefix-count layout)."""
+    return np.concatenate((np.zeros((1,) + counts.shape[1:], dtype=counts.dtype), counts))
+
+
+def _prefix_sum(values, origin=0.0):
+    """Prefix sums along axis 0 (float64, leading 0) of values - origin, with NaNs counted separately."""
+    missing = np.isnan(values)
+    prefix = np.empty((len(values) + 1,) + values.shape[1:], dtype=np.float64, order="F")
+    prefix[0] = 0.0
+    np.subtract(values, origin, out=prefix[1:], dtype=np.float64)
+    if missing.any():
+        prefix[1:][missing] = 0.0
+        missing_prefix = _with_zero_row(np.cumsum(missing, axis=0))
+    else:
+        missing_prefix = None
+    np.cumsum(prefix[1:], axis=0, out=prefix[1:])
+    return prefix, missing_prefix
+
+
+def rolling_mean(values, window, out=None, prefix=None, origin=0.0):
+    """
+    Compute the rolling mean of one window (along axis 0) into a buffer.
+
+    Parameters:
+        values (np.ndarray): Input values, 1-D or (time x symbol).
+        window (int): Window length.
+        out (np.ndarray, optional): Output buffer of the same length. Allocated if None.
+        prefix (tuple, optional): Precomputed `_prefix_sum(values, origin)`, shared between windows.
+        origin (float or np.ndarray, optional): Offset subtracted before summing (e.g. the first price,
+            one per column) to keep prefix sums small. Default is 0.0.
+
+    Returns:
+        np.ndarray: `out`, equal to `pd.Series(values).rolling(window).mean()`.
+    """
+    rows = len(values)
+    out = _buffer(out, values.shape, values.dtype)
+    if prefix is None:
+        prefix = _prefix_sum(values, origin)
+    sums, missing_prefix = prefix
+    out[:window - 1] = np.nan
+    if window > rows:
+        return out
+    tail = out[window - 1:]
+    np.subtract(sums[window:], sums[:-window], out=tail, casting="same_kind")
+    tail *= 1.0 / window
+    if np.any(origin):
+        tail += origin
+    if missing_prefix is not None:
+        tail[missing_prefix[window:] - missing_prefix[:-window] > 0] = np.nan
+    return out
+
+
+def ema(values, span, out=None):
+    """
+    Compute an exponential moving average (pandas `ewm(span, adjust=False)`) along axis 0 into a buffer.
+
+    Parameters:
+        values (np.ndarray): Input values, 1-D or (time x symbol).
+        span (int): EMA span.
+        out (np.ndarray, optional): Output buffer of the same length. Allocated if None.
+
+    Returns:
+        np.ndarray: The EMA (`out` if given).
+
+    Notes:
+        - Input containing NaN falls back to pandas' `ewm`, which skips missing values.
+    """
+    if len(values) == 0:
+        return _buffer(out, values.shape, values.dtype)
+    if np.isnan(values).any():
+        result = pd.DataFrame(values.reshape(len(values), -1)).ewm(span=span, adjust=False).mean()
+        result = result.to_numpy(dtype=values.dtype).reshape(values.shape)
+    else:
+        alpha = 2.0 / (span + 1.0)
+        decay = 1.0 - alpha
+        result, _ = lfilter(np.array([alpha], dtype=values.dtype), np.array([1.0, -decay], dtype=values.dtype),
+                            values, axis=0, zi=(decay * values[:1]).astype(values.dtype))
+    if out is None:
+        return result
+    out[:] = result
+    return out
+
+
+def _window_mean_of_part(diff, period, sign, out, work):
+    """Rolling mean of the positive (sign=1) or negative (sign=-1) part of diff[1:], into out[period:]."""
+    np.multiply(diff[1:], sign, out=work[1:])
+    np.maximum(work[1:], 0.0, out=work[1:])
+    rolling_mean(work[1:], period, out=out[1:])
+    # Exact zeros where the window holds no move in this direction, as pandas' rolling sum gives
+    moves = _with_zero_row(np.cumsum(work[1:] > 0, axis=0))
+    tail = out[period:]
+    tail[(moves[period:] - moves[:-period] == 0) & ~np.isnan(tail)] = 0.0
+    out[0] = np.nan
+    return out
+
+
+def rsi(close, period=14, out=None, work=None):
+    """
+    Compute the Relative Strength Index into a buffer.
+
+    Parameters:
+        close (np.ndarray): Close prices, 1-D or (time x symbol).
+        period (int, optional): RSI period. Default is 14.
+        out (np.ndarray, optional): Output buffer. Allocated if None.
+        work (tuple, optional): Three scratch buffers of the same length (diff, gain, loss), reused
+            across calls. Allocated if None.
+
+    Returns:
+        np.ndarray: `out`, equal to the pandas backend's 100 - 100 / (1 + gain / loss).
+    """
+    out = _buffer(out, close.shape, close.dtype)
+    if len(close) == 0:
+        return out
+    diff, gain, loss = work if work is not None else (np.empty(close.shape, dtype=close.dtype, order="F") for _ in range(3))
+    diff[0] = np.nan
+    np.subtract(close[1:], close[:-1], out=diff[1:])
+    # out is scratch space for each part until the final division; gain/loss receive the rolling means
+    _window_mean_of_part(diff, period, 1.0, gain, out)
+    _window_mean_of_part(diff, period, -1.0, loss, out)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(gain, loss, out=out)
+        out += 1.0
+        np.divide(100.0, out, out=out)
+        np.subtract(100.0, out, out=out)
+    return out
+
+
+def _rolling_extreme(values, window, accumulate, fill, out):
+    """van Herk/Gil-Werman rolling extreme along axis 0 (`accumulate` is np.maximum or np.minimum)."""
+    rows = len(values)
+    out = _buffer(out, values.shape, values.dtype)
+    out[:window - 1] = np.nan
+    if window > rows:
+        return out
+    missing = np.isnan(values)
+    has_missing = missing.any()
+    # Split into blocks of `window` rows; running extremes from each block's start (ahead) and end
+    # (behind) cover any window with one comparison: extreme(x[i..i+w-1]) = op(behind[i], ahead[i+w-1])
+    padded_rows = -(-rows // window) * window
+    padded = np.full((padded_rows,) + values.shape[1:], fill, dtype=values.dtype)
+    padded[:rows] = values
+    if has_missing:
+        padded[:rows][missing] = fill
+    blocks = padded.reshape((-1, window) + values.shape[1:])
+    ahead = accumulate.accumulate(blocks, axis=1).reshape(padded.shape)
+    # Accumulate backwards into a reversed view so that `behind` stays contiguous (no reshape copy)
+    behind = np.empty_like(blocks)
+    accumulate.accumulate(blocks[:, ::-1], axis=1, out=behind[:, ::-1])
+    behind = behind.reshape(padded.shape)
+    accumulate(behind[:rows - window + 1], ahead[window - 1:rows], out=out[window - 1:])
+    if has_missing:
+        counts = _with_zero_row(np.cumsum(missing, axis=0))
+        out[window - 1:][counts[window:] - counts[:-window] > 0] = np.nan
+    return out
+
+
+def rolling_max(values, window, out=None):
+    """
+    Compute the rolling maximum of one window (along axis 0) in O(n) for any window length.
+
+    Parameters:
+        values (np.ndarray): Input values, 1-D or (time x symbol).
+        window (int): Window length.
+        out (np.ndarray, optional): Output buffer of the same shape. Allocated if None.
+
+    Returns:
+        np.ndarray: `out`, equal to `pd.Series(values).rolling(window).max()` (NaN for the warmup and
+            for windows containing NaN).
+
+    Notes:
+        - van Herk/Gil-Werman: two block-wise running maxima (forward and backward) and one comparison
+          per row, i.e. about three comparisons per element whatever the window length.
+    """
+    values = np.asarray(values)
+    return _rolling_extreme(values, window, np.maximum, -np.inf, out)
+
+
+def rolling_min(values, window, out=None):
+    """
+    Compute the rolling minimum of one window (along axis 0) in O(n) for any window length.
+
+    Parameters:
+        values (np.ndarray): Input values, 1-D or (time x symbol).
+        window (int): Window length.
+        out (np.ndarray, optional): Output buffer of the same shape. Allocated if None.
+
+    Returns:
+        np.ndarray: `out`, equal to `pd.Series(values).rolling(window).min()`.
+    """
+    values = np.asarray(values)
+    return _rolling_extreme(values, window, np.minimum, np.inf, out)
+
+
+def true_range(high, low, close, out=None):
+    """
+    Compute the true range: max(high - low, |high - previous close|, |low - previous close|).
+
+    Parameters:
+        high, low, close (np.ndarray): Bar prices, 1-D or (time x symbol).
+        out (np.ndarray, optional): Output buffer. Allocated if None.
+
+    Returns:
+        np.ndarray: `out`; the first row is high - low (no previous close).
+    """
+    out = _buffer(out, high.shape, high.dtype)
+    np.subtract(high, low, out=out)
+    if len(high) > 1:
+        previous = close[:-1]
+        np.maximum(out[1:], np.abs(high[1:] - previous), out=out[1:])
+        np.maximum(out[1:], np.abs(low[1:] - previous), out=out[1:])
+    return out
+
+
+def compute_indicator_arrays(close, out=None):
+    """
+    Compute SMA 20/50, RSI 14, MACD (12/26) and the signal line (9) on a NumPy array.
+
+    Parameters:
+        close (array-like): Close prices (float64 or float32; other dtypes are converted to float64).
+        out (dict, optional): Buffers from `allocate_outputs`, reused across calls. Allocated if None.
+
+    Returns:
+        dict: Indicator arrays keyed by column name (NaN during warmup, as in the pandas backend).
+
+    Example:
+        buffers = allocate_outputs(len(close), close.dtype)
+        arrays = compute_indicator_arrays(close, out=buffers)
+    """
+    close = np.asarray(close)
+    if close.dtype not in (np.float32, np.float64):
+        close = close.astype(np.float64)
+    close = np.ascontiguousarray(close)
+    rows = len(close)
+    if out is None:
+        out = allocate_outputs(rows, close.dtype)
+    if rows == 0:
+        return out
+
+    finite = close[~np.isnan(close)]
+    origin = float(finite[0]) if len(finite) else 0.0
+    prefix = _prefix_sum(close, origin)
+    rolling_mean(close, 20, out=out["sma_20"], prefix=prefix, origin=origin)
+    rolling_mean(close, 50, out=out["sma_50"], prefix=prefix, origin=origin)
+    del prefix
+
+    # The MACD and signal buffers double as RSI scratch space before they are filled
+    scratch = np.empty(rows, dtype=close.dtype)
+    rsi(close, 14, out=out["rsi"], work=(scratch, out["macd"], out["signal_line"]))
+
+    ema(close, 12, out=out["macd"])
+    out["macd"] -= ema(close, 26, out=scratch)
+    ema(out["macd"], 9, out=out["signal_line"])
+    return out
+
+
+def compute_panel_arrays(closes):
+    """
+    Compute SMA 20/50, RSI 14, MACD (12/26) and the signal line (9) for every column of a close matrix.
+
+    Parameters:
+        closes (array-like): (time x symbol) close prices in ascending time order. Rows before a
+            symbol's listing are NaN.
+
+    Returns:
+        dict: (time x symbol) indicator arrays keyed by column name. Each column equals what the 1-D
+            path gives on that symbol's history from its listing on; rows before the listing are NaN.
+
+    Notes:
+        - Rolling means and RSI use prefix sums along axis 0, where the NaN counts already keep every
+          window that reaches before a listing at NaN.
+        - EMAs cannot skip leading NaNs inside one linear filter, so each column is backfilled with its
+          first listed price before filtering and re-masked afterwards. A constant prefix equal to the
+          seed value leaves an adjust=False EMA at that value, so the listed part is unaffected.
+        - NaNs after a listing (missing bars) are forward-filled for the EMAs and stay NaN in the
+          outputs; per-symbol computation on a frame without those rows may differ slightly after them.
+    """
+    closes = np.asarray(closes)
+    if closes.dtype not in (np.float32, np.float64):
+        closes = closes.astype(np.float64)
+    closes = np.asfortranarray(closes)
+    if closes.ndim != 2:
+        raise ValueError("closes must be a (time x symbol) matrix.")
+    out = allocate_outputs(closes.shape, closes.dtype)
+    if len(closes) == 0:
+        return out
+
+    valid = ~np.isnan(closes)
+    columns = np.arange(closes.shape[1])
+    # Last valid row at or before each row (0 before the listing), without a loop over symbols
+    last_valid = np.maximum.accumulate(np.where(valid, np.arange(len(closes))[:, None], 0), axis=0)
+    listed = np.maximum.accumulate(valid, axis=0)
+    first = np.argmax(valid, axis=0)
+    origin = np.where(valid.any(axis=0), closes[first, columns], 0.0)
+
+    prefix = _prefix_sum(closes, origin)
+    rolling_mean(closes, 20, out=out["sma_20"], prefix=prefix, origin=origin)
+    rolling_mean(closes, 50, out=out["sma_50"], prefix=prefix, origin=origin)
+    del prefix
+    scratch = np.empty(closes.shape, dtype=closes.dtype, order="F")
+    rsi(closes, 14, out=out["rsi"], work=(scratch, out["macd"], out["signal_line"]))
+
+    filled = np.where(listed, closes[last_valid, columns], origin).astype(closes.dtype)
+    ema(filled, 12, out=out["macd"])
+    out["macd"] -= ema(filled, 26, out=scratch)
+    ema(out["macd"], 9, out=out["signal_line"])
+    out["macd"][~valid] = np.nan
+    out["signal_line"][~valid] = np.nan
+    return out
@@ -0,0 +1,380 @@
+"""
+ingestion.py
+
+This module provides incremental ingestion of exchange CSV exports into a persistent binary store.
+
+Key Features:
+    - Remembers the last ingested Unix timestamp for every symbol/timeframe.
+    - Reads only the rows added since the last ingest: from the end of the file for exports in
+      ascending order, or from the top for newest-first exports (the CryptoDataDownload layout).
+    - Validates the new rows and appends them to fixed-width per-column binary files.
+    - Returns the full history from the store without re-parsing the CSV.
+
+Store Layout:
+    <store_dir>/
+        <SYMBOL>_<timeframe>/
+            state.json      # Columns, dtypes, row count and last ingested Unix value.
+            col_000.bin     # One fixed-width array per column, in ascending Unix order.
+            col_001.bin
+            ...
+
+Functions:
+    - parse_symbol_timeframe: Extracts the symbol and timeframe from an export file name.
+    - store_entry_dir: Returns the store directory for a symbol/timeframe.
+    - read_store_state: Reads the persisted state of a store entry.
+    - column_path: Returns the path of one column file of a store entry.
+    - read_store: Reads the full history held in a store entry.
+    - append_frame: Validates rows and appends the new ones to a store entry.
+    - ingest_csv: Ingests new rows of a CSV export and returns the full history.
+"""
+import io
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from src.data_cache import sorted_range, to_unix_ms
+
+REQUIRED_COLUMNS = ["Unix", "Date", "Symbol", "Open", "High", "Low", "Close", "Volume BTC", "Volume USDT", "tradecount"]
+STRING_WIDTH = 32
+STATE_FILE = "state.json"
+_FILE_NAME_PATTERN = re.compile(r"^[^_]+_(?P<symbol>[^_]+)_(?P<timeframe>[^_.]+)\.csv$", re.IGNORECASE)
+
+
+def parse_symbol_timeframe(file):
+    """
+    Extract the symbol and timeframe from an export file name.
+
+    Parameters:
+        file (str): Path such as "data/Binance_BTCUSDT_1h.csv".
+
+    Returns:
+        tuple: (symbol, timeframe), e.g. ("BTCUSDT", "1h").
+
+    Raises:
+        ValueError: If the file name does not follow the <exchange>_<symbol>_<timeframe>.csv pattern.
+    """
+    match = _FILE_NAME_PATTERN.match(os.path.basename(file))
+    if match is None:
+        raise ValueError(f"Cannot infer symbol/timeframe from file name: {file}")
+    return match.group("symbol"), match.group("timeframe")
+
+
+def store_entry_dir(store_dir, symbol, timeframe):
+    """
+    Return the store directory for a symbol/timeframe.
+
+    Parameters:
+        store_dir (str): Root directory of the store.
+        symbol (str): Trading pair, e.g. "BTCUSDT".
+        timeframe (str): Bar timeframe, e.g. "1h" or "d".
+
+    Returns:
+        str: Path of the entry directory (it may not exist yet).
+    """
+    return os.path.join(store_dir, f"{symbol}_{timeframe}")
+
+
+def read_store_state(entry_dir):
+    """
+    Read the persisted state of a store entry.
+
+    Parameters:
+        entry_dir (str): Store entry directory.
+
+    Returns:
+        dict or None: The state (columns, dtypes, rows, last_unix), or None if the entry does not exist.
+    """
+    state_path = os.path.join(entry_dir, STATE_FILE)
+    if not os.path.exists(state_path):
+        return None
+    with open(state_path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _write_state(entry_dir, state):
+    tmp_path = os.path.join(entry_dir, STATE_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(state, handle)
+    os.replace(tmp_path, os.path.join(entry_dir, STATE_FILE))
+
+
+def column_path(entry_dir, index):
+    """Return the path of the binary file holding column number `index` of a store entry."""
+    return os.path.join(entry_dir, f"col_{index:03d}.bin")
+
+
+def _store_dtype(series):
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return np.dtype(np.int64)
+    if pd.api.types.is_float_dtype(series.dtype):
+        return np.dtype(np.float64)
+    return np.dtype(f"S{STRING_WIDTH}")
+
+
+def read_store(entry_dir, start=None, end=None):
+    """
+    Read the history held in a store entry.
+
+    Parameters:
+        entry_dir (str): Store entry directory.
+        start (optional): Inclusive start of the time window (Unix ms or timestamp-like). Default is None.
+        end (optional): Inclusive end of the time window (Unix ms or timestamp-like). Default is None.
+
+    Returns:
+        pd.DataFrame or None: Rows in ascending Unix order, or None if the entry does not exist.
+
+    Notes:
+        - With `start`/`end`, the window is located by binary search over the memory-mapped Unix
+          column and only the matching rows of each column are read.
+    """
+    state = read_store_state(entry_dir)
+    if state is None:
+        return None
+    rows = slice(0, state["rows"])
+    if (start is not None or end is not None) and state["rows"]:
+        unix_index = state["columns"].index("Unix")
+        unix = np.memmap(column_path(entry_dir, unix_index), dtype=np.dtype(state["dtypes"][unix_index]),
+                         mode="r", shape=(state["rows"],))
+        rows = sorted_range(unix, to_unix_ms(start), to_unix_ms(end))
+        del unix
+    columns = {}
+    for i, (column, dtype) in enumerate(zip(state["columns"], state["dtypes"])):
+        dtype = np.dtype(dtype)
+        values = np.fromfile(column_path(entry_dir, i), dtype=dtype, count=rows.stop - rows.start,
+                             offset=rows.start * dtype.itemsize)
+        if values.dtype.kind == "S":
+            values = values.astype(str).astype(object)
+        columns[column] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+def _store_values(series, dtype):
+    """Convert a column to its store dtype, raising ValueError instead of truncating any value."""
+    if dtype.kind == "S":
+        encoded = series.astype(str).str.encode("utf-8")
+        too_long = encoded.str.len() > dtype.itemsize
+        if too_long.any():
+            raise ValueError(f"Column '{series.name}' has values longer than {dtype.itemsize} UTF-8 bytes, "
+                             f"e.g. {series[too_long].iloc[0]!r}.")
+        return np.ascontiguousarray(encoded.to_numpy(), dtype=dtype)
+    values = series.to_numpy()
+    try:
+        converted = np.ascontiguousarray(values, dtype=dtype)
+    except (TypeError, ValueError):
+        raise ValueError(f"Column '{series.name}' cannot be stored as {dtype}.") from None
+    if not np.can_cast(values.dtype, dtype) and not np.array_equal(converted, values):
+        raise ValueError(f"Column '{series.name}' is stored as {dtype}; new values would change when cast "
+                         f"from {values.dtype}.")
+    return converted
+
+
+def _store_columns(state, df):
+    """Convert every column of validated rows to its store dtype (raises ValueError before any write)."""
+    return [_store_values(df[column], np.dtype(dtype)) for column, dtype in zip(state["columns"], state["dtypes"])]
+
+
+def _append_rows(entry_dir, state, df, columns):
+    """Append converted rows to the column files, then commit the new row count to the state file."""
+    for i, values in enumerate(columns):
+        path = column_path(entry_dir, i)
+        with open(path, "ab") as handle:
+            # Drop bytes left over by an append that crashed before its state was committed
+            handle.truncate(state["rows"] * values.dtype.itemsize)
+            handle.seek(0, os.SEEK_END)
+            values.tofile(handle)
+    state["rows"] += len(df)
+    state["last_unix"] = int(df["Unix"].iloc[-1])
+    _write_state(entry_dir, state)
+
+
+def _validate_rows(df, file, last_unix=None):
+    """Check required columns and values, and return the rows sorted by Unix without duplicates."""
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns in {file}: {missing}")
+    df = df[REQUIRED_COLUMNS]
+    numeric_cols = [col for col in REQUIRED_COLUMNS if col not in ("Date", "Symbol")]
+    if df[numeric_cols].isna().any().any():
+        raise ValueError(f"Missing numeric values in new rows of {file}.")
+    df = df.sort_values("Unix", kind="stable").drop_duplicates(subset="Unix", keep="last")
+    if last_unix is not None:
+        df = df[df["Unix"] > last_unix]
+    return df.reset_index(drop=True)
+
+
+def _line_unix(line, unix_index):
+    """Return the Unix value of a raw CSV line, or None if the line is not a data row."""
+    fields = line.split(b",")
+    if len(fields) <= unix_index:
+        return None
+    try:
+        return int(float(fields[unix_index]))
+    except ValueError:
+        return None
+
+
+def _read_header(handle, skiprows):
+    for _ in range(skiprows):
+        handle.readline()
+    return handle.readline().rstrip(b"\r\n")
+
+
+def _read_new_lines(file, last_unix, skiprows=1, block_size=1 << 16):
+    """
+    Collect the raw lines whose Unix value is greater than `last_unix`.
+
+    Only the part of the file holding new rows is read: lines are scanned from the top for
+    newest-first files, and blocks are read backwards from the end for oldest-first files.
+    """
+    with open(file, "rb") as handle:
+        header = _read_header(handle, skiprows)
+        unix_index = header.decode("utf-8").split(",").index("Unix")
+        data_start = handle.tell()
+        first_line = handle.readline().rstrip(b"\r\n")
+        first_unix = _line_unix(first_line, unix_index)
+        if first_unix is None:
+            return header, []
+
+        # Newest-first export: new rows sit directly below the header
+        handle.seek(0, os.SEEK_END)
+        file_end = handle.tell()
+        handle.seek(max(data_start, file_end - block_size))
+        tail_unix = [_line_unix(line, unix_index) for line in handle.read().split(b"\n")[1:]]
+        last_file_unix = next((unix for unix in reversed(tail_unix) if unix is not None), first_unix)
+        if first_unix > last_file_unix:
+            lines = []
+            handle.seek(data_start)
+            for line in handle:
+                line = line.rstrip(b"\r\n")
+                if not line.strip():
+                    continue
+                unix = _line_unix(line, unix_index)
+                if unix is None or unix <= last_unix:
+                    break
+                lines.append(line)
+            return header, lines
+
+        # Oldest-first export: read blocks backwards from the end
+        lines = []
+        position = file_end
+        remainder = b""
+        while position > data_start:
+            size = min(block_size, position - data_start)
+            position -= size
+            handle.seek(position)
+            parts = (handle.read(size) + remainder).split(b"\n")
+            remainder = parts[0] if position > data_start else b""
+            complete = parts[1:] if position > data_start else parts
+            for line in reversed(complete):
+                line = line.rstrip(b"\r")
+                if not line.strip():
+                    continue
+                unix = _line_unix(line, unix_index)
+                if unix is None or unix <= last_unix:
+                    return header, lines[::-1]
+                lines.append(line)
+        return header, lines[::-1]
+
+
+def append_frame(df, store_dir, symbol, timeframe, source="<frame>"):
+    """
+    Validate rows and append the ones newer than the stored history to a store entry.
+
+    Parameters:
+        df (pd.DataFrame): Rows with the required OHLCV columns, in any order.
+        store_dir (str): Root directory of the persistent store.
+        symbol (str): Trading pair.
+        timeframe (str): Bar timeframe.
+        source (str, optional): Name of the data source, used in error messages.
+
+    Returns:
+        int: Number of rows appended.
+
+    Raises:
+        ValueError: If required columns are missing, rows contain missing values, or a value does not fit
+            the column's store dtype (fixed by the first ingest: a fractional value in an integer column,
+            or text longer than STRING_WIDTH UTF-8 bytes). Nothing is written in that case.
+
+    Notes:
+        - Creates the entry on first use with at least one row, so the store dtypes are always inferred
+          from real values (a header-only frame creates nothing). Rows at or before the stored
+          `last_unix` are skipped.
+    """
+    entry_dir = store_entry_dir(store_dir, symbol, timeframe)
+    state = read_store_state(entry_dir)
+    last_unix = None if state is None else state["last_unix"]
+    df = _validate_rows(df, source, last_unix=last_unix)
+
+    if not len(df):
+        return 0
+
+    created = state is None
+    if created:
+        state = {
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "columns": list(df.columns),
+            "dtypes": [_store_dtype(df[col]).str for col in df.columns],
+            "rows": 0,
+            "last_unix": None,
+        }
+    columns = _store_columns(state, df)
+    if created:
+        os.makedirs(entry_dir, exist_ok=True)
+        for i in range(len(state["columns"])):
+            open(column_path(entry_dir, i), "wb").close()
+        _write_state(entry_dir, state)
+    _append_rows(entry_dir, state, df, columns)
+    return len(df)
+
+
+def ingest_csv(file, store_dir, symbol=None, timeframe=None, skiprows=1, start=None, end=None):
+    """
+    Ingest new rows of a CSV export into the store and return the full history (or a window of it).
+
+    Parameters:
+        file (str): Path to the CSV export.
+        store_dir (str): Root directory of the persistent store.
+        symbol (str, optional): Trading pair. Inferred from the file name if None.
+        timeframe (str, optional): Bar timeframe. Inferred from the file name if None.
+        skiprows (int, optional): Lines above the CSV header. Default is 1 (CryptoDataDownload source line).
+        start (optional): Inclusive start of the returned window (Unix ms or timestamp-like). Default is None.
+        end (optional): Inclusive end of the returned window (Unix ms or timestamp-like). Default is None.
+
+    Returns:
+        pd.DataFrame: Full history (or the requested window) for the symbol/timeframe in ascending Unix order.
+
+    Raises:
+        ValueError: If required columns are missing or new rows contain missing values.
+
+    Notes:
+        - The first ingest parses the whole file; later ingests only parse rows newer than the
+          stored `last_unix`, so a refresh costs O(new rows) instead of O(history).
+        - Rows at or before `last_unix` are never rewritten; corrections to history need a fresh store.
+
+    Example:
+        history = ingest_csv("data/Binance_BTCUSDT_1h.csv", "data/store")
+    """
+    if symbol is None or timeframe is None:
+        inferred_symbol, inferred_timeframe = parse_symbol_timeframe(file)
+        symbol = symbol or inferred_symbol
+        timeframe = timeframe or inferred_timeframe
+
+    entry_dir = store_entry_dir(store_dir, symbol, timeframe)
+    state = read_store_state(entry_dir)
+
+    if state is None:
+        rows = pd.read_csv(file, skiprows=skiprows)
+        if not append_frame(rows, store_dir, symbol, timeframe, source=file):
+            # Header-only export: no entry is created until rows arrive
+            return _validate_rows(rows, file)
+        return read_store(entry_dir, start=start, end=end)
+
+    last_unix = state["last_unix"] if state["last_unix"] is not None else np.iinfo(np.int64).min
+    header, lines = _read_new_lines(file, last_unix, skiprows=skiprows)
+    if lines:
+        new_rows = pd.read_csv(io.BytesIO(b"\n".join([header] + lines)))
+        append_frame(new_rows, store_dir, symbol, timeframe, source=file)
+    return read_store(entry_dir, start=start, end=end)
@@ -7,11 +7,13 @@ executes the following steps to test and demonstrate the functionality of the sy
 Steps:
     1. Load and merge hourly and daily data from CSV files.
     2. Add technical indicators to the dataset.
-    3. Normalize the data using Min-Max scaling or Z-score normalization.
-    4. Add a target column based on defined indicator confluence logic.
+    3. Add a target column based on defined indicator confluence logic.
+    4. Normalize the features using Min-Max scaling or Z-score normalization fitted on the training
+       range only (the raw prices are kept for backtesting).
     5. Prepare features and target variables for machine learning.
-    6. Split the data into training and testing sets.
-    7. Train a Random Forest Classifier on the training data.
+    6. Split the data chronologically into training and testing sets.
+    7. Load the stored Random Forest Classifier trained on the same data, or train one and save it
+       to the model store.
     8. Evaluate the trained model on the test data.
     9. Backtest the trading strategy using model predictions.
     10. Save processed data and visualize results.
@@ -28,9 +30,11 @@ Usage:
 from sklearn.metrics import confusion_matrix
 from src.data_pipeline import load_csv_data, merge_and_clean_data
 from src.indicators import add_technical_indicators
-from src.data_normalize import normalize_data
+from src.data_normalize import Normalizer
 from src.target_creation import add_target
-from src.models import prepare_features_and_target, split_data, train_model, evaluate_model
+from src.models import prepare_features_and_target, train_model, evaluate_model
+from src.hyperparameter_search import data_fingerprint
+from src.model_store import find_model, save_model
 from src.backtesting import simulate_trading
 from src.visualization import plot_feature_importance, plot_trading_performance, plot_confusion_matrix
 
@@ -51,33 +55,48 @@ def main():
     merged_data = add_technical_indicators(merged_data)
     print("Indicators added successfully.")
 
-    # Step 3: Normalize data
-    print("Normalizing data...")
-    merged_data = normalize_data(merged_data, method="minmax")  # Change to "zscore" if needed
-    print("Data normalized successfully.")
-
-    # Step 3.5: Add target
+    # Step 3: Add target (on raw indicator values, before scaling changes their comparisons)
     print("Adding target column...")
     merged_data = add_target(merged_data)
     print("Target column added.")
 
-    # Step 4: Prepare features and target
+    # Step 4: Normalize features, fitted on the training range only
+    print("Normalizing data...")
+    train_rows = int(len(merged_data) * 0.8)
+    feature_columns = merged_data.drop(columns=["target"]).select_dtypes(include=["float64", "int64"]).columns
+    normalizer = Normalizer("minmax", feature_columns)  # Change to "zscore" if needed
+    normalizer.fit(merged_data.iloc[:train_rows])
+    normalized_data = normalizer.transform(merged_data)  # merged_data keeps the raw prices
+    normalizer.save("/Users/lifecloud/Desktop/tradingmodel/trading_model/data/normalizer.json")
+    print("Data normalized successfully.")
+
+    # Step 5: Prepare features and target
     print("Preparing features and target...")
-    X, y = prepare_features_and_target(merged_data, target_column="target")
+    X, y = prepare_features_and_target(normalized_data, target_column="target")
     print("Features and target prepared.")
 
-    # Step 5: Split data
+    # Step 6: Split data chronologically, matching the normalizer's training range
     print("Splitting data...")
-    X_train, X_test, y_train, y_test = split_data(X, y)
+    X_train, X_test = X.iloc[:train_rows], X.iloc[train_rows:]
+    y_train, y_test = y.iloc[:train_rows], y.iloc[train_rows:]
     print(f"Training set: {X_train.shape}, {y_train.shape}")
     print(f"Testing set: {X_test.shape}, {y_test.shape}")
 
-    # Step 6: Train the model
-    print("Training the model...")
-    model = train_model(X_train, y_train)
-    print("Model trained successfully.")
-
-    # Step 7: Evaluate the model
+    # Step 7: Load the stored model for this training data, or train and save one
+    model_dir = "/Users/lifecloud/Desktop/tradingmodel/trading_model/data/models"
+    columns = list(X_train.select_dtypes(include=["number"]).columns)
+    fingerprint = data_fingerprint(X_train[columns].to_numpy(), y_train.to_numpy())
+    artifact = find_model(model_dir, "random_forest", fingerprint, columns=columns)
+    if artifact is not None:
+        model = artifact.model
+        print(f"Loaded stored model version {artifact.version}.")
+    else:
+        print("Training the model...")
+        model = train_model(X_train, y_train)
+        version = save_model(model, model_dir, "random_forest", columns, normalizer, fingerprint)
+        print(f"Model trained successfully and saved as version {version}.")
+
+    # Step 8: Evaluate the model
     print("Evaluating the model...")
     metrics = evaluate_model(model, X_test, y_test)
     print("Model Evaluation:")
@@ -85,8 +104,9 @@ def main():
     print("Classification Report:\n", metrics["classification_report"])
     print("Confusion Matrix:\n", metrics["confusion_matrix"])   
 
-    # Step 8: Backtest the model
+    # Step 9: Backtest the model on raw prices, with predictions from the normalized features
     print("Backtesting the model...")
+    merged_data["predicted"] = model.predict(X.select_dtypes(include=["number"]))
     metrics, backtest_results = simulate_trading(merged_data, model, initial_capital=10000, profit_target=0.02, stop_loss=0.01)
     print("Backtest Metrics:")
     print("Total Profit:", metrics["total_profit"])
@@ -94,12 +114,12 @@ def main():
     print("Sharpe Ratio:", metrics["sharpe_ratio"])
     print("Final Balance:", metrics["final_balance"])
 
-    # Step 9: Save or inspect results
+    # Step 10: Save or inspect results
     output_file = "/Users/lifecloud/Desktop/tradingmodel/trading_model/data/processed_data.csv"
     merged_data.to_csv(output_file)
     print(f"Processed data saved to {output_file}")
 
-    # Step 10: Manual visualization test
+    # Step 11: Manual visualization test
     print("Running visualization tests...")
     if hasattr(model, "feature_importances_"):
         print("Plotting feature importance...")
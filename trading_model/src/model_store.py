@@ -0,0 +1,379 @@
+"""
+model_store.py
+
+This module saves trained models to a local, versioned model registry and loads them back, so a
+pipeline run or a live process does not have to retrain the forest.
+
+Key Features:
+    - Each saved model is an immutable version directory holding the joblib-pickled model
+      (uncompressed, so NumPy arrays can be memory-mapped on load) and a meta.json with the feature
+      column order, the Normalizer state, the training data fingerprint and metrics.
+    - Versions are written to a temporary directory and moved into place; the LATEST pointer is
+      replaced atomically, so readers never see a half-written model.
+    - An LRU cache of loaded models (keyed by store, name and version) makes repeated loads free.
+    - `LiveModel` follows the LATEST pointer and hot-swaps to a newly promoted version between
+      predictions, without restarting the process.
+
+Layout:
+    store_dir/
+        <name>/
+            LATEST              # Version number of the live model.
+            v0001/
+                model.joblib    # joblib.dump of the model.
+                meta.json       # Columns, normalizer, fingerprint, metrics, creation time.
+
+Functions:
+    - save_model: Saves a model as a new version and optionally promotes it.
+    - promote_model: Points LATEST at a version (or rolls back to an older one).
+    - list_versions: Versions saved under a name.
+    - latest_version: Version LATEST points at.
+    - load_model: Loads a version (default LATEST) as a ModelArtifact, through the LRU cache.
+    - find_model: Latest version trained on data with a given fingerprint.
+    - predict: Normalizes, orders the feature columns and predicts with a ModelArtifact.
+
+Classes:
+    - ModelCache: Thread-safe LRU cache of loaded models.
+    - LiveModel: Model handle that hot-swaps to newly promoted versions.
+
+Use Case:
+    - main.py loads the stored forest when the training data is unchanged instead of retraining it.
+    - A trading process calls LiveModel("models", "random_forest").predict(data) on every bar, and
+      picks up a model retrained elsewhere as soon as it is promoted.
+"""
+import datetime
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import joblib
+import sklearn
+from src.data_normalize import Normalizer
+
+logger = logging.getLogger(__name__)
+
+ModelArtifact = namedtuple("ModelArtifact", ["name", "version", "model", "columns", "normalizer", "metadata"])
+
+MODEL_FILE = "model.joblib"
+META_FILE = "meta.json"
+LATEST_FILE = "LATEST"
+
+
+def _version_dir(store_dir, name, version):
+    return os.path.join(store_dir, name, f"v{version:04d}")
+
+
+def list_versions(store_dir, name):
+    """
+    Return the versions saved under a model name.
+
+    Parameters:
+        store_dir (str): Root directory of the model store.
+        name (str): Model name.
+
+    Returns:
+        list: Version numbers in ascending order (empty if none).
+    """
+    directory = os.path.join(store_dir, name)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(int(entry[1:]) for entry in os.listdir(directory)
+                  if entry.startswith("v") and entry[1:].isdigit())
+
+
+def latest_version(store_dir, name):
+    """
+    Return the version the LATEST pointer of a model name points at.
+
+    Parameters:
+        store_dir (str): Root directory of the model store.
+        name (str): Model name.
+
+    Returns:
+        int or None: The live version, or None if no version was promoted.
+    """
+    try:
+        with open(os.path.join(store_dir, name, LATEST_FILE), encoding="utf-8") as handle:
+            return int(handle.read().strip())
+    except FileNotFoundError:
+        return None
+
+
+def promote_model(store_dir, name, version):
+    """
+    Point the LATEST pointer of a model name at a version.
+
+    Parameters:
+        store_dir (str): Root directory of the model store.
+        name (str): Model name.
+        version (int): Saved version to make live (an older one rolls back).
+
+    Raises:
+        FileNotFoundError: If the version does not exist.
+    """
+    if not os.path.isdir(_version_dir(store_dir, name, version)):
+        raise FileNotFoundError(f"Model {name} has no version {version}.")
+    directory = os.path.join(store_dir, name)
+    handle, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    with os.fdopen(handle, "w", encoding="utf-8") as file:
+        file.write(str(version))
+    os.replace(tmp_path, os.path.join(directory, LATEST_FILE))
+
+
+def save_model(model, store_dir, name, columns, normalizer=None, fingerprint=None, metrics=None, promote=True):
+    """
+    Save a trained model as a new version.
+
+    Parameters:
+        model: Trained estimator (e.g. the RandomForestClassifier from `train_model`).
+        store_dir (str): Root directory of the model store (created if missing).
+        name (str): Model name, e.g. "random_forest".
+        columns (list): Feature columns in the order the model was trained on.
+        normalizer (Normalizer, optional): Fitted Normalizer applied to the raw data before prediction.
+        fingerprint (str, optional): Fingerprint of the training data (e.g.
+            `hyperparameter_search.data_fingerprint(X_train, y_train)`), used by `find_model`.
+        metrics (dict, optional): JSON-serializable evaluation results to keep with the model.
+        promote (bool, optional): Point LATEST at the new version. Default is True.
+
+    Returns:
+        int: The new version number.
+
+    Notes:
+        - The model is dumped uncompressed, so its NumPy arrays can be memory-mapped on load.
+        - Versions are numbered by one writer at a time; run concurrent trainings under different names.
+
+    Example:
+        version = save_model(model, "models", "random_forest", X_train.columns, normalizer, metrics={"accuracy": 0.61})
+    """
+    directory = os.path.join(store_dir, name)
+    os.makedirs(directory, exist_ok=True)
+    version = max(list_versions(store_dir, name), default=0) + 1
+
+    tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=directory)
+    try:
+        joblib.dump(model, os.path.join(tmp_dir, MODEL_FILE))
+        meta = {
+            "name": name,
+            "version": version,
+            "columns": [str(column) for column in columns],
+            "normalizer": normalizer.to_dict() if normalizer is not None else None,
+            "fingerprint": fingerprint,
+            "metrics": metrics or {},
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "sklearn_version": sklearn.__version__,
+        }
+        with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as handle:
+            json.dump(meta, handle, default=float)
+        os.replace(tmp_dir, _version_dir(store_dir, name, version))
+    finally:
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    if promote:
+        promote_model(store_dir, name, version)
+    return version
+
+
+class ModelCache:
+    """
+    Thread-safe LRU cache of loaded models.
+
+    Parameters:
+        maxsize (int, optional): Maximum number of cached models; least recently used ones are
+            evicted. Default is 4 (forests are large).
+
+    Notes:
+        - Keys are (store path, name, version, mmap_mode); versions are immutable, so an entry never
+          goes stale.
+    """
+
+    def __init__(self, maxsize=4):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, artifact):
+        with self.lock:
+            self.entries[key] = artifact
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+
+
+# Cache shared by every load_model call of this process
+MODEL_CACHE = ModelCache()
+
+
+def load_model(store_dir, name, version=None, mmap_mode="r", cache=MODEL_CACHE):
+    """
+    Load a saved model.
+
+    Parameters:
+        store_dir (str): Root directory of the model store.
+        name (str): Model name.
+        version (int, optional): Version to load. Default is the one LATEST points at.
+        mmap_mode (str, optional): joblib mmap_mode; "r" memory-maps the pickled NumPy arrays
+            read-only instead of reading them into memory. None reads everything. Default is "r".
+        cache (ModelCache, optional): LRU cache to use. Default is the process-wide MODEL_CACHE;
+            None always loads from disk.
+
+    Returns:
+        ModelArtifact: (name, version, model, columns, normalizer, metadata).
+
+    Raises:
+        FileNotFoundError: If the model or version does not exist.
+
+    Notes:
+        - With mmap_mode="r", arrays stored as plain NumPy attributes stay in the OS page cache, shared
+          by every process that loads the version. scikit-learn trees copy their node arrays into their
+          own buffers when unpickled, so for forests the memory map mainly avoids holding the file
+          contents and the trees in memory at the same time during the load.
+    """
+    if version is None:
+        version = latest_version(store_dir, name)
+        if version is None:
+            raise FileNotFoundError(f"No promoted version of model {name} in {store_dir}.")
+    key = (os.path.abspath(store_dir), name, version, mmap_mode)
+    if cache is not None:
+        artifact = cache.get(key)
+        if artifact is not None:
+            return artifact
+
+    directory = _version_dir(store_dir, name, version)
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Model {name} has no version {version}.")
+    with open(os.path.join(directory, META_FILE), encoding="utf-8") as handle:
+        meta = json.load(handle)
+    model = joblib.load(os.path.join(directory, MODEL_FILE), mmap_mode=mmap_mode)
+    normalizer = Normalizer.from_dict(meta["normalizer"]) if meta["normalizer"] is not None else None
+    artifact = ModelArtifact(name, version, model, meta["columns"], normalizer, meta)
+
+    if cache is not None:
+        cache.put(key, artifact)
+    return artifact
+
+
+def find_model(store_dir, name, fingerprint, columns=None, **load_kwargs):
+    """
+    Load the latest version trained on data with a given fingerprint.
+
+    Parameters:
+        store_dir (str): Root directory of the model store.
+        name (str): Model name.
+        fingerprint (str): Fingerprint of the training data.
+        columns (list, optional): Required feature column order; versions with other columns are skipped.
+        **load_kwargs: Passed to `load_model`.
+
+    Returns:
+        ModelArtifact or None: The matching model, or None if it has to be trained.
+    """
+    for version in reversed(list_versions(store_dir, name)):
+        with open(os.path.join(_version_dir(store_dir, name, version), META_FILE), encoding="utf-8") as handle:
+            meta = json.load(handle)
+        if meta["fingerprint"] == fingerprint and (columns is None or meta["columns"] == [str(c) for c in columns]):
+            return load_model(store_dir, name, version, **load_kwargs)
+    return None
+
+
+def predict(artifact, data):
+    """
+    Predict with a stored model on raw data.
+
+    Parameters:
+        artifact (ModelArtifact): Loaded model.
+        data (pd.DataFrame): Data with (at least) the model's feature columns, not yet normalized.
+
+    Returns:
+        np.ndarray: Predictions, one per row.
+    """
+    if artifact.normalizer is not None:
+        data = artifact.normalizer.transform(data)
+    return artifact.model.predict(data[artifact.columns])
+
+
+class LiveModel:
+    """
+    Model handle that hot-swaps to newly promoted versions.
+
+    Parameters:
+        store_dir (str): Root directory of the model store.
+        name (str): Model name.
+        check_interval (float, optional): Seconds between checks of the LATEST pointer. Default is 5.
+        cache (ModelCache, optional): LRU cache used to load versions. Default is MODEL_CACHE.
+        mmap_mode (str, optional): joblib mmap_mode used to load versions. Default is "r".
+
+    Notes:
+        - The new version is loaded before the reference is swapped, so predictions in flight keep the
+          artifact they started with. If the new version fails to load, `current` logs the error and
+          keeps serving the current model, and the load is retried after the next check_interval.
+
+    Example:
+        live = LiveModel("models", "random_forest", check_interval=60)
+        signal = live.predict(latest_bars)[-1]
+    """
+
+    def __init__(self, store_dir, name, check_interval=5.0, cache=MODEL_CACHE, mmap_mode="r"):
+        self.store_dir = store_dir
+        self.name = name
+        self.check_interval = check_interval
+        self.cache = cache
+        self.mmap_mode = mmap_mode
+        self.lock = threading.Lock()
+        self.artifact = None
+        self.checked = float("-inf")
+        self.refresh()
+
+    @property
+    def version(self):
+        return self.artifact.version
+
+    def refresh(self):
+        """
+        Check the LATEST pointer now and swap to its version if it changed.
+
+        Returns:
+            bool: True if a new version was swapped in.
+        """
+        with self.lock:
+            self.checked = time.monotonic()
+            version = latest_version(self.store_dir, self.name)
+            if version is None or (self.artifact is not None and version == self.artifact.version):
+                if self.artifact is None:
+                    raise FileNotFoundError(f"No promoted version of model {self.name} in {self.store_dir}.")
+                return False
+            self.artifact = load_model(self.store_dir, self.name, version, self.mmap_mode, self.cache)
+            return True
+
+    def current(self):
+        """Return the live ModelArtifact, checking for a new version at most every check_interval seconds."""
+        if time.monotonic() - self.checked >= self.check_interval:
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Could not load the promoted version of model %s; keeping version %s.",
+                                 self.name, self.artifact.version)
+        return self.artifact
+
+    def predict(self, data):
+        """Predict on raw data with the live model (see `predict`)."""
+        return predict(self.current(), data)
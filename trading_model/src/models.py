@@ -5,7 +5,8 @@ This module provides functionality for building, training, and evaluating machin
 specifically using the Random Forest Classifier for trading data.
 
 Key Features:
-    - Prepares features and target variables for modeling.
+    - Prepares features and target variables for modeling, optionally as lagged windows of the last
+      k bars (see `features.build_lag_features`).
     - Splits data into training and testing sets.
     - Trains a Random Forest Classifier on numerical features.
     - Evaluates the model's performance using accuracy, classification reports, and confusion matrices.
@@ -13,23 +14,34 @@ Key Features:
 Use Case:
     - Develop and validate predictive models for trading strategies.
 """
+import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from src.features import build_lag_features
 
-def prepare_features_and_target(data, target_column):
+def prepare_features_and_target(data, target_column, lags=None, lag_columns=None, dtype=np.float32):
     """
     Prepare features (X) and target (y) for modeling.
 
     Parameters:
         data (pd.DataFrame): Dataset containing features and the target column.
         target_column (str): Name of the target column.
+        lags (int, optional): If given, X holds the last `lags` bars of every feature (plus close
+            returns) as one contiguous matrix built by `build_lag_features`. Default is None
+            (current bar only).
+        lag_columns (list, optional): Columns to lag. Defaults to all numeric columns except the target.
+        dtype (np.dtype, optional): Dtype of the lagged matrix. Default is float32.
 
     Returns:
         tuple: A tuple containing:
             - X (pd.DataFrame): Feature set with all columns except the target.
             - y (pd.Series): Target variable column.
 
+    Notes:
+        - With `lags`, the first rows whose window is incomplete or contains NaNs (e.g. the first
+          return) are dropped from both X and y, so they stay aligned.
+
     Example:
         data = pd.DataFrame({
             "feature1": [1, 2, 3],
@@ -37,13 +49,26 @@ def prepare_features_and_target(data, target_column):
             "target": [0, 1, 0]
         })
         X, y = prepare_features_and_target(data, "target")
+        X_lagged, y_lagged = prepare_features_and_target(data, "target", lags=24)
     """
+    if lags is not None:
+        if lag_columns is None:
+            lag_columns = data.drop(columns=[target_column]).select_dtypes(include=["number"]).columns
+        X = build_lag_features(data, lag_columns, lags=lags, dtype=dtype)
+        y = data[target_column].iloc[lags - 1:]
+        valid = ~np.isnan(X.to_numpy()).any(axis=1)
+        start = int(np.argmax(valid)) if valid.any() else len(valid)
+        if valid[start:].all():
+            # Only leading rows are incomplete: slicing keeps X a view of the matrix
+            return X.iloc[start:], y.iloc[start:]
+        return X[valid], y[valid]
+
     features = data.drop(columns=[target_column]).columns
     X = data[features]
     y = data[target_column]
     return X, y
 
-def split_data(X, y, test_size=0.2, random_state=42):
+def split_data(X, y, test_size=0.2, random_state=42, shuffle=True):
     """
     Split data into training and testing sets.
 
@@ -52,6 +77,9 @@ def split_data(X, y, test_size=0.2, random_state=42):
         y (pd.Series): Target variable.
         test_size (float, optional): Proportion of data to use as test set. Default is 0.2.
         random_state (int, optional): Random state for reproducibility. Default is 42.
+        shuffle (bool, optional): Shuffle rows before splitting. Default is True. Use False for time
+            series (the test set is then the last rows), or `validation.walk_forward_validate` for
+            several out-of-sample folds.
 
     Returns:
         tuple: A tuple containing:
@@ -63,9 +91,10 @@ def split_data(X, y, test_size=0.2, random_state=42):
     Example:
         X_train, X_test, y_train, y_test = split_data(X, y)
     """
-    return train_test_split(X, y, test_size=test_size, random_state=random_state)
+    return train_test_split(X, y, test_size=test_size, random_state=random_state if shuffle else None,
+                            shuffle=shuffle)
 
-def train_model(X_train, y_train, random_state=42):
+def train_model(X_train, y_train, random_state=42, **model_params):
     """
     Train a Random Forest Classifier on the training data.
 
@@ -73,6 +102,8 @@ def train_model(X_train, y_train, random_state=42):
         X_train (pd.DataFrame): Training feature set.
         y_train (pd.Series): Training target variable.
         random_state (int, optional): Random state for reproducibility. Default is 42.
+        **model_params: Other RandomForestClassifier parameters (e.g. n_estimators, max_depth,
+            min_samples_leaf, max_features), as tuned by `hyperparameter_search`.
 
     Returns:
         RandomForestClassifier: A trained RandomForestClassifier model.
@@ -84,7 +115,7 @@ def train_model(X_train, y_train, random_state=42):
         model = train_model(X_train, y_train)
     """
     X_train_numeric = X_train.select_dtypes(include=["number"])  # Use numeric columns only
-    model = RandomForestClassifier(random_state=random_state)
+    model = RandomForestClassifier(random_state=random_state, **model_params)
     model.fit(X_train_numeric, y_train)
     return model
 
@@ -0,0 +1,164 @@
+"""
+ohlcv_store.py
+
+This module provides memory-mapped, zero-copy access to the binary OHLCV store written by the
+ingestion step (see ingestion.py).
+
+Key Features:
+    - Opens every fixed-width column file of a store entry with `np.memmap`, so the data lives in the
+      operating system's page cache and is shared by every process that opens the same store.
+    - Locates time ranges with a binary search over the sorted Unix column (O(log n)).
+    - Returns column arrays and DataFrames that are views over the mapped files, without copying,
+      ready for merge_and_clean_data, add_technical_indicators and simulate_trading.
+    - Pickles as a path, so a store handed to a worker process is re-mapped there instead of copied.
+
+Classes:
+    - OHLCVStore: Read-only, memory-mapped view of one symbol/timeframe store entry.
+
+Use Case:
+    - Run many backtests or training jobs in parallel over one shared copy of the price history.
+"""
+import numpy as np
+import pandas as pd
+from src.data_cache import sorted_range, to_unix_ms
+from src.ingestion import read_store_state, store_entry_dir, column_path
+
+
+class OHLCVStore:
+    """
+    Read-only, memory-mapped view of one symbol/timeframe store entry.
+
+    Parameters:
+        entry_dir (str): Store entry directory (see `ingestion.store_entry_dir`).
+
+    Attributes:
+        symbol (str): Trading pair of the entry.
+        timeframe (str): Bar timeframe of the entry.
+        columns (list): Column names, in store order.
+
+    Notes:
+        - Only rows committed when the store is opened are visible; call `refresh` after new ingests.
+        - Numeric columns are mapped directly. Text columns (Date, Symbol) are decoded on request,
+          which copies them.
+
+    Example:
+        store = OHLCVStore.open("data/store", "BTCUSDT", "1h")
+        recent = store.frame(start="2024-11-01", suffix="_1h")
+        recent = add_technical_indicators(recent)
+    """
+
+    def __init__(self, entry_dir):
+        self.entry_dir = entry_dir
+        self.refresh()
+
+    @classmethod
+    def open(cls, store_dir, symbol, timeframe):
+        """
+        Open the store entry of a symbol/timeframe.
+
+        Parameters:
+            store_dir (str): Root directory of the store.
+            symbol (str): Trading pair, e.g. "BTCUSDT".
+            timeframe (str): Bar timeframe, e.g. "1h".
+
+        Returns:
+            OHLCVStore: The opened store.
+        """
+        return cls(store_entry_dir(store_dir, symbol, timeframe))
+
+    def refresh(self):
+        """
+        Re-read the entry state and re-map the column files, picking up rows appended since opening.
+
+        Raises:
+            FileNotFoundError: If the entry does not exist.
+        """
+        state = read_store_state(self.entry_dir)
+        if state is None:
+            raise FileNotFoundError(f"No OHLCV store entry at {self.entry_dir}")
+        self.symbol = state["symbol"]
+        self.timeframe = state["timeframe"]
+        self.columns = list(state["columns"])
+        self._rows = state["rows"]
+        self._maps = {}
+        for i, (column, dtype) in enumerate(zip(state["columns"], state["dtypes"])):
+            if self._rows == 0:
+                self._maps[column] = np.empty(0, dtype=np.dtype(dtype))
+            else:
+                self._maps[column] = np.memmap(column_path(self.entry_dir, i), dtype=np.dtype(dtype),
+                                               mode="r", shape=(self._rows,))
+
+    def __len__(self):
+        return self._rows
+
+    def __getstate__(self):
+        # Ship only the location; the receiving process maps the same files (shared page cache)
+        return {"entry_dir": self.entry_dir}
+
+    def __setstate__(self, state):
+        self.entry_dir = state["entry_dir"]
+        self.refresh()
+
+    @property
+    def unix(self):
+        """np.memmap: The sorted Unix column (milliseconds)."""
+        return self._maps["Unix"]
+
+    def range(self, start=None, end=None):
+        """
+        Locate the rows inside a time window by binary search.
+
+        Parameters:
+            start (optional): Inclusive start (Unix ms or timestamp-like). Unbounded if None.
+            end (optional): Inclusive end (Unix ms or timestamp-like). Unbounded if None.
+
+        Returns:
+            slice: Row positions of the window.
+        """
+        return sorted_range(self.unix, to_unix_ms(start), to_unix_ms(end))
+
+    def arrays(self, start=None, end=None, columns=None):
+        """
+        Return zero-copy column arrays for a time window.
+
+        Parameters:
+            start (optional): Inclusive start (Unix ms or timestamp-like). Default is None.
+            end (optional): Inclusive end (Unix ms or timestamp-like). Default is None.
+            columns (list, optional): Columns to return. Defaults to every numeric column.
+
+        Returns:
+            dict: Mapping of column name to a read-only view over the mapped file
+                (text columns are decoded copies).
+        """
+        rows = self.range(start, end)
+        if columns is None:
+            columns = [col for col in self.columns if self._maps[col].dtype.kind != "S"]
+        result = {}
+        for column in columns:
+            values = self._maps[column][rows]
+            if values.dtype.kind == "S":
+                values = values.astype(str).astype(object)
+            result[column] = values
+        return result
+
+    def frame(self, start=None, end=None, columns=None, suffix="", time_index=False):
+        """
+        Return a DataFrame over a time window whose numeric columns are views of the mapped files.
+
+        Parameters:
+            start (optional): Inclusive start (Unix ms or timestamp-like). Default is None.
+            end (optional): Inclusive end (Unix ms or timestamp-like). Default is None.
+            columns (list, optional): Columns to include. Defaults to every numeric column.
+            suffix (str, optional): Suffix appended to every column name, e.g. "_1h" to match the
+                names produced by merge_and_clean_data. Default is "".
+            time_index (bool, optional): Index the frame by a 'time' DatetimeIndex built from Unix
+                (this allocates the index). Default is False.
+
+        Returns:
+            pd.DataFrame: Rows in ascending time order.
+        """
+        arrays = self.arrays(start, end, columns)
+        df = pd.DataFrame({f"{column}{suffix}": values for column, values in arrays.items()}, copy=False)
+        if time_index:
+            df.index = pd.DatetimeIndex(pd.to_datetime(self.unix[self.range(start, end)], unit="ms"), name="time")
+        return df
@@ -0,0 +1,268 @@
+"""
+resampling.py
+
+This module derives higher-timeframe OHLCV bars (4h, 12h, daily, weekly) from hourly bars.
+
+Key Features:
+    - Buckets bars by their open time and aggregates every bucket in a single vectorized pass
+      (first open, max high, min low, last close, summed volumes and trade counts) using group
+      boundaries and NumPy `reduceat`, with no per-group Python callbacks.
+    - Aligns buckets like the exchange does: 4h/12h/daily bars start at multiples of their length
+      from the Unix epoch, weekly bars start on Monday 00:00 UTC.
+    - Supports streaming updates: when a new hourly bar arrives, only the open higher-timeframe bar
+      is updated. A bar is emitted when the first bar of the next bucket arrives, so the last bar
+      stays open (see `StreamingResampler.open_bar`) until data for the following bucket comes in.
+
+Functions:
+    - timeframe_ms: Returns the length and origin of a supported timeframe.
+    - bucket_starts: Returns the open time of the bucket each bar belongs to.
+    - group_starts: Returns the first row of every run of equal bucket keys.
+    - aggregate_ohlcv: Aggregates OHLCV arrays over groups given by their start rows.
+    - resample_ohlcv: Builds higher-timeframe bars from a DataFrame of lower-timeframe bars.
+
+Classes:
+    - StreamingResampler: Incrementally maintains the open higher-timeframe bar.
+
+Use Case:
+    - Build the daily (or any higher) data from the hourly export instead of a separate CSV.
+"""
+import numpy as np
+import pandas as pd
+from src.alignment import sort_by_unix
+
+MINUTE_MS = 60_000
+HOUR_MS = 3_600_000
+DAY_MS = 24 * HOUR_MS
+WEEK_MS = 7 * DAY_MS
+# 1970-01-01 was a Thursday; weekly buckets start on Monday 1970-01-05
+WEEK_ORIGIN_MS = 4 * DAY_MS
+
+TIMEFRAMES = {
+    "1m": (MINUTE_MS, 0),
+    "5m": (5 * MINUTE_MS, 0),
+    "15m": (15 * MINUTE_MS, 0),
+    "30m": (30 * MINUTE_MS, 0),
+    "1h": (HOUR_MS, 0),
+    "4h": (4 * HOUR_MS, 0),
+    "12h": (12 * HOUR_MS, 0),
+    "d": (DAY_MS, 0),
+    "1d": (DAY_MS, 0),
+    "w": (WEEK_MS, WEEK_ORIGIN_MS),
+    "1w": (WEEK_MS, WEEK_ORIGIN_MS),
+}
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume BTC", "Volume USDT", "tradecount"]
+
+
+def timeframe_ms(timeframe):
+    """
+    Return the length and origin of a supported timeframe.
+
+    Parameters:
+        timeframe (str or int): One of "1m", "5m", "15m", "30m", "1h", "4h", "12h", "d"/"1d", "w"/"1w",
+            or a length in milliseconds.
+
+    Returns:
+        tuple: (period_ms, origin_ms).
+
+    Raises:
+        ValueError: If the timeframe is not supported.
+    """
+    if isinstance(timeframe, (int, np.integer)):
+        return int(timeframe), 0
+    try:
+        return TIMEFRAMES[str(timeframe).lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported timeframe: {timeframe}") from None
+
+
+def bucket_starts(unix, period_ms, origin_ms=0):
+    """
+    Return the open time of the bucket each bar belongs to.
+
+    Parameters:
+        unix (np.ndarray): Bar open times in milliseconds.
+        period_ms (int): Bucket length in milliseconds.
+        origin_ms (int, optional): Offset of bucket boundaries from the epoch. Default is 0.
+
+    Returns:
+        np.ndarray: Bucket open times (int64), same shape as `unix`.
+    """
+    unix = np.asarray(unix, dtype=np.int64)
+    return unix - (unix - origin_ms) % period_ms
+
+
+def group_starts(keys):
+    """
+    Return the first row of every run of equal keys.
+
+    Parameters:
+        keys (np.ndarray): Sorted bucket keys.
+
+    Returns:
+        np.ndarray: Start rows (int64), beginning with 0; empty if `keys` is empty.
+    """
+    keys = np.asarray(keys)
+    if len(keys) == 0:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(([0], np.flatnonzero(keys[1:] != keys[:-1]) + 1)).astype(np.int64)
+
+
+def aggregate_ohlcv(starts, open_, high, low, close, volume_base, volume_quote, tradecount=None):
+    """
+    Aggregate OHLCV arrays over contiguous groups given by their start rows.
+
+    Parameters:
+        starts (np.ndarray): First row of every group, ascending, beginning with 0.
+        open_, high, low, close (np.ndarray): Price arrays in time order.
+        volume_base (np.ndarray): Base-asset volume (e.g. Volume BTC).
+        volume_quote (np.ndarray): Quote-asset volume (e.g. Volume USDT).
+        tradecount (np.ndarray, optional): Trades per row. If None, every row counts as one trade.
+
+    Returns:
+        dict: Arrays keyed by the OHLCV column names (Open, High, Low, Close, Volume BTC, Volume USDT,
+            tradecount), one value per group.
+    """
+    n = len(open_)
+    if len(starts) == 0:
+        empty = np.empty(0)
+        return {"Open": empty, "High": empty, "Low": empty, "Close": empty, "Volume BTC": empty,
+                "Volume USDT": empty, "tradecount": np.empty(0, dtype=np.int64)}
+    last = np.concatenate((starts[1:], [n])) - 1
+    return {
+        "Open": np.asarray(open_)[starts],
+        "High": np.maximum.reduceat(high, starts),
+        "Low": np.minimum.reduceat(low, starts),
+        "Close": np.asarray(close)[last],
+        "Volume BTC": np.add.reduceat(volume_base, starts),
+        "Volume USDT": np.add.reduceat(volume_quote, starts),
+        "tradecount": (np.diff(np.concatenate((starts, [n]))) if tradecount is None
+                       else np.add.reduceat(np.asarray(tradecount, dtype=np.int64), starts)),
+    }
+
+
+def resample_ohlcv(data, timeframe="1d", drop_partial=False, source_interval=HOUR_MS):
+    """
+    Build higher-timeframe bars from a DataFrame of lower-timeframe bars.
+
+    Parameters:
+        data (pd.DataFrame): Bars with the columns validated by load_csv_data (Date and Symbol optional),
+            in any time order.
+        timeframe (str or int, optional): Target timeframe ("4h", "12h", "d"/"1d", "w"/"1w") or a length
+            in milliseconds. Default is "1d".
+        drop_partial (bool, optional): Drop the last bucket if it is not complete yet. Default is False.
+        source_interval (int, optional): Interval of the input bars in milliseconds, used to decide
+            whether the last bucket is complete. Default is one hour.
+
+    Returns:
+        pd.DataFrame: Bars in ascending time order with columns Unix, [Date, Symbol,] Open, High, Low,
+            Close, Volume BTC, Volume USDT, tradecount.
+
+    Example:
+        daily_data = resample_ohlcv(hourly_data, "1d")
+        combined_data = merge_and_clean_data(hourly_data, daily_data)
+    """
+    period_ms, origin_ms = timeframe_ms(timeframe)
+    data = sort_by_unix(data)
+    unix = data["Unix"].to_numpy(dtype=np.int64)
+    keys = bucket_starts(unix, period_ms, origin_ms)
+    starts = group_starts(keys)
+
+    bars = aggregate_ohlcv(
+        starts,
+        data["Open"].to_numpy(), data["High"].to_numpy(), data["Low"].to_numpy(), data["Close"].to_numpy(),
+        data["Volume BTC"].to_numpy(), data["Volume USDT"].to_numpy(), data["tradecount"].to_numpy(),
+    )
+    result = {"Unix": keys[starts]}
+    if "Date" in data.columns:
+        date_format = "%Y-%m-%d" if period_ms % DAY_MS == 0 else "%Y-%m-%d %H:%M:%S"
+        result["Date"] = pd.to_datetime(result["Unix"], unit="ms").strftime(date_format)
+    if "Symbol" in data.columns:
+        result["Symbol"] = data["Symbol"].to_numpy()[starts]
+    result.update(bars)
+    resampled = pd.DataFrame(result, copy=False)
+
+    if drop_partial and len(resampled) and unix[-1] + source_interval < resampled["Unix"].iloc[-1] + period_ms:
+        resampled = resampled.iloc[:-1]
+    return resampled
+
+
+class StreamingResampler:
+    """
+    Incrementally maintain the open higher-timeframe bar as lower-timeframe bars arrive.
+
+    Parameters:
+        timeframe (str or int, optional): Target timeframe, as in `resample_ohlcv`. Default is "1d".
+
+    Attributes:
+        open_bar (dict or None): The higher-timeframe bar currently being built.
+
+    Notes:
+        - Each update costs O(1): it only touches the open bar.
+        - A bucket is returned by the update that starts the next bucket, not by the bar that completes
+          it; read `open_bar` for the bar still being built (e.g. at the end of a session).
+        - Bars must arrive in ascending time order; bars at or before the last update are ignored.
+
+    Example:
+        resampler = StreamingResampler("4h")
+        for bar in live_hourly_bars:
+            completed = resampler.update(bar)
+            if completed is not None:
+                handle_new_4h_bar(completed)
+    """
+
+    def __init__(self, timeframe="1d"):
+        self.period_ms, self.origin_ms = timeframe_ms(timeframe)
+        self.open_bar = None
+        self._last_unix = None
+
+    def update(self, bar):
+        """
+        Add one lower-timeframe bar.
+
+        Parameters:
+            bar (dict or pd.Series): Bar with Unix, Open, High, Low, Close, Volume BTC, Volume USDT
+                and tradecount.
+
+        Returns:
+            dict or None: The previous higher-timeframe bar if this bar starts a new bucket, else None.
+        """
+        unix = int(bar["Unix"])
+        if self._last_unix is not None and unix <= self._last_unix:
+            return None
+        self._last_unix = unix
+        key = unix - (unix - self.origin_ms) % self.period_ms
+
+        completed = None
+        if self.open_bar is not None and self.open_bar["Unix"] != key:
+            completed = self.open_bar
+            self.open_bar = None
+        if self.open_bar is None:
+            self.open_bar = {"Unix": key}
+            self.open_bar.update({column: bar[column] for column in OHLCV_COLUMNS})
+        else:
+            current = self.open_bar
+            current["High"] = max(current["High"], bar["High"])
+            current["Low"] = min(current["Low"], bar["Low"])
+            current["Close"] = bar["Close"]
+            current["Volume BTC"] += bar["Volume BTC"]
+            current["Volume USDT"] += bar["Volume USDT"]
+            current["tradecount"] += bar["tradecount"]
+        return completed
+
+    def update_many(self, data):
+        """
+        Add several lower-timeframe bars.
+
+        Parameters:
+            data (pd.DataFrame): Bars in ascending time order.
+
+        Returns:
+            pd.DataFrame: Higher-timeframe bars completed by these updates (possibly empty).
+        """
+        completed = []
+        for bar in data[["Unix"] + OHLCV_COLUMNS].to_dict("records"):
+            result = self.update(bar)
+            if result is not None:
+                completed.append(result)
+        return pd.DataFrame(completed, columns=["Unix"] + OHLCV_COLUMNS)
@@ -0,0 +1,516 @@
+"""
+streaming_indicators.py
+
+This module provides a stateful indicator engine for live trading loops. Each new close price updates
+the indicators in O(1) instead of recomputing them over the full history.
+
+Key Features:
+    - Simple Moving Averages (20, 50) and the RSI gain/loss means (14) from fixed-size ring buffers
+      holding a running sum.
+    - EMA state (adjust=False) for the MACD fast/slow lines and the signal line.
+    - Same values as `indicators.add_technical_indicators` when fed the same history.
+    - Rolling highest/lowest values from monotonic deques (amortized O(1) for any window), driving
+      streaming Donchian channels, stochastic oscillator, Williams %R and ATR that match
+      `indicators.add_range_indicators`.
+    - State serializes to a JSON-compatible dict, so a live loop can resume after a restart without
+      replaying history.
+
+Classes:
+    - RollingMean: Mean of the last `window` values in O(1) per update.
+    - EMA: Exponential moving average with pandas' `ewm(span, adjust=False)` recursion.
+    - IncrementalIndicators: SMA, RSI, MACD and signal line updated one close at a time.
+    - RollingExtreme: Maximum or minimum of the last `window` values with a monotonic deque.
+    - RangeIndicators: Donchian channels, stochastic, Williams %R and ATR updated one bar at a time.
+
+Use Case:
+    - Warm the engine once on history, then call `update` on every new hourly close.
+"""
+import json
+import math
+from collections import deque
+import numpy as np
+import pandas as pd
+
+
+class RollingMean:
+    """
+    Mean of the last `window` values, updated in O(1).
+
+    Parameters:
+        window (int): Number of values averaged.
+
+    Notes:
+        - The running sum is recomputed from the buffer each time the ring wraps around, which keeps
+          floating-point drift bounded at an amortized O(1) cost.
+        - A NaN value makes the mean NaN until it leaves the window, as in pandas `rolling().mean()`.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.buffer = [0.0] * window
+        self.position = 0
+        self.count = 0
+        self.total = 0.0
+        self.nan_count = 0
+
+    def update(self, value):
+        """
+        Add a value and return the current mean.
+
+        Parameters:
+            value (float): New value.
+
+        Returns:
+            float: Mean of the last `window` values, or NaN until the window is full.
+        """
+        value = float(value)
+        if self.count == self.window:
+            old = self.buffer[self.position]
+            if math.isnan(old):
+                self.nan_count -= 1
+            else:
+                self.total -= old
+        else:
+            self.count += 1
+        self.buffer[self.position] = value
+        if math.isnan(value):
+            self.nan_count += 1
+        else:
+            self.total += value
+        self.position = (self.position + 1) % self.window
+        if self.position == 0:
+            self.total = math.fsum(v for v in self.buffer if not math.isnan(v))
+        return self.value
+
+    @property
+    def value(self):
+        """float: Current mean, or NaN until the window is full or while it holds a NaN."""
+        if self.count < self.window or self.nan_count:
+            return math.nan
+        return self.total / self.window
+
+    def to_dict(self):
+        return {"window": self.window, "buffer": self.buffer, "position": self.position, "count": self.count}
+
+    @classmethod
+    def from_dict(cls, state):
+        rolling = cls(state["window"])
+        rolling.buffer = [float(v) for v in state["buffer"]]
+        rolling.position = state["position"]
+        rolling.count = state["count"]
+        values = rolling.buffer[:rolling.count] if rolling.count < rolling.window else rolling.buffer
+        rolling.nan_count = sum(math.isnan(v) for v in values)
+        rolling.total = math.fsum(v for v in values if not math.isnan(v))
+        return rolling
+
+
+class EMA:
+    """
+    Exponential moving average matching pandas `ewm(span=span, adjust=False).mean()`.
+
+    Parameters:
+        span (int): EMA span; the smoothing factor is 2 / (span + 1).
+
+    Notes:
+        - NaN values follow pandas' default `ignore_na=False`: the average is carried forward, but the
+          weight of the old average keeps decaying, so the next valid value counts as if the NaN
+          positions had been there.
+    """
+
+    def __init__(self, span):
+        self.span = span
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = math.nan
+        # Weight of the current average relative to 1 (decays by 1 - alpha per value, NaN included)
+        self.weight = 1.0
+
+    def update(self, value):
+        """
+        Add a value and return the updated average.
+
+        Parameters:
+            value (float): New value. NaN values carry the average forward (see Notes of the class).
+
+        Returns:
+            float: Current average (the first valid value seeds it).
+        """
+        value = float(value)
+        if math.isnan(self.value):
+            self.value = value
+            return self.value
+        self.weight *= 1.0 - self.alpha
+        if not math.isnan(value):
+            # Same update as pandas' ewma with adjust=False; weight is 1 - alpha without skipped NaNs
+            self.value = (self.weight * self.value + self.alpha * value) / (self.weight + self.alpha)
+            self.weight = 1.0
+        return self.value
+
+    def to_dict(self):
+        return {"span": self.span, "value": self.value, "weight": self.weight}
+
+    @classmethod
+    def from_dict(cls, state):
+        ema = cls(state["span"])
+        ema.value = float(state["value"])
+        ema.weight = float(state.get("weight", 1.0))
+        return ema
+
+
+class RollingExtreme:
+    """
+    Maximum (or minimum) of the last `window` values, updated in amortized O(1).
+
+    Parameters:
+        window (int): Number of values covered.
+        mode (str, optional): "max" or "min". Default is "max".
+
+    Notes:
+        - A monotonic deque keeps only the values that can still become the extreme, so each value is
+          pushed and popped at most once regardless of the window length.
+        - A NaN value makes the result NaN until it leaves the window, as in pandas `rolling().max()`.
+    """
+
+    def __init__(self, window, mode="max"):
+        if mode not in ("max", "min"):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.window = window
+        self.mode = mode
+        self.candidates = deque()
+        self.count = 0
+        self.last_nan = -1
+
+    def update(self, value):
+        """
+        Add a value and return the current extreme.
+
+        Parameters:
+            value (float): New value.
+
+        Returns:
+            float: Extreme of the last `window` values, or NaN until the window is full.
+        """
+        value = float(value)
+        position = self.count
+        self.count += 1
+        if math.isnan(value):
+            self.last_nan = position
+        else:
+            candidates = self.candidates
+            if self.mode == "max":
+                while candidates and candidates[-1][1] <= value:
+                    candidates.pop()
+            else:
+                while candidates and candidates[-1][1] >= value:
+                    candidates.pop()
+            candidates.append((position, value))
+        while self.candidates and self.candidates[0][0] <= position - self.window:
+            self.candidates.popleft()
+        return self.value
+
+    @property
+    def value(self):
+        """float: Current extreme, or NaN until the window is full or while it holds a NaN."""
+        if self.count < self.window or self.last_nan > self.count - 1 - self.window or not self.candidates:
+            return math.nan
+        return self.candidates[0][1]
+
+    def to_dict(self):
+        return {"window": self.window, "mode": self.mode, "candidates": [list(item) for item in self.candidates],
+                "count": self.count, "last_nan": self.last_nan}
+
+    @classmethod
+    def from_dict(cls, state):
+        rolling = cls(state["window"], state["mode"])
+        rolling.candidates = deque((int(position), float(value)) for position, value in state["candidates"])
+        rolling.count = state["count"]
+        rolling.last_nan = state["last_nan"]
+        return rolling
+
+
+class IncrementalIndicators:
+    """
+    SMA, RSI, MACD and signal line updated one close price at a time.
+
+    Parameters:
+        sma_windows (tuple, optional): SMA windows. Default is (20, 50).
+        rsi_period (int, optional): RSI period. Default is 14.
+        macd_spans (tuple, optional): Fast, slow and signal EMA spans. Default is (12, 26, 9).
+
+    Notes:
+        - Values equal `add_technical_indicators` on the same history (up to float rounding); the batch
+          function's dropped warmup rows are the ones where `ready` is False.
+        - Each update costs O(1) regardless of the history length.
+
+    Example:
+        engine = IncrementalIndicators()
+        engine.update_many(history["Close_1h"])
+        state = engine.to_dict()                      # persist, e.g. with save()
+        ...
+        engine = IncrementalIndicators.from_dict(state)
+        latest = engine.update(new_close)             # {"sma_20": ..., "rsi": ..., ...}
+    """
+
+    def __init__(self, sma_windows=(20, 50), rsi_period=14, macd_spans=(12, 26, 9)):
+        self.sma = {window: RollingMean(window) for window in sma_windows}
+        self.gain = RollingMean(rsi_period)
+        self.loss = RollingMean(rsi_period)
+        fast, slow, signal = macd_spans
+        self.ema_fast, self.ema_slow, self.ema_signal = EMA(fast), EMA(slow), EMA(signal)
+        self.last_close = math.nan
+        self.bars = 0
+        self.latest = {}
+
+    def update(self, close):
+        """
+        Add a new close price.
+
+        Parameters:
+            close (float): Latest close price.
+
+        Returns:
+            dict: Current indicator values keyed as in `add_technical_indicators` (NaN during warmup).
+        """
+        close = float(close)
+        values = {f"sma_{window}": rolling.update(close) for window, rolling in self.sma.items()}
+
+        if self.bars:
+            change = close - self.last_close
+            gain = self.gain.update(max(change, 0.0) if not math.isnan(change) else math.nan)
+            loss = self.loss.update(-min(change, 0.0) if not math.isnan(change) else math.nan)
+            values["rsi"] = self._rsi(gain, loss)
+        else:
+            values["rsi"] = math.nan
+
+        macd = self.ema_fast.update(close) - self.ema_slow.update(close)
+        values["macd"] = macd
+        values["signal_line"] = self.ema_signal.update(macd)
+
+        self.last_close = close
+        self.bars += 1
+        self.latest = values
+        return values
+
+    @staticmethod
+    def _rsi(gain, loss):
+        # Same IEEE semantics as the batch path: loss 0 gives RSI 100, gain and loss 0 give NaN
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = np.float64(gain) / np.float64(loss)
+            return float(100 - (100 / (1 + rs)))
+
+    @property
+    def ready(self):
+        """bool: True once every indicator has left its warmup (no NaN in the latest values)."""
+        return self.bars > 0 and not any(math.isnan(value) for value in self.latest.values())
+
+    def update_many(self, closes, index=None):
+        """
+        Add a sequence of close prices.
+
+        Parameters:
+            closes (array-like or pd.Series): Close prices in time order.
+            index (pd.Index, optional): Index of the result. Defaults to the Series index, if any.
+
+        Returns:
+            pd.DataFrame: Indicator values after every close (NaN during warmup).
+        """
+        if index is None and isinstance(closes, pd.Series):
+            index = closes.index
+        rows = [self.update(close) for close in np.asarray(closes, dtype=np.float64)]
+        columns = [f"sma_{window}" for window in self.sma] + ["rsi", "macd", "signal_line"]
+        return pd.DataFrame(rows, index=index, columns=columns)
+
+    def to_dict(self):
+        """
+        Return the engine state as a JSON-compatible dict.
+
+        Returns:
+            dict: Ring buffers, EMA values, last close and bar count.
+        """
+        return {
+            "sma": [rolling.to_dict() for rolling in self.sma.values()],
+            "gain": self.gain.to_dict(),
+            "loss": self.loss.to_dict(),
+            "ema": [ema.to_dict() for ema in (self.ema_fast, self.ema_slow, self.ema_signal)],
+            "last_close": self.last_close,
+            "bars": self.bars,
+            "latest": self.latest,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Rebuild an engine from `to_dict` output.
+
+        Parameters:
+            state (dict): Saved engine state.
+
+        Returns:
+            IncrementalIndicators: Engine that continues exactly where the saved one stopped.
+        """
+        engine = cls()
+        engine.sma = {item["window"]: RollingMean.from_dict(item) for item in state["sma"]}
+        engine.gain = RollingMean.from_dict(state["gain"])
+        engine.loss = RollingMean.from_dict(state["loss"])
+        engine.ema_fast, engine.ema_slow, engine.ema_signal = (EMA.from_dict(item) for item in state["ema"])
+        engine.last_close = float(state["last_close"])
+        engine.bars = state["bars"]
+        engine.latest = {key: float(value) for key, value in state["latest"].items()}
+        return engine
+
+    def save(self, path):
+        """
+        Write the engine state to a JSON file.
+
+        Parameters:
+            path (str): Destination file.
+        """
+        with open(path, "w") as handle:
+            json.dump(self.to_dict(), handle)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read an engine state written by `save`.
+
+        Parameters:
+            path (str): State file.
+
+        Returns:
+            IncrementalIndicators: Restored engine.
+        """
+        with open(path) as handle:
+            return cls.from_dict(json.load(handle))
+
+
+class RangeIndicators:
+    """
+    Donchian channels, stochastic oscillator, Williams %R and ATR updated one bar at a time.
+
+    Parameters:
+        window (int, optional): Lookback of the stochastic, Williams %R and ATR. Default is 14.
+        donchian_window (int, optional): Lookback of the Donchian channels. Default is 20.
+        smooth (int, optional): SMA length of %D. Default is 3.
+
+    Notes:
+        - Values equal `add_range_indicators` on the same history (up to float rounding).
+        - Each update costs amortized O(1) regardless of the window lengths.
+
+    Example:
+        ranges = RangeIndicators()
+        ranges.update_many(history["High_1h"], history["Low_1h"], history["Close_1h"])
+        latest = ranges.update(bar["High"], bar["Low"], bar["Close"])     # {"atr": ..., "stoch_k": ...}
+    """
+
+    COLUMNS = ["donchian_upper", "donchian_lower", "donchian_middle", "stoch_k", "stoch_d", "williams_r", "atr"]
+
+    def __init__(self, window=14, donchian_window=20, smooth=3):
+        self.window = window
+        self.highest = RollingExtreme(window, "max")
+        self.lowest = RollingExtreme(window, "min")
+        self.donchian_upper = RollingExtreme(donchian_window, "max")
+        self.donchian_lower = RollingExtreme(donchian_window, "min")
+        self.stoch_d = RollingMean(smooth)
+        # Wilder's smoothing: alpha = 1 / window
+        self.atr = EMA(2 * window - 1)
+        self.last_close = math.nan
+        self.bars = 0
+        self.latest = {}
+
+    def update(self, high, low, close):
+        """
+        Add a new bar.
+
+        Parameters:
+            high, low, close (float): Latest bar prices.
+
+        Returns:
+            dict: Current values keyed as in `add_range_indicators` (NaN during warmup).
+        """
+        high, low, close = float(high), float(low), float(close)
+        upper = self.donchian_upper.update(high)
+        lower = self.donchian_lower.update(low)
+        highest = self.highest.update(high)
+        lowest = self.lowest.update(low)
+        span = highest - lowest
+        stoch_k = 100 * (close - lowest) / span if span > 0 else math.nan
+        williams = -100 * (highest - close) / span if span > 0 else math.nan
+
+        true_range = high - low
+        if self.bars:
+            true_range = max(true_range, abs(high - self.last_close), abs(low - self.last_close))
+        atr = self.atr.update(true_range)
+
+        self.last_close = close
+        self.bars += 1
+        self.latest = {
+            "donchian_upper": upper,
+            "donchian_lower": lower,
+            "donchian_middle": (upper + lower) / 2,
+            "stoch_k": stoch_k,
+            "stoch_d": self.stoch_d.update(stoch_k),
+            "williams_r": williams,
+            "atr": atr if self.bars >= self.window else math.nan,
+        }
+        return self.latest
+
+    @property
+    def ready(self):
+        """bool: True once every indicator has left its warmup (no NaN in the latest values)."""
+        return self.bars > 0 and not any(math.isnan(value) for value in self.latest.values())
+
+    def update_many(self, high, low, close, index=None):
+        """
+        Add a sequence of bars.
+
+        Parameters:
+            high, low, close (array-like or pd.Series): Bar prices in time order.
+            index (pd.Index, optional): Index of the result. Defaults to the close Series index, if any.
+
+        Returns:
+            pd.DataFrame: Indicator values after every bar (NaN during warmup).
+        """
+        if index is None and isinstance(close, pd.Series):
+            index = close.index
+        rows = [self.update(*bar) for bar in zip(np.asarray(high, dtype=np.float64),
+                                                 np.asarray(low, dtype=np.float64),
+                                                 np.asarray(close, dtype=np.float64))]
+        return pd.DataFrame(rows, index=index, columns=self.COLUMNS)
+
+    def to_dict(self):
+        """
+        Return the state as a JSON-compatible dict.
+
+        Returns:
+            dict: Deques, %D ring buffer, ATR value, last close and bar count.
+        """
+        return {
+            "window": self.window,
+            "extremes": [rolling.to_dict() for rolling in
+                         (self.highest, self.lowest, self.donchian_upper, self.donchian_lower)],
+            "stoch_d": self.stoch_d.to_dict(),
+            "atr": self.atr.to_dict(),
+            "last_close": self.last_close,
+            "bars": self.bars,
+            "latest": self.latest,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Rebuild the indicators from `to_dict` output.
+
+        Parameters:
+            state (dict): Saved state.
+
+        Returns:
+            RangeIndicators: Indicators that continue exactly where the saved ones stopped.
+        """
+        ranges = cls(state["window"])
+        (ranges.highest, ranges.lowest, ranges.donchian_upper,
+         ranges.donchian_lower) = (RollingExtreme.from_dict(item) for item in state["extremes"])
+        ranges.stoch_d = RollingMean.from_dict(state["stoch_d"])
+        ranges.atr = EMA.from_dict(state["atr"])
+        ranges.last_close = float(state["last_close"])
+        ranges.bars = state["bars"]
+        ranges.latest = {key: float(value) for key, value in state["latest"].items()}
+        return ranges
@@ -2,15 +2,29 @@
 target_creation.py
 
 This module provides functionality for creating target columns in a dataset based on
-indicator confluence. Targets are used in trading models to signal potential buy opportunities.
+indicator confluence or on future price paths. Targets are used in trading models to signal
+potential buy opportunities.
 
 Key Features:
     - Add a binary target column to a DataFrame based on specified indicator conditions.
+    - Triple-barrier labeling: for every bar, whether a long entry at its close would hit the profit
+      target or the stop loss first within a maximum holding horizon, with the same close-based
+      `profit_target`/`stop_loss` semantics as `backtesting.simulate_trading`.
+    - The first barrier hit is found for all bars at once by binary lifting over tables of windowed
+      maxima/minima (doubling windows of 1, 2, 4, ... bars): O(n log horizon) vectorized work,
+      processed in chunks so memory stays bounded on long histories.
+
+Functions:
+    - add_target: Adds a binary target from indicator confluence.
+    - triple_barrier_labels: Labels close prices by the first barrier hit within a horizon.
+    - add_triple_barrier_target: Adds triple-barrier labels and a binary target to a DataFrame.
 
 Use Case:
     - Create a labeled dataset for training a trading model by identifying periods
-      where indicators align for a potential buy signal.
+      where indicators align for a potential buy signal, or where a trade would have reached
+      its profit target before its stop loss.
 """
+import numpy as np
 import pandas as pd
 def add_target(data: pd.DataFrame) -> pd.DataFrame:
     """
@@ -43,3 +57,131 @@ def add_target(data: pd.DataFrame) -> pd.DataFrame:
     data["target"] = 0  # Default to 0 (No Buy)
     data.loc[(data["sma_20"] > data["sma_50"]) & (data["macd"] > data["signal_line"]), "target"] = 1
     return data
+
+
+def _extreme_tables(values, levels, op):
+    # tables[k][p] = op over values[p : p + 2**k] (truncated at the end of the array)
+    tables = [values]
+    for level in range(levels):
+        previous, step = tables[-1], 1 << level
+        table = previous.copy()
+        op(previous[:-step], previous[step:], out=table[:-step])
+        tables.append(table)
+    return tables
+
+
+def _first_hit(tables, first, available, hit):
+    # Binary lifting: skip the longest run of bars after each entry that contains no hit
+    last = len(tables[0]) - 1
+    position, remaining = first.copy(), available.copy()
+    for level in range(len(tables) - 1, -1, -1):
+        step = 1 << level
+        block = tables[level][np.minimum(position, last)]
+        advance = (remaining >= step) & ~hit(block)
+        position += advance * step
+        remaining -= advance * step
+    # A bar is left only if the next one hits the barrier
+    return remaining > 0, position
+
+
+def triple_barrier_labels(close, profit_target=0.02, stop_loss=0.01, horizon=24, chunk_rows=1_000_000):
+    """
+    Label every bar by the first barrier a long entry at its close would hit.
+
+    Parameters:
+        close (array-like): Close prices in ascending time order.
+        profit_target (float, optional): Upper barrier as a return. Default is 0.02 (2%).
+        stop_loss (float, optional): Lower barrier as a return. Default is 0.01 (1%).
+        horizon (int, optional): Maximum holding period in bars (the vertical barrier). Default is 24.
+        chunk_rows (int, optional): Entries processed per step. Default is 1,000,000.
+
+    Returns:
+        dict: Arrays with one value per bar:
+            - label (int8): 1 if the profit target is hit first, -1 if the stop loss is, 0 if neither
+              within the horizon.
+            - bars (int64): Bars from entry to exit (the horizon, or fewer at the end of the data, for 0).
+            - exit_return (float64): close[exit] / close[entry] - 1.
+            - complete (bool): False for bars labeled 0 only because the data ends before the horizon.
+
+    Notes:
+        - Barriers are checked on the closes of the following bars exactly like `simulate_trading`:
+          `close / entry - 1 >= profit_target` or `close / entry - 1 <= -stop_loss`.
+        - NaN closes never hit a barrier.
+
+    Example:
+        labels = triple_barrier_labels(data["Close_1h"], profit_target=0.02, stop_loss=0.01, horizon=48)
+    """
+    close = np.asarray(close, dtype=np.float64)
+    rows = len(close)
+    label = np.zeros(rows, dtype=np.int8)
+    bars = np.zeros(rows, dtype=np.int64)
+    levels = max(int(horizon).bit_length() - 1, 0)
+
+    for start in range(0, rows, chunk_rows):
+        stop = min(start + chunk_rows, rows)
+        window = close[start:min(stop + horizon, rows)]
+        local = np.arange(stop - start)
+        entry = window[local]
+        first = local + 1
+        available = np.minimum(horizon, len(window) - first)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            up, up_at = _first_hit(_extreme_tables(window, levels, np.fmax), first, available,
+                                   lambda block: block / entry - 1 >= profit_target)
+            down, down_at = _first_hit(_extreme_tables(window, levels, np.fmin), first, available,
+                                       lambda block: block / entry - 1 <= -stop_loss)
+        take_profit = up & (~down | (up_at <= down_at))
+        stopped = down & ~take_profit
+        label[start:stop] = np.where(take_profit, 1, np.where(stopped, -1, 0))
+        exit_at = np.where(take_profit, up_at, np.where(stopped, down_at, local + available))
+        bars[start:stop] = exit_at - local
+
+    positions = np.arange(rows)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exit_return = close[positions + bars] / close - 1
+    complete = (label != 0) | (bars == horizon)
+    return {"label": label, "bars": bars, "exit_return": exit_return, "complete": complete}
+
+
+def add_triple_barrier_target(data: pd.DataFrame, profit_target=0.02, stop_loss=0.01, horizon=24,
+                              price_column="Close_1h", drop_incomplete=True, details=False) -> pd.DataFrame:
+    """
+    Add triple-barrier labels and a binary target column.
+
+    Parameters:
+        data (pd.DataFrame): DataFrame in ascending time order with a close price column.
+        profit_target (float, optional): Upper barrier as a return. Default is 0.02 (2%).
+        stop_loss (float, optional): Lower barrier as a return. Default is 0.01 (1%).
+        horizon (int, optional): Maximum holding period in bars. Default is 24.
+        price_column (str, optional): Close price column. Default is "Close_1h".
+        drop_incomplete (bool, optional): Drop the last bars whose horizon runs past the end of the data
+            without a barrier hit (their label is unknown). Default is True.
+        details (bool, optional): Also add the barrier, barrier_bars and barrier_return columns. They
+            are computed from future bars, so drop them before preparing features. Default is False.
+
+    Returns:
+        pd.DataFrame: The input DataFrame with an added column:
+            - target (int): 1 if the profit target is hit before the stop loss within the horizon, else 0.
+            and, with `details`:
+            - barrier (int8): 1 (profit target), -1 (stop loss) or 0 (horizon reached).
+            - barrier_bars (int64): Bars until the exit.
+            - barrier_return (float64): Return at the exit.
+
+    Notes:
+        - Use the same `profit_target`/`stop_loss` as `simulate_trading` so that the model learns the
+          outcome the backtest rewards.
+        - Labels look ahead by construction: they are targets, never features. The default adds only
+          the target, so every other column stays safe to use as a feature.
+
+    Example:
+        data = add_triple_barrier_target(data, profit_target=0.02, stop_loss=0.01, horizon=48)
+        X, y = prepare_features_and_target(data, "target")
+    """
+    labels = triple_barrier_labels(data[price_column].to_numpy(), profit_target, stop_loss, horizon)
+    if details:
+        data["barrier"] = labels["label"]
+        data["barrier_bars"] = labels["bars"]
+        data["barrier_return"] = labels["exit_return"]
+    data["target"] = (labels["label"] == 1).astype(int)
+    if drop_incomplete and not labels["complete"].all():
+        data.drop(index=data.index[~labels["complete"]], inplace=True)
+    return data
@@ -0,0 +1,168 @@
+"""
+tick_aggregator.py
+
+This module builds OHLCV bars from raw trade prints (ticks) in the pipeline's schema.
+
+Key Features:
+    - Consumes ticks in chunks of (timestamp, price, quantity) arrays.
+    - Buckets every chunk with vectorized NumPy (group boundaries + reduceat, shared with resampling.py).
+    - Carries the partial bar across chunk boundaries, so results do not depend on how ticks are chunked.
+    - Uses constant memory regardless of input size: only the current chunk and one partial bar are held.
+    - Emits bars with the columns validated by load_csv_data: Unix, Open, High, Low, Close, Volume BTC,
+      Volume USDT, tradecount (plus Date and Symbol when a symbol is given).
+
+Functions:
+    - aggregate_ticks: Aggregates an iterable of tick chunks into a stream of bar DataFrames.
+
+Classes:
+    - TickAggregator: Stateful chunk-by-chunk tick-to-bar aggregator.
+
+Use Case:
+    - Build 1m/5m/1h bars from archived trade prints instead of waiting for exchange CSV exports.
+"""
+import numpy as np
+import pandas as pd
+from src.resampling import timeframe_ms, bucket_starts, group_starts, aggregate_ohlcv, DAY_MS
+
+BAR_COLUMNS = ["Unix", "Open", "High", "Low", "Close", "Volume BTC", "Volume USDT", "tradecount"]
+
+
+def _to_unix_ms(timestamps):
+    timestamps = np.asarray(timestamps)
+    if np.issubdtype(timestamps.dtype, np.datetime64):
+        return timestamps.astype("datetime64[ms]").astype(np.int64)
+    return timestamps.astype(np.int64, copy=False)
+
+
+class TickAggregator:
+    """
+    Stateful chunk-by-chunk tick-to-bar aggregator.
+
+    Parameters:
+        timeframe (str or int, optional): Bar timeframe ("1m", "5m", "1h", ...) or a length in
+            milliseconds. Default is "1m".
+        symbol (str, optional): If given, bars also get the Symbol and Date columns. Default is None.
+
+    Attributes:
+        partial_bar (dict or None): The bar still open at the end of the last chunk.
+
+    Notes:
+        - Ticks must arrive in non-decreasing time order, within and across chunks.
+        - Intervals without any tick produce no bar.
+
+    Example:
+        aggregator = TickAggregator("5m", symbol="BTCUSDT")
+        for ts, price, qty in read_trade_chunks():
+            bars = aggregator.process_chunk(ts, price, qty)
+            append_frame(bars, "data/store", "BTCUSDT", "5m")
+        last_bar = aggregator.flush()
+    """
+
+    def __init__(self, timeframe="1m", symbol=None):
+        self.period_ms, self.origin_ms = timeframe_ms(timeframe)
+        self.symbol = symbol
+        self.partial_bar = None
+        self._last_ts = None
+
+    def process_chunk(self, timestamps, prices, quantities):
+        """
+        Add a chunk of ticks and return the bars it completes.
+
+        Parameters:
+            timestamps (array-like): Trade times as Unix milliseconds or datetime64 values.
+            prices (array-like): Trade prices.
+            quantities (array-like): Trade quantities in the base asset.
+
+        Returns:
+            pd.DataFrame: Bars completed by this chunk, in ascending time order (possibly empty).
+
+        Raises:
+            ValueError: If the arrays differ in length or the ticks go back in time.
+        """
+        ts = _to_unix_ms(timestamps)
+        price = np.asarray(prices, dtype=np.float64)
+        qty = np.asarray(quantities, dtype=np.float64)
+        if not len(ts) == len(price) == len(qty):
+            raise ValueError("timestamps, prices and quantities must have the same length.")
+        if len(ts) == 0:
+            return self._frame([])
+        if np.any(ts[1:] < ts[:-1]) or (self._last_ts is not None and ts[0] < self._last_ts):
+            raise ValueError("Ticks must be in non-decreasing time order.")
+        self._last_ts = int(ts[-1])
+
+        keys = bucket_starts(ts, self.period_ms, self.origin_ms)
+        starts = group_starts(keys)
+        bars = aggregate_ohlcv(starts, price, price, price, price, qty, price * qty)
+        bars["Unix"] = keys[starts]
+
+        # Fold the bar carried from the previous chunk into the first group, or emit it
+        carried = self.partial_bar
+        completed = []
+        if carried is not None:
+            if carried["Unix"] == bars["Unix"][0]:
+                bars["Open"][0] = carried["Open"]
+                bars["High"][0] = max(bars["High"][0], carried["High"])
+                bars["Low"][0] = min(bars["Low"][0], carried["Low"])
+                bars["Volume BTC"][0] += carried["Volume BTC"]
+                bars["Volume USDT"][0] += carried["Volume USDT"]
+                bars["tradecount"][0] += carried["tradecount"]
+            else:
+                completed.append(carried)
+
+        # The last group may continue in the next chunk
+        self.partial_bar = {column: bars[column][-1].item() for column in BAR_COLUMNS}
+        return self._frame(completed, {column: bars[column][:-1] for column in BAR_COLUMNS})
+
+    def flush(self):
+        """
+        Close the partial bar (e.g. at the end of the input).
+
+        Returns:
+            pd.DataFrame: The last bar, or an empty DataFrame if there is none.
+        """
+        bar, self.partial_bar = self.partial_bar, None
+        return self._frame([bar] if bar is not None else [])
+
+    def _frame(self, leading, arrays=None):
+        """Build a bar DataFrame from leading bar dicts followed by column arrays."""
+        columns = {}
+        for column in BAR_COLUMNS:
+            dtype = np.int64 if column in ("Unix", "tradecount") else np.float64
+            head = np.array([bar[column] for bar in leading], dtype=dtype)
+            columns[column] = head if arrays is None else np.concatenate((head, arrays[column]))
+        frame = pd.DataFrame(columns, copy=False)
+        if self.symbol is not None:
+            date_format = "%Y-%m-%d" if self.period_ms % DAY_MS == 0 else "%Y-%m-%d %H:%M:%S"
+            frame.insert(1, "Date", pd.to_datetime(frame["Unix"], unit="ms").dt.strftime(date_format))
+            frame.insert(2, "Symbol", self.symbol)
+        return frame
+
+
+def aggregate_ticks(chunks, timeframe="1m", symbol=None):
+    """
+    Aggregate an iterable of tick chunks into a stream of bar DataFrames.
+
+    Parameters:
+        chunks (iterable): Yields (timestamps, prices, quantities) tuples of arrays, or DataFrames with
+            'timestamp', 'price' and 'qty' columns.
+        timeframe (str or int, optional): Bar timeframe. Default is "1m".
+        symbol (str, optional): Adds Symbol and Date columns when given. Default is None.
+
+    Yields:
+        pd.DataFrame: Completed bars after each chunk, then the final partial bar.
+
+    Example:
+        reader = pd.read_csv("trades.csv", chunksize=1_000_000)
+        for bars in aggregate_ticks(reader, "1h", symbol="BTCUSDT"):
+            append_frame(bars, "data/store", "BTCUSDT", "1h")
+    """
+    aggregator = TickAggregator(timeframe, symbol=symbol)
+    for chunk in chunks:
+        if isinstance(chunk, pd.DataFrame):
+            chunk = (chunk["timestamp"].to_numpy(), chunk["price"].to_numpy(), chunk["qty"].to_numpy())
+        bars = aggregator.process_chunk(*chunk)
+        if len(bars):
+            yield bars
+    last = aggregator.flush()
+    if len(last):
+        yield last
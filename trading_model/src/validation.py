@@ -0,0 +1,236 @@
+"""
+validation.py
+
+This module evaluates models with walk-forward (time-series) cross-validation: every fold trains
+only on bars before its test window, so no future bar leaks into training.
+
+Key Features:
+    - Expanding (all history so far) or rolling (fixed length) training windows followed by
+      consecutive test windows.
+    - Purge and embargo gaps around each train/test boundary for labels that look ahead (e.g.
+      triple-barrier labels with a holding horizon) and serially correlated features.
+    - Folds train and evaluate with `models.train_model`/`models.evaluate_model` in a process pool.
+      The feature matrix is written once to a .npy file that every worker memory-maps read-only, so
+      only fold boundaries are pickled to the workers, never the data.
+    - One row of metrics per fold, ready for comparison or aggregation.
+
+Functions:
+    - walk_forward_splits: Builds the train/test row ranges of every fold.
+    - holdout_split: Builds a single chronological train/test fold.
+    - score_fold: Trains and evaluates a model on one fold of in-memory arrays.
+    - score_fold_memmap: Worker task scoring one fold on memory-mapped .npy files.
+    - shared_arrays: Context manager writing X/y to .npy files for workers to memory-map.
+    - walk_forward_validate: Trains and evaluates a model on every fold, optionally in parallel.
+
+Use Case:
+    - Replace the single shuffled train/test split with an out-of-sample score per period:
+      results = walk_forward_validate(X, y, walk_forward_splits(len(X), n_splits=5, purge=24))
+"""
+import os
+import shutil
+import tempfile
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from src.models import train_model, evaluate_model
+
+Fold = namedtuple("Fold", ["fold", "train_start", "train_stop", "test_start", "test_stop"])
+
+MODES = ("expanding", "rolling")
+
+
+def walk_forward_splits(rows, n_splits=5, test_size=None, train_size=None, mode="expanding", purge=0, embargo=0):
+    """
+    Build the train/test row ranges of walk-forward folds.
+
+    Parameters:
+        rows (int): Number of rows (bars) in ascending time order.
+        n_splits (int, optional): Number of folds. Default is 5.
+        test_size (int, optional): Rows per test window. Default is rows // (n_splits + 1), so the first
+            fold trains on about one test window of history.
+        train_size (int, optional): Training rows per fold in "rolling" mode (required there). Ignored in
+            "expanding" mode, where training always starts at row 0.
+        mode (str, optional): "expanding" or "rolling". Default is "expanding".
+        purge (int, optional): Rows dropped from the end of every training window, so that training
+            labels looking up to `purge` bars ahead never see the test window. Default is 0.
+        embargo (int, optional): Rows skipped at the start of every test window, after the purge gap,
+            to let serially correlated features decay. Default is 0.
+
+    Returns:
+        list: Fold namedtuples (fold, train_start, train_stop, test_start, test_stop) with half-open
+            row ranges; test windows are consecutive and end at the last row.
+
+    Raises:
+        ValueError: If the mode is unknown or a fold would have no training or test rows.
+
+    Example:
+        folds = walk_forward_splits(len(data), n_splits=5, mode="rolling", train_size=24 * 365, purge=24)
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unsupported walk-forward mode: {mode}")
+    if mode == "rolling" and train_size is None:
+        raise ValueError("Rolling walk-forward needs a train_size.")
+    if test_size is None:
+        test_size = rows // (n_splits + 1)
+
+    folds = []
+    for fold in range(n_splits):
+        window_start = rows - (n_splits - fold) * test_size
+        train_stop = window_start - purge
+        train_start = 0 if mode == "expanding" else max(train_stop - train_size, 0)
+        test_start = window_start + embargo
+        test_stop = window_start + test_size
+        if train_stop <= train_start or test_stop <= test_start or window_start < 0:
+            raise ValueError(f"Fold {fold} has no training or test rows; use fewer splits or smaller gaps.")
+        folds.append(Fold(fold, train_start, train_stop, test_start, test_stop))
+    return folds
+
+
+def holdout_split(rows, test_size=0.2, purge=0, embargo=0):
+    """
+    Build a single chronological hold-out fold: train on the first rows, test on the last ones.
+
+    Parameters:
+        rows (int): Number of rows (bars) in ascending time order.
+        test_size (float or int, optional): Fraction (below 1) or number of rows held out. Default is 0.2.
+        purge (int, optional): Rows dropped from the end of the training window. Default is 0.
+        embargo (int, optional): Rows skipped at the start of the test window. Default is 0.
+
+    Returns:
+        list: One Fold, so it can be used wherever `walk_forward_splits` folds are.
+
+    Raises:
+        ValueError: If the training or test window would be empty.
+    """
+    test_rows = int(round(rows * test_size)) if test_size < 1 else int(test_size)
+    return walk_forward_splits(rows, n_splits=1, test_size=test_rows, purge=purge, embargo=embargo)
+
+
+def score_fold(fold, X, y, columns, random_state=42, model_params=None):
+    """
+    Train and evaluate a model on one fold.
+
+    Parameters:
+        fold (Fold): Row ranges of the fold.
+        X (np.ndarray): Feature matrix (an in-memory array or a memory map).
+        y (np.ndarray): Target, aligned with X.
+        columns (list): Feature names of the columns of X.
+        random_state (int, optional): Random state passed to train_model. Default is 42.
+        model_params (dict, optional): Extra RandomForestClassifier parameters passed to train_model.
+
+    Returns:
+        dict: Fold ranges, train_rows, test_rows, accuracy, precision, recall, positive_rate and fit_seconds.
+    """
+    X_train = pd.DataFrame(X[fold.train_start:fold.train_stop], columns=columns, copy=False)
+    X_test = pd.DataFrame(X[fold.test_start:fold.test_stop], columns=columns, copy=False)
+    y_train = y[fold.train_start:fold.train_stop]
+    y_test = y[fold.test_start:fold.test_stop]
+
+    start = time.perf_counter()
+    model = train_model(X_train, y_train, random_state=random_state, **(model_params or {}))
+    fit_seconds = time.perf_counter() - start
+    metrics = evaluate_model(model, X_test, y_test)
+
+    matrix = metrics["confusion_matrix"]
+    if matrix.shape == (2, 2):
+        (_, false_positive), (false_negative, true_positive) = matrix
+        predicted, actual = true_positive + false_positive, true_positive + false_negative
+        precision = true_positive / predicted if predicted else 0.0
+        recall = true_positive / actual if actual else 0.0
+    else:
+        precision = recall = np.nan
+    return dict(fold._asdict(), train_rows=len(y_train), test_rows=len(y_test), accuracy=metrics["accuracy"],
+                precision=precision, recall=recall, positive_rate=float(np.mean(y_test == 1)),
+                fit_seconds=fit_seconds)
+
+
+def score_fold_memmap(fold, X_path, y_path, columns, random_state=42, model_params=None):
+    """Worker task: memory-map the shared feature matrix and target, then `score_fold`."""
+    X = np.load(X_path, mmap_mode="r")
+    y = np.load(y_path, mmap_mode="r")
+    return score_fold(fold, X, y, columns, random_state, model_params)
+
+
+@contextmanager
+def shared_arrays(X, y, temp_dir=None):
+    """
+    Write X and y to .npy files that worker processes can memory-map, and remove them afterwards.
+
+    Parameters:
+        X (np.ndarray): Feature matrix.
+        y (np.ndarray): Target.
+        temp_dir (str, optional): Parent directory of the temporary files. Default is the system one.
+
+    Yields:
+        tuple: (X_path, y_path) for `np.load(path, mmap_mode="r")`.
+    """
+    directory = tempfile.mkdtemp(prefix="shared_arrays_", dir=temp_dir)
+    try:
+        X_path, y_path = os.path.join(directory, "X.npy"), os.path.join(directory, "y.npy")
+        np.save(X_path, X)
+        np.save(y_path, y)
+        yield X_path, y_path
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def walk_forward_validate(X, y, folds, workers=None, random_state=42, dtype=np.float32, temp_dir=None,
+                          model_params=None):
+    """
+    Train and evaluate a model on every walk-forward fold.
+
+    Parameters:
+        X (pd.DataFrame): Features in ascending time order (numeric columns are used, as in train_model).
+        y (pd.Series or np.ndarray): Target, aligned with X.
+        folds (list): Folds from `walk_forward_splits`.
+        workers (int, optional): Number of worker processes. None uses one per CPU; 1 runs the folds
+            serially in this process. Default is None.
+        random_state (int, optional): Random state passed to train_model. Default is 42.
+        dtype (np.dtype, optional): Dtype of the shared feature matrix. Default is float32 (the dtype
+            the random forest trains on, so workers do not convert it again).
+        temp_dir (str, optional): Directory for the shared .npy files. Defaults to a temporary directory,
+            removed afterwards.
+        model_params (dict, optional): Extra RandomForestClassifier parameters passed to train_model.
+
+    Returns:
+        pd.DataFrame: One row per fold with the fold ranges, train_rows, test_rows, accuracy, precision
+            and recall of class 1, positive_rate of the test window and fit_seconds. With a DatetimeIndex,
+            train_from/train_to/test_from/test_to give the time span of each window.
+
+    Notes:
+        - The features are converted to one contiguous array once. In parallel mode it is saved to disk
+          and memory-mapped by every worker, so all processes share the same pages of the OS cache
+          instead of each receiving a pickled copy.
+
+    Example:
+        folds = walk_forward_splits(len(X), n_splits=5, purge=24)
+        results = walk_forward_validate(X, y, folds, workers=4)
+        print(results[["fold", "accuracy", "precision"]], results["accuracy"].mean())
+    """
+    numeric = X.select_dtypes(include=["number"])
+    columns = list(numeric.columns)
+    values = np.ascontiguousarray(numeric.to_numpy(dtype=dtype))
+    target = np.ascontiguousarray(np.asarray(y))
+
+    if workers == 1 or len(folds) <= 1:
+        rows = [score_fold(fold, values, target, columns, random_state, model_params) for fold in folds]
+    else:
+        with shared_arrays(values, target, temp_dir) as (X_path, y_path):
+            del values
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                tasks = [executor.submit(score_fold_memmap, fold, X_path, y_path, columns, random_state,
+                                         model_params) for fold in folds]
+                rows = [task.result() for task in tasks]
+
+    results = pd.DataFrame(rows)
+    if isinstance(X.index, pd.DatetimeIndex) and len(results):
+        index = X.index
+        results["train_from"] = index[results["train_start"]]
+        results["train_to"] = index[results["train_stop"] - 1]
+        results["test_from"] = index[results["test_start"]]
+        results["test_to"] = index[results["test_stop"] - 1]
+    return results
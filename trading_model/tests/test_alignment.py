@@ -0,0 +1,73 @@
+"""
+test_alignment.py
+
+This module contains unit tests for the `alignment` module, which aligns bars of two
+timeframes with a backward as-of merge on completed bars.
+
+Tests:
+    - test_infer_interval: Verifies bar intervals are inferred from Unix timestamps.
+    - test_asof_positions_no_lookahead: Verifies only completed bars are attached.
+    - test_align_asof_any_timeframes: Verifies alignment of a 4h base onto 1h bars and of unsorted input.
+
+Usage:
+    Run this script using pytest:
+        pytest test_alignment.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.alignment import infer_interval, asof_positions, align_asof
+
+HOUR_MS = 3600000
+
+
+def test_infer_interval():
+    """
+    Test the `infer_interval` function.
+
+    Asserts:
+        - The most common spacing is returned, even with a gap and unsorted input.
+        - Fewer than two timestamps raise ValueError.
+    """
+    unix = np.array([5, 4, 3, 1, 0]) * HOUR_MS
+    assert infer_interval(unix) == HOUR_MS
+    with pytest.raises(ValueError):
+        infer_interval([0])
+
+
+def test_asof_positions_no_lookahead():
+    """
+    Test the `asof_positions` function.
+
+    Asserts:
+        - Hourly bars before the first 4h close get -1.
+        - Each hourly bar maps to the latest 4h bar closed by its own close.
+    """
+    hourly = np.arange(12) * HOUR_MS
+    four_hour = np.arange(3) * 4 * HOUR_MS
+    positions = asof_positions(hourly, four_hour, HOUR_MS, 4 * HOUR_MS)
+    assert positions.tolist() == [-1, -1, -1, 0, 0, 0, 0, 1, 1, 1, 1, 2]
+
+
+def test_align_asof_any_timeframes():
+    """
+    Test the `align_asof` function on 1h and 4h bars given in shuffled order.
+
+    Asserts:
+        - The result is sorted by time and has one row per base bar.
+        - Leading bars without a completed 4h bar are NaN, or dropped with drop_incomplete.
+        - Attached values come from the expected 4h bar.
+    """
+    rng = np.random.default_rng(0)
+    base = pd.DataFrame({"Unix": np.arange(12) * HOUR_MS, "Close": np.arange(12, dtype=float)})
+    other = pd.DataFrame({"Unix": np.arange(3) * 4 * HOUR_MS, "Close": [10.0, 20.0, 30.0], "tradecount": [1, 2, 3]})
+    base = base.iloc[rng.permutation(len(base))]
+
+    aligned = align_asof(base, other, suffixes=("_1h", "_4h"))
+    assert aligned.index.is_monotonic_increasing and len(aligned) == 12
+    assert aligned["Close_4h"].isna().sum() == 3
+    assert aligned["Close_4h"].iloc[3:].tolist() == [10.0] * 4 + [20.0] * 4 + [30.0]
+
+    trimmed = align_asof(base, other, suffixes=("_1h", "_4h"), drop_incomplete=True)
+    assert len(trimmed) == 9
+    assert trimmed["tradecount_4h"].dtype == np.int64
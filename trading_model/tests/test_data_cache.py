@@ -0,0 +1,173 @@
+"""
+test_data_cache.py
+
+This module contains unit tests for the `data_cache` module, which provides an on-disk
+columnar cache for CSV files loaded by the data pipeline.
+
+Tests:
+    - test_cache_round_trip: Verifies a cached load returns the same data as a fresh CSV parse.
+    - test_cache_detects_stale_entry: Verifies a modified source file triggers a rebuild.
+    - test_cache_keyed_by_read_options: Verifies an entry is only served for the read_csv options it was parsed with.
+    - test_invalidate_cache: Verifies entries can be removed per file and for the whole cache.
+    - test_load_csv_data_with_cache: Verifies `load_csv_data` validates columns on cached loads.
+    - test_sorted_range: Verifies binary-search windows over ascending and descending Unix arrays.
+
+Usage:
+    Run this script using pytest:
+        pytest test_data_cache.py
+"""
+import os
+import numpy as np
+import pandas as pd
+from src.data_cache import (load_csv_cached, read_cache, read_options_key, cache_entry_dir, invalidate_cache,
+                            sorted_range)
+from src.data_pipeline import load_csv_data
+
+HEADER = "Unix,Date,Symbol,Open,High,Low,Close,Volume BTC,Volume USDT,tradecount"
+
+
+def write_sample_csv(path, rows=5, start_price=100.0):
+    """
+    Write a small CSV in the CryptoDataDownload layout (source line, then header, newest first).
+
+    Args:
+        path (str): Destination path.
+        rows (int): Number of daily rows to write.
+        start_price (float): Close price of the oldest row.
+    """
+    lines = ["https://www.CryptoDataDownload.com", HEADER]
+    for i in reversed(range(rows)):
+        unix = 1700000000000 + i * 86400000
+        date = pd.to_datetime(unix, unit="ms").strftime("%Y-%m-%d")
+        price = start_price + i
+        lines.append(f"{unix},{date},BTCUSDT,{price},{price + 1},{price - 1},{price + 0.5},1.5,{price * 1.5},{10 + i}")
+    with open(path, "w") as handle:
+        handle.write("\n".join(lines) + "\n")
+
+
+def test_cache_round_trip(tmp_path):
+    """
+    Test that a cached load matches a fresh CSV parse.
+
+    Asserts:
+        - The first load creates a cache entry.
+        - The second load is served from the cache and equals the CSV contents, dtypes included.
+    """
+    csv_file = str(tmp_path / "Binance_BTCUSDT_d.csv")
+    cache_dir = str(tmp_path / "cache")
+    write_sample_csv(csv_file)
+
+    expected = pd.read_csv(csv_file, skiprows=1)
+    first = load_csv_cached(csv_file, cache_dir, skiprows=1)
+    assert os.path.isdir(cache_entry_dir(csv_file, cache_dir)), "Cache entry was not created."
+
+    cached = read_cache(csv_file, cache_dir)
+    assert cached is not None, "Fresh cache entry should be readable."
+    pd.testing.assert_frame_equal(first, expected)
+    pd.testing.assert_frame_equal(cached, expected)
+
+
+def test_cache_detects_stale_entry(tmp_path):
+    """
+    Test that rewriting the source file invalidates the cache entry.
+
+    Asserts:
+        - After the CSV changes, the stale entry is ignored and the new contents are returned.
+    """
+    csv_file = str(tmp_path / "Binance_BTCUSDT_d.csv")
+    cache_dir = str(tmp_path / "cache")
+    write_sample_csv(csv_file, rows=5)
+    load_csv_cached(csv_file, cache_dir, skiprows=1)
+
+    write_sample_csv(csv_file, rows=7)
+    os.utime(csv_file, ns=(0, os.stat(csv_file).st_mtime_ns + 1_000_000))
+    assert read_cache(csv_file, cache_dir) is None, "Stale entry should not be served."
+
+    reloaded = load_csv_cached(csv_file, cache_dir, skiprows=1)
+    assert len(reloaded) == 7, "Reload should reflect the rewritten file."
+
+
+def test_cache_keyed_by_read_options(tmp_path):
+    """
+    Test that an entry parsed with other `pd.read_csv` options is not served.
+
+    Asserts:
+        - Loading with different options re-parses the file instead of returning the cached parse.
+        - Options given in a different order hit the same entry.
+    """
+    csv_file = str(tmp_path / "Binance_BTCUSDT_d.csv")
+    cache_dir = str(tmp_path / "cache")
+    write_sample_csv(csv_file)
+
+    raw = load_csv_cached(csv_file, cache_dir)
+    parsed = load_csv_cached(csv_file, cache_dir, skiprows=1)
+    assert list(parsed.columns) == HEADER.split(",")
+    assert list(parsed.columns) != list(raw.columns)
+
+    load_csv_cached(csv_file, cache_dir, skiprows=1, nrows=2)
+    reordered = load_csv_cached(csv_file, cache_dir, nrows=2, skiprows=1)
+    assert len(reordered) == 2
+    assert read_cache(csv_file, cache_dir, read_options=read_options_key({"skiprows": 1, "nrows": 2})) is not None
+
+
+def test_invalidate_cache(tmp_path):
+    """
+    Test the `invalidate_cache` function.
+
+    Asserts:
+        - Invalidating a single file removes only that entry.
+        - Invalidating without a file removes all remaining entries.
+    """
+    cache_dir = str(tmp_path / "cache")
+    files = [str(tmp_path / "Binance_BTCUSDT_d.csv"), str(tmp_path / "Binance_ETHUSDT_d.csv")]
+    for csv_file in files:
+        write_sample_csv(csv_file)
+        load_csv_cached(csv_file, cache_dir, skiprows=1)
+
+    assert invalidate_cache(cache_dir, files[0]) == 1
+    assert read_cache(files[0], cache_dir) is None
+    assert read_cache(files[1], cache_dir) is not None
+    assert invalidate_cache(cache_dir) == 1
+    assert read_cache(files[1], cache_dir) is None
+
+
+def test_load_csv_data_with_cache(tmp_path):
+    """
+    Test `load_csv_data` with a cache directory.
+
+    Asserts:
+        - Valid files load identically with and without the cache.
+        - A cached file with missing columns is still rejected (None is returned).
+    """
+    hourly_file = str(tmp_path / "Binance_BTCUSDT_1h.csv")
+    daily_file = str(tmp_path / "Binance_BTCUSDT_d.csv")
+    cache_dir = str(tmp_path / "cache")
+    write_sample_csv(hourly_file)
+    write_sample_csv(daily_file)
+
+    hourly_plain, daily_plain = load_csv_data(hourly_file, daily_file)
+    for _ in range(2):
+        hourly_cached, daily_cached = load_csv_data(hourly_file, daily_file, cache_dir=cache_dir)
+        pd.testing.assert_frame_equal(hourly_cached, hourly_plain)
+        pd.testing.assert_frame_equal(daily_cached, daily_plain)
+
+    with open(daily_file, "w") as handle:
+        handle.write("https://www.CryptoDataDownload.com\nUnix,Close\n1700000000000,1.0\n")
+    _, daily_invalid = load_csv_data(hourly_file, daily_file, cache_dir=cache_dir)
+    assert daily_invalid is None, "Files missing required columns should be rejected."
+
+
+def test_sorted_range():
+    """
+    Test the `sorted_range` function.
+
+    Asserts:
+        - Inclusive bounds select the same rows as a boolean mask, for both sort orders.
+        - Empty and unbounded windows are handled.
+    """
+    unix = np.arange(0, 100, 5, dtype=np.int64)
+    for values, order in [(unix, "ascending"), (unix[::-1], "descending")]:
+        rows = sorted_range(values, 12, 40, order=order)
+        assert values[rows].tolist() == values[(values >= 12) & (values <= 40)].tolist()
+        assert len(values[sorted_range(values, 200, None, order=order)]) == 0
+        assert len(values[sorted_range(values, None, None, order=order)]) == len(values)
@@ -7,14 +7,23 @@ functionality to normalize numerical data in pandas DataFrames.
 Tests:
     - test_normalize_data: Verifies that the `normalize_data` function correctly normalizes data
       using Min-Max scaling and Z-Score normalization.
+    - test_normalizer_partial_fit_matches_sklearn: Verifies chunked fitting gives sklearn's scaling.
+    - test_normalizer_fit_rows_and_persistence: Verifies training-range fitting, save/load and the
+      in-place float32 transform.
+    - test_rolling_normalization_matches_pandas: Verifies rolling z-score/min-max against pandas rolling
+      statistics, through `normalize_data` and the streaming `RollingNormalizer`.
+    - test_rolling_zscore_low_variance_far_from_origin: Verifies quiet windows far from the first value
+      are not treated as constant.
 
 Usage:
     Run this script using pytest:
         pytest test_data_normalize.py
 """
 import os
+import numpy as np
 import pandas as pd
-from src.data_normalize import normalize_data
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+from src.data_normalize import normalize_data, Normalizer, RollingNormalizer, rolling_zscore, rolling_minmax
 
 def test_normalize_data():
     """
@@ -57,3 +66,106 @@ def test_normalize_data():
 
     
     print("All tests passed for normalize_data!")
+
+
+def test_normalizer_partial_fit_matches_sklearn():
+    """
+    Test `Normalizer.partial_fit` over chunks against sklearn fitted on all rows.
+
+    Asserts:
+        - Min-max and z-score results equal MinMaxScaler/StandardScaler, including a constant column.
+        - NaNs are ignored when fitting and stay NaN when transforming.
+    """
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({"a": rng.normal(5, 3, 1000), "b": rng.integers(0, 100, 1000), "c": np.ones(1000)})
+    for method, scaler in [("minmax", MinMaxScaler()), ("zscore", StandardScaler())]:
+        normalizer = Normalizer(method)
+        for start in range(0, len(data), 137):
+            normalizer.partial_fit(data.iloc[start:start + 137])
+        np.testing.assert_allclose(normalizer.transform(data).to_numpy(), scaler.fit_transform(data), atol=1e-12)
+
+    with_nan = data.astype(float)
+    with_nan.loc[5, "a"] = np.nan
+    normalized = Normalizer("zscore").fit(with_nan).transform(with_nan)
+    assert np.isnan(normalized.loc[5, "a"])
+    assert abs(normalized["a"].mean()) < 1e-12
+
+
+def test_normalizer_fit_rows_and_persistence(tmp_path):
+    """
+    Test fitting on a training range, saving and loading, and the in-place array transform.
+
+    Asserts:
+        - With `fit_rows`, the training rows span exactly [0, 1] and later rows are scaled with the
+          training parameters (values may leave [0, 1]), so nothing leaks from later rows.
+        - A loaded normalizer transforms like the saved one; `transform_array` works in place on float32.
+    """
+    data = pd.DataFrame({"close": np.arange(100, dtype=float), "volume": np.arange(100, 200, dtype=float)})
+    normalizer = Normalizer("minmax")
+    normalized = normalize_data(data.copy(), normalizer=normalizer, fit_rows=50)
+    assert normalized["close"].iloc[:50].min() == 0.0 and normalized["close"].iloc[:50].max() == 1.0
+    assert normalized["close"].iloc[-1] == 99 / 49
+
+    path = tmp_path / "normalizer.json"
+    normalizer.save(path)
+    loaded = Normalizer.load(path)
+    assert loaded.columns == ["close", "volume"]
+    values = np.array(data, dtype=np.float32)
+    result = loaded.transform_array(values)
+    assert result is values and result.dtype == np.float32
+    np.testing.assert_allclose(result, normalized.to_numpy(), rtol=1e-6)
+
+
+def test_rolling_normalization_matches_pandas():
+    """
+    Test the rolling normalization methods against pandas rolling statistics.
+
+    Asserts:
+        - `normalize_data` with "rolling_zscore" and "rolling_minmax" equals (x - mean) / std(ddof=0) and
+          (x - min) / (max - min) over the window, on price-like columns with a flat stretch (scaled to 0)
+          and a NaN (NaN while in the window).
+        - Non-numeric columns are left untouched.
+        - `RollingNormalizer` reproduces the batch values bar by bar.
+    """
+    rng = np.random.default_rng(1)
+    prices = 30000 + np.cumsum(rng.normal(0, 50, (600, 2)), axis=0)
+    prices[200:260, 0] = prices[200, 0]
+    prices[400, 1] = np.nan
+    data = pd.DataFrame(prices, columns=["close", "high"]).assign(symbol="BTCUSDT")
+    frame = data[["close", "high"]]
+    window = 24
+
+    mean, std = frame.rolling(window).mean(), frame.rolling(window).std(ddof=0)
+    expected_zscore = ((frame - mean) / std.where(std > 1e-6, 1.0)).to_numpy()
+    low, high = frame.rolling(window).min(), frame.rolling(window).max()
+    expected_minmax = ((frame - low) / (high - low).where(high > low, 1.0)).to_numpy()
+
+    for method, expected in [("rolling_zscore", expected_zscore), ("rolling_minmax", expected_minmax)]:
+        result = normalize_data(data.copy(), method=method, window=window)
+        np.testing.assert_allclose(result[["close", "high"]].to_numpy(), expected, atol=1e-6, err_msg=method)
+        assert (result["symbol"] == "BTCUSDT").all()
+        assert (result["close"].iloc[200 + window:260] == 0).all()
+
+        streamed = RollingNormalizer(window, method).update_many(prices)
+        np.testing.assert_allclose(streamed, expected, atol=1e-6, err_msg=f"streaming {method}")
+
+
+def test_rolling_zscore_low_variance_far_from_origin():
+    """
+    Test the rolling z-score of low-variance windows far from the column's first value.
+
+    Asserts:
+        - After a climb from 1 to 1000, windows with a standard deviation of 0.01 match pandas in both
+          `rolling_zscore` and `RollingNormalizer` instead of being scaled to 0.
+        - A flat stretch after them is still scaled to 0.
+    """
+    rng = np.random.default_rng(0)
+    values = np.concatenate([np.linspace(1, 1000, 100), 1000 + rng.normal(0, 0.01, 200)])
+    values[250:280] = values[250]
+    window = 24
+    series = pd.Series(values)
+    expected = ((series - series.rolling(window).mean()) / series.rolling(window).std(ddof=0)).to_numpy()
+
+    for result in (rolling_zscore(values, window)[:, 0], RollingNormalizer(window).update_many(values)[:, 0]):
+        np.testing.assert_allclose(result[100 + window:250], expected[100 + window:250], atol=1e-3)
+        assert (result[250 + window:280] == 0).all()
@@ -6,13 +6,19 @@ This module contains unit tests for the data_pipeline module.
 Tests:
     - test_load_csv_data: Verifies the load_csv_data function correctly loads hourly and daily CSV files.
     - test_merge_and_clean_data: Verifies the merge_and_clean_data function merges and cleans data as expected.
+    - test_load_csv_data_lean: Verifies the lean loading mode applies the fixed schema and column pruning.
+    - test_load_csv_data_time_window: Verifies start/end windows on every loading path.
+    - test_read_csv_window_edge_cases: Verifies windows over header-only files and per-chunk categories.
+    - test_load_universe: Verifies parallel multi-symbol loading, panel output and error reporting.
+    - test_merge_and_clean_data_asof: Verifies the as-of merge keeps every hourly bar without lookahead.
+    - test_merge_and_clean_data_single_daily_bar: Verifies the as-of merge of a single daily bar.
 
 Usage:
     Run this script using pytest:
         pytest test_data_pipeline.py
 """
 import pandas as pd
-from src.data_pipeline import load_csv_data, merge_and_clean_data
+from src.data_pipeline import load_csv_data, merge_and_clean_data, load_universe, _read_csv_window
 
 # Define file paths for testing
 HOURLY_FILE = "/Users/lifecloud/Desktop/tradingmodel/trading_model/data/Binance_BTCUSDT_1h.csv"
@@ -70,3 +76,190 @@ def test_merge_and_clean_data():
 
     # Ensure data is not empty after merging
     assert not combined_data.empty, "Combined data should not be empty."
+
+def test_load_csv_data_lean(tmp_path):
+    """
+    Test the lean loading mode of load_csv_data.
+
+    Validates:
+        - The fixed schema is applied (int64 Unix, float32 prices, categorical Symbol).
+        - Date is dropped by default and usecols prunes the remaining columns.
+        - Files missing required columns are still rejected.
+
+    Asserts:
+        - Column dtypes and column sets match the lean schema.
+        - Values match the default loader.
+        - None is returned for a file with missing columns.
+    """
+    header = "Unix,Date,Symbol,Open,High,Low,Close,Volume BTC,Volume USDT,tradecount"
+    rows = [f"{1700000000000 + i * 3600000},2023-11-14,BTCUSDT,{100 + i},{101 + i},{99 + i},{100.5 + i},1.5,{150 + i},{10 + i}"
+            for i in range(5)]
+    hourly_file = tmp_path / "Binance_BTCUSDT_1h.csv"
+    hourly_file.write_text("\n".join(["https://www.CryptoDataDownload.com", header] + rows) + "\n")
+    daily_file = tmp_path / "Binance_BTCUSDT_d.csv"
+    daily_file.write_text("https://www.CryptoDataDownload.com\nUnix,Close\n1700000000000,1.0\n")
+
+    hourly_data, daily_data = load_csv_data(str(hourly_file), str(daily_file), lean=True, float32=True)
+    assert daily_data is None, "Files missing required columns should be rejected in lean mode."
+    assert "Date" not in hourly_data.columns
+    assert hourly_data["Unix"].dtype == "int64"
+    assert hourly_data["Close"].dtype == "float32"
+    assert isinstance(hourly_data["Symbol"].dtype, pd.CategoricalDtype)
+
+    default_data, _ = load_csv_data(str(hourly_file), str(daily_file))
+    assert (hourly_data["Close"].to_numpy() == default_data["Close"].to_numpy(dtype="float32")).all()
+
+    pruned, _ = load_csv_data(str(hourly_file), str(daily_file), lean=True, usecols=["Close", "Date"])
+    assert list(pruned.columns) == ["Unix", "Date", "Close"]
+    assert pruned["Close"].dtype == "float64"
+
+def test_load_csv_data_time_window(tmp_path):
+    """
+    Test the start/end time window of load_csv_data.
+
+    Validates:
+        - Plain CSV, cached and stored loads return exactly the rows inside the window.
+        - Timestamp strings and Unix milliseconds are both accepted as bounds.
+
+    Asserts:
+        - Every loading path returns the same Unix values as slicing the full load.
+    """
+    header = "Unix,Date,Symbol,Open,High,Low,Close,Volume BTC,Volume USDT,tradecount"
+    unix = [1700000000000 + i * 3600000 for i in range(300)]
+    rows = [f"{u},2023-11-14,BTCUSDT,{100 + i},{101 + i},{99 + i},{100.5 + i},1.5,{150 + i},{10 + i}"
+            for i, u in enumerate(unix)][::-1]
+    hourly_file = tmp_path / "Binance_BTCUSDT_1h.csv"
+    hourly_file.write_text("\n".join(["https://www.CryptoDataDownload.com", header] + rows) + "\n")
+
+    start, end = unix[250], unix[280]
+    full, _ = load_csv_data(str(hourly_file), str(hourly_file))
+    expected = sorted(full.loc[(full["Unix"] >= start) & (full["Unix"] <= end), "Unix"].tolist())
+    assert len(expected) == 31
+
+    start_text = pd.to_datetime(start, unit="ms").isoformat()
+    for kwargs in [{}, {"lean": True}, {"cache_dir": str(tmp_path / "cache")}, {"store_dir": str(tmp_path / "store")}]:
+        for _ in range(2):
+            window, _ = load_csv_data(str(hourly_file), str(hourly_file), start=start_text, end=end, **kwargs)
+            assert sorted(window["Unix"].tolist()) == expected, f"Window mismatch for {kwargs}."
+
+
+def test_read_csv_window_edge_cases(tmp_path):
+    """
+    Test windowed reads of files with no rows and of categorical columns split across chunks.
+
+    Validates:
+        - A header-only file returns an empty frame with the file's columns instead of failing.
+        - A window with no rows returns an empty frame.
+        - A categorical column keeps the category dtype when chunks see different category sets.
+
+    Asserts:
+        - Columns, row counts and dtypes of the windowed reads.
+    """
+    header = "Unix,Date,Symbol,Open,High,Low,Close,Volume BTC,Volume USDT,tradecount"
+    empty_file = tmp_path / "Binance_BTCUSDT_1h.csv"
+    empty_file.write_text("https://www.CryptoDataDownload.com\n" + header + "\n")
+    for kwargs in [{}, {"lean": True}]:
+        empty, _ = load_csv_data(str(empty_file), None, start=1700000000000, **kwargs)
+        assert len(empty) == 0 and "Unix" in empty.columns
+
+    rows = [f"{1700000000000 + i * 3600000},2023-11-14,{'BTCUSDT' if i < 4 else 'ETHUSDT'},1,2,0.5,1.5,1.5,150,10"
+            for i in range(8)]
+    mixed_file = tmp_path / "Binance_MIXED_1h.csv"
+    mixed_file.write_text("\n".join(["https://www.CryptoDataDownload.com", header] + rows) + "\n")
+    window = _read_csv_window(str(mixed_file), start=1700000000000, chunksize=3, dtype={"Symbol": "category"})
+    assert len(window) == 8
+    assert isinstance(window["Symbol"].dtype, pd.CategoricalDtype)
+    assert window["Symbol"].tolist() == ["BTCUSDT"] * 4 + ["ETHUSDT"] * 4
+    assert len(_read_csv_window(str(mixed_file), start=1800000000000, chunksize=3)) == 0
+
+
+def test_load_universe(tmp_path):
+    """
+    Test the load_universe function.
+
+    Validates:
+        - Every complete symbol is loaded and merged, in a process pool.
+        - The panel output is indexed by (symbol, time).
+        - Broken or unrecognized files are reported per file instead of printed.
+
+    Asserts:
+        - The loaded symbols, panel index levels and error keys match expectations.
+    """
+    header = "Unix,Date,Symbol,Open,High,Low,Close,Volume BTC,Volume USDT,tradecount"
+
+    def write(path, symbol, step_ms, count):
+        rows = [f"{1700006400000 + i * step_ms},2023-11-15,{symbol},1,2,0.5,1.5,1.0,1.5,3" for i in range(count)][::-1]
+        path.write_text("\n".join(["https://www.CryptoDataDownload.com", header] + rows) + "\n")
+
+    for symbol in ["BTCUSDT", "ETHUSDT"]:
+        write(tmp_path / f"Binance_{symbol}_1h.csv", symbol, 3600000, 72)
+        write(tmp_path / f"Binance_{symbol}_d.csv", symbol, 86400000, 3)
+    write(tmp_path / "Binance_SOLUSDT_1h.csv", "SOLUSDT", 3600000, 72)
+    (tmp_path / "Binance_SOLUSDT_d.csv").write_text("https://www.CryptoDataDownload.com\nUnix,Close\n1,2\n")
+    (tmp_path / "notes.csv").write_text("a,b\n")
+
+    frames, errors = load_universe(str(tmp_path / "*.csv"), workers=2)
+    assert sorted(frames) == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    assert len(frames["BTCUSDT"]) == 72 - 23, "Hourly bars from the first daily close onwards should be kept."
+    assert str(tmp_path / "Binance_SOLUSDT_d.csv") in errors
+    assert str(tmp_path / "notes.csv") in errors
+
+    panel, _ = load_universe(str(tmp_path), workers=1, as_panel=True)
+    assert list(panel.index.names) == ["symbol", "time"]
+    assert set(panel.index.get_level_values("symbol")) == {"BTCUSDT", "ETHUSDT", "SOLUSDT"}
+
+
+def test_merge_and_clean_data_asof():
+    """
+    Test the default as-of merge of merge_and_clean_data.
+
+    Validates:
+        - Every hourly bar after the first daily close is kept (not only exact timestamp matches).
+        - Each hourly bar sees the latest daily bar that closed at or before the hourly close.
+        - The legacy inner join is still available with how="inner".
+
+    Asserts:
+        - Row counts, attached daily values and output order match expectations.
+    """
+    hour, day = 3600000, 86400000
+    start = 1700006400000
+    hourly = pd.DataFrame({"Unix": [start + i * hour for i in range(72)][::-1], "Close": [float(i) for i in range(72)][::-1],
+                           "Symbol": "BTCUSDT"})
+    daily = pd.DataFrame({"Unix": [start + i * day for i in range(3)][::-1], "Close": [100.0, 101.0, 102.0][::-1],
+                          "Symbol": "BTCUSDT"})
+
+    merged = merge_and_clean_data(hourly.copy(), daily.copy())
+    assert len(merged) == 72 - 23
+    assert merged.index.is_monotonic_increasing
+    assert merged["Close_d"].iloc[0] == 100.0, "The 23:00 bar closes with day 0 and should see it."
+    assert merged.loc[merged["Close_1h"] == 47.0, "Close_d"].item() == 101.0
+    assert merged.loc[merged["Close_1h"] == 46.0, "Close_d"].item() == 100.0, "No lookahead into day 1."
+    assert merged["Unix_d"].dtype == "int64"
+    assert "Symbol_1h" not in merged.columns
+
+    inner = merge_and_clean_data(hourly.copy(), daily.copy(), how="inner")
+    assert len(inner) == 3
+
+
+def test_merge_and_clean_data_single_daily_bar():
+    """
+    Test the as-of merge with a single daily bar.
+
+    Validates:
+        - The daily interval falls back to one day when it cannot be inferred, so the merge does not fail.
+        - An explicit interval (timeframe or milliseconds) is used as given.
+
+    Asserts:
+        - The hourly bars from the daily close on carry the single daily bar.
+    """
+    hour, day = 3600000, 86400000
+    start = 1700006400000
+    hourly = pd.DataFrame({"Unix": [start + i * hour for i in range(48)], "Close": [float(i) for i in range(48)]})
+    daily = pd.DataFrame({"Unix": [start], "Close": [100.0]})
+
+    merged = merge_and_clean_data(hourly.copy(), daily.copy())
+    assert len(merged) == 48 - 23
+    assert (merged["Close_d"] == 100.0).all()
+
+    explicit = merge_and_clean_data(hourly.copy(), daily.copy(), hourly_interval="1h", daily_interval=day)
+    pd.testing.assert_frame_equal(explicit, merged)
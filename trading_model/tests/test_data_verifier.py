@@ -8,6 +8,13 @@ Tests:
     - test_check_missing_values: Verifies the function correctly identifies missing values.
     - test_check_column_types: Verifies the function detects mismatched column data types.
     - test_verify_dataset: Verifies comprehensive dataset validation, including missing values and type mismatches.
+    - test_scan_integrity_clean: Verifies clean bars in either time order pass the integrity scan.
+    - test_scan_integrity_reports_rows: Verifies every integrity check reports the offending rows.
+    - test_scan_integrity_duplicate_prefix: Verifies an all-duplicate prefix is counted instead of failing
+      interval inference.
+    - test_quantile_sketch_accuracy: Verifies sketch quantiles stay close to exact ones in bounded memory.
+    - test_streaming_verifier_matches_batch: Verifies chunked and merged partition states match the full-frame checks.
+    - test_streaming_verifier_merge_into_empty: Verifies merging into an empty verifier does not share state.
 
 Fixtures:
     - example_dataframe: Provides a sample pandas DataFrame for testing purposes.
@@ -19,13 +26,17 @@ Usage:
 import sys
 import os
 import pytest
+import numpy as np
 import pandas as pd
 
 # Add the project's root directory to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import the verifier functions
-from src.data_verifier import check_missing_values, check_column_types, verify_dataset
+from src.data_verifier import check_missing_values, check_column_types, verify_dataset, scan_integrity
+from src.data_verifier import QuantileSketch, StreamingVerifier, verify_chunks
+
+HOUR_MS = 3600000
 
 @pytest.fixture
 def example_dataframe():
@@ -104,3 +115,165 @@ def test_verify_dataset(example_dataframe):
     
     # Check for type mismatches
     assert result["type_mismatches"] == [], f"Unexpected type mismatches: {result['type_mismatches']}"
+
+def make_bars(count):
+    """
+    Build consistent hourly bars in ascending time order.
+
+    Args:
+        count (int): Number of bars.
+
+    Returns:
+        pd.DataFrame: Bars with Unix, High, Low, Close and volume columns.
+    """
+    close = 100 + np.arange(count, dtype=float)
+    return pd.DataFrame({
+        "Unix": np.arange(count, dtype=np.int64) * HOUR_MS,
+        "High": close + 1, "Low": close - 1, "Close": close,
+        "Volume BTC": 1.0, "Volume USDT": close,
+    })
+
+def test_scan_integrity_clean():
+    """
+    Test `scan_integrity` on clean bars.
+
+    Asserts:
+        - Ascending and newest-first bars pass with the interval and order inferred.
+        - verify_dataset includes the integrity report when a Unix column is present.
+    """
+    bars = make_bars(50)
+    for frame, ascending in [(bars, True), (bars.iloc[::-1], False)]:
+        report = scan_integrity(frame)
+        assert report["ok"], f"Unexpected issues: {report['counts']}"
+        assert report["ascending"] is ascending and report["interval"] == HOUR_MS
+    assert verify_dataset(bars)["integrity"]["ok"]
+
+def test_scan_integrity_reports_rows():
+    """
+    Test that `scan_integrity` reports offending rows for every check.
+
+    Asserts:
+        - Gaps, duplicates, zero volume and inconsistent prices point at the damaged rows.
+        - A row out of order is reported as non-monotonic, and duplicates/gaps are still found.
+    """
+    bars = make_bars(20)
+    bars = bars.drop(index=[10, 11]).reset_index(drop=True)           # gap after row 9 -> row 10
+    bars.loc[3, "Unix"] = bars.loc[2, "Unix"]                          # duplicate at row 3 (and gap at 4)
+    bars.loc[5, "Volume USDT"] = 0.0
+    bars.loc[6, "High"] = bars.loc[6, "Low"] - 0.5
+    bars.loc[7, "Close"] = bars.loc[7, "High"] + 1
+
+    report = scan_integrity(bars, interval=HOUR_MS)
+    issues = {name: indices.tolist() for name, indices in report["issues"].items()}
+    assert issues == {
+        "non_monotonic": [],
+        "duplicate_unix": [3],
+        "gaps": [4, 10],
+        "zero_volume": [5],
+        "high_below_low": [6],
+        "close_outside_range": [6, 7],
+    }
+    assert report["missing_bars"] == 3 and not report["ok"]
+
+    swapped = make_bars(10)
+    swapped.loc[[4, 5], "Unix"] = swapped.loc[[5, 4], "Unix"].to_numpy()
+    report = scan_integrity(swapped, interval=HOUR_MS, ascending=True)
+    assert report["issues"]["non_monotonic"].tolist() == [5]
+    assert report["counts"]["duplicate_unix"] == 0 and report["counts"]["gaps"] == 0
+
+def test_scan_integrity_duplicate_prefix():
+    """
+    Test `scan_integrity` when the rows used to infer the interval share one timestamp.
+
+    Asserts:
+        - The scan does not fail; the repeated rows are reported as duplicates.
+        - No interval is inferred, so gaps are not counted; an explicit interval still finds them.
+    """
+    unix = np.concatenate([np.zeros(100_001, dtype=np.int64), np.array([HOUR_MS, 3 * HOUR_MS])])
+    bars = pd.DataFrame({"Unix": unix, "Close": 1.0})
+
+    report = scan_integrity(bars)
+    assert report["interval"] is None
+    assert report["counts"]["duplicate_unix"] == 100_000
+    assert report["counts"]["gaps"] == 0 and report["missing_bars"] == 0
+
+    explicit = scan_integrity(bars, interval=HOUR_MS)
+    assert explicit["issues"]["gaps"].tolist() == [100_002] and explicit["missing_bars"] == 1
+
+def test_quantile_sketch_accuracy():
+    """
+    Test the accuracy and size of `QuantileSketch`.
+
+    Asserts:
+        - Sketches updated in chunks and merged keep every input's weight.
+        - Quantiles are within 1% in rank of the exact ones.
+        - The sketch retains only a few hundred values for 200,000 inputs.
+    """
+    values = np.random.default_rng(0).normal(size=200_000)
+    left, right = QuantileSketch(), QuantileSketch()
+    for chunk in np.array_split(values[:120_000], 7):
+        left.update(chunk)
+    right.update(values[120_000:])
+    sketch = left.merge(right)
+
+    assert sketch.count() == len(values)
+    estimates = sketch.quantile([0.01, 0.25, 0.5, 0.75, 0.99])
+    ranks = np.searchsorted(np.sort(values), estimates) / len(values)
+    np.testing.assert_allclose(ranks, [0.01, 0.25, 0.5, 0.75, 0.99], atol=0.01)
+    assert sum(len(items) for items in sketch.levels) < 2000
+
+def test_streaming_verifier_matches_batch():
+    """
+    Test `StreamingVerifier` against whole-frame checks.
+
+    Asserts:
+        - NaN counts match `check_missing_values`; mean, std, min and max match pandas.
+        - Integrity counts include duplicates (and the gaps they leave) on chunk and partition boundaries.
+        - Merging per-partition states in order gives the same summary as one sequential pass.
+    """
+    bars = make_bars(400).drop(index=[100, 101]).reset_index(drop=True).iloc[::-1].reset_index(drop=True)
+    bars.loc[150, "Unix"] = bars.loc[149, "Unix"]                     # duplicate on a partition boundary
+    bars.loc[198, "Unix"] = bars.loc[197, "Unix"]                     # duplicate on a chunk boundary
+    bars.loc[[5, 6], "Close"] = np.nan
+
+    chunks = [bars.iloc[start:start + 99] for start in range(0, len(bars), 99)]
+    report = verify_chunks(chunks)
+    assert report["rows"] == len(bars)
+    assert report["missing_values"] == {"total_missing": 2, "missing_by_column": {"Close": 2}}
+    expected = bars.describe().T
+    for column in ["mean", "std", "min", "max"]:
+        np.testing.assert_allclose(report["statistics"][column], expected.loc[report["statistics"].index, column])
+    integrity = report["integrity"]
+    assert integrity["ascending"] is False and integrity["interval"] == HOUR_MS
+    assert (integrity["gaps"], integrity["missing_bars"], integrity["duplicate_unix"]) == (3, 4, 2)
+
+    partitions = [StreamingVerifier().update(bars.iloc[start:start + 150]) for start in range(0, len(bars), 150)]
+    merged = partitions[0]
+    for partition in partitions[1:]:
+        merged.merge(partition)
+    summary = merged.summary()
+    assert summary["integrity"] == integrity
+    pd.testing.assert_frame_equal(summary["statistics"][["count", "mean", "std", "min", "max"]],
+                                  report["statistics"][["count", "mean", "std", "min", "max"]])
+
+
+def test_streaming_verifier_merge_into_empty():
+    """
+    Test merging a verifier into an empty one.
+
+    Asserts:
+        - The merged verifier summarizes the other's rows.
+        - Updating the merged verifier afterwards leaves the other's summary (quantiles included) unchanged.
+    """
+    bars = make_bars(200)
+    other = StreamingVerifier().update(bars.iloc[:100])
+    before = other.summary()
+
+    merged = StreamingVerifier().merge(other)
+    assert merged.summary()["rows"] == 100
+    merged.update(bars.iloc[100:])
+
+    after = other.summary()
+    assert after["rows"] == 100 and after["integrity"] == before["integrity"]
+    assert after["missing_values"] == before["missing_values"]
+    pd.testing.assert_frame_equal(after["statistics"], before["statistics"])
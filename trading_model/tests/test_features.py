@@ -0,0 +1,64 @@
+"""
+test_features.py
+
+This module contains unit tests for the `features` module, which builds lagged window features
+from strided views.
+
+Tests:
+    - test_lag_window_view_is_zero_copy: Verifies the window view shares memory with its input and orders lags.
+    - test_lag_features_match_shift: Verifies the lag matrix equals `shift(k)` columns, in float32 and chunked.
+
+Usage:
+    Run this script using pytest:
+        pytest test_features.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.features import lag_window_view, build_lag_matrix, build_lag_features
+
+
+def test_lag_window_view_is_zero_copy():
+    """
+    Test `lag_window_view`.
+
+    Asserts:
+        - The view shares memory with the input and has shape (rows - lags + 1, lags, features).
+        - window[i, k] is the row lags - 1 + i - k (lag 0 is the current bar).
+        - Fewer rows than lags raise ValueError.
+    """
+    values = np.arange(20.0).reshape(10, 2)
+    windows = lag_window_view(values, 3)
+    assert np.shares_memory(windows, values)
+    assert windows.shape == (8, 3, 2)
+    np.testing.assert_array_equal(windows[0], values[[2, 1, 0]])
+    np.testing.assert_array_equal(windows[-1, 0], values[-1])
+    with pytest.raises(ValueError):
+        lag_window_view(values, 11)
+
+
+def test_lag_features_match_shift():
+    """
+    Test `build_lag_features` against lag columns built with `shift`.
+
+    Asserts:
+        - Every "<column>_lag<k>" column equals the column shifted by k (returns included), in float32.
+        - The result is indexed from the `lags`-th row and backed by one C-contiguous matrix.
+        - Chunked materialization gives the same matrix.
+    """
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(rng.random((500, 2)) + 1, columns=["Close_1h", "rsi"],
+                        index=pd.date_range("2024-01-01", periods=500, freq="h"))
+    lagged = build_lag_features(data, lags=6)
+
+    source = data.assign(Close_1h_return=data["Close_1h"].pct_change())
+    expected = pd.DataFrame({f"{column}_lag{lag}": source[column].shift(lag)
+                             for lag in range(6) for column in source.columns}).iloc[5:]
+    assert lagged.index.equals(data.index[5:])
+    assert list(lagged.columns) == list(expected.columns)
+    assert (lagged.dtypes == np.float32).all()
+    np.testing.assert_allclose(lagged.to_numpy(), expected.to_numpy(), rtol=1e-6, atol=1e-6)
+    assert lagged.to_numpy().flags.c_contiguous
+
+    values = source.to_numpy()
+    np.testing.assert_array_equal(build_lag_matrix(values, 6, chunk_rows=7), build_lag_matrix(values, 6))
@@ -0,0 +1,154 @@
+"""
+test_hyperparameter_search.py
+
+This module contains unit tests for the `hyperparameter_search` module, which tunes the
+RandomForestClassifier settings.
+
+Tests:
+    - test_grid_and_random_candidates: Verifies grid combinations and distinct random samples.
+    - test_search_resumes_from_cache: Verifies cached results are reused without retraining, and not
+      reused for changed data.
+    - test_search_successive_halving: Verifies halving stages, training fractions and survivors.
+    - test_search_parallel_matches_serial: Verifies memory-mapped worker processes give the serial scores.
+    - test_search_validates_candidates_and_skips_undefined_metrics: Verifies random_state candidates are
+      rejected and single-class folds do not turn fold means into NaN.
+
+Usage:
+    Run this script using pytest:
+        pytest test_hyperparameter_search.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import randint
+import src.hyperparameter_search as hyperparameter_search
+from src.hyperparameter_search import grid_candidates, random_candidates, search
+from src.validation import holdout_split, walk_forward_splits
+
+
+def _dataset(rows=600, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(rows, 4)), columns=["a", "b", "c", "d"])
+    y = (X["a"] + 0.5 * rng.normal(size=rows) > 0).astype(int)
+    return X, y
+
+
+def test_grid_and_random_candidates():
+    """
+    Test `grid_candidates` and `random_candidates`.
+
+    Asserts:
+        - The grid yields every combination once.
+        - Random candidates are distinct, drawn from lists and distributions, and plain Python values.
+        - A space smaller than the requested count yields each candidate once.
+    """
+    grid = grid_candidates({"max_depth": [None, 4], "min_samples_leaf": [1, 5, 10]})
+    assert len(grid) == 6
+    assert {"max_depth": None, "min_samples_leaf": 10} in grid
+
+    sampled = random_candidates({"n_estimators": randint(5, 50), "max_features": ["sqrt", 0.5]}, 8, seed=1)
+    assert len(sampled) == 8
+    assert len({(c["n_estimators"], c["max_features"]) for c in sampled}) == 8
+    assert all(type(c["n_estimators"]) is int and 5 <= c["n_estimators"] < 50 for c in sampled)
+    assert len(random_candidates({"max_depth": [2, 4]}, 5)) == 2
+
+
+def test_search_resumes_from_cache(tmp_path, monkeypatch):
+    """
+    Test that `search` resumes from its result cache.
+
+    Asserts:
+        - A second run with the same data reads every (candidate, fold) from the cache, trains nothing
+          and returns the same scores.
+        - Results are ranked by mean_score and carry the params.
+        - Changed data does not reuse the cached scores.
+    """
+    X, y = _dataset()
+    candidates = grid_candidates({"n_estimators": [5, 10], "max_depth": [2, 4]})
+    folds = walk_forward_splits(len(X), n_splits=2, purge=5)
+    cache_path = tmp_path / "search.jsonl"
+
+    first = search(X, y, candidates, folds, workers=1, cache_path=str(cache_path))
+    assert len(first) == 4 and (first["cached"] == 0).all()
+    assert first["mean_score"].is_monotonic_decreasing
+    assert first["params"].iloc[0]["n_estimators"] == first["param_n_estimators"].iloc[0]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached candidates must not be retrained")
+
+    monkeypatch.setattr(hyperparameter_search, "score_fold", fail)
+    second = search(X, y, candidates, folds, workers=1, cache_path=str(cache_path))
+    assert (second["cached"] == len(folds)).all()
+    pd.testing.assert_series_equal(first["mean_score"], second["mean_score"])
+
+    with pytest.raises(AssertionError):
+        search(X * 2, y, candidates, folds, workers=1, cache_path=str(cache_path))
+
+
+def test_search_successive_halving():
+    """
+    Test `search` with successive halving.
+
+    Asserts:
+        - 9 candidates with factor 3 run stages of 9 and 3 candidates on 1/3 and all training rows.
+        - The candidates of the last stage are the best of the first one.
+        - A hold-out fold works like walk-forward folds.
+    """
+    X, y = _dataset()
+    candidates = grid_candidates({"max_depth": [1, 2, 4], "min_samples_leaf": [1, 10, 50], "n_estimators": [5]})
+    results = search(X, y, candidates, holdout_split(len(X), test_size=0.25), workers=1, halving=True)
+
+    assert results.groupby("stage").size().to_dict() == {0: 9, 1: 3}
+    assert results.groupby("stage")["fraction"].first().tolist() == pytest.approx([1 / 3, 1.0])
+    first_stage = results[results["stage"] == 0]
+    survivors = {repr(params) for params in results.loc[results["stage"] == 1, "params"]}
+    assert survivors == {repr(params) for params in first_stage["params"].iloc[:3]}
+
+    with pytest.raises(ValueError):
+        search(X, y, candidates, holdout_split(len(X)), scoring="f1", workers=1)
+
+
+def test_search_parallel_matches_serial():
+    """
+    Test `search` in worker processes.
+
+    Asserts:
+        - Scores from memory-mapped workers equal the serial run, candidate by candidate.
+    """
+    X, y = _dataset(rows=400)
+    candidates = grid_candidates({"n_estimators": [5], "max_depth": [2, 4]})
+    folds = walk_forward_splits(len(X), n_splits=2)
+
+    serial = search(X, y, candidates, folds, workers=1).sort_values("param_max_depth")
+    parallel = search(X, y, candidates, folds, workers=2).sort_values("param_max_depth")
+    np.testing.assert_allclose(serial["mean_score"], parallel["mean_score"])
+
+
+def test_search_validates_candidates_and_skips_undefined_metrics(monkeypatch):
+    """
+    Test candidate validation and NaN handling of `search`.
+
+    Asserts:
+        - A candidate setting random_state raises ValueError.
+        - With one single-class fold (precision/recall NaN there), mean_precision and mean_recall are
+          the means over the other folds, like mean_score.
+    """
+    X, y = _dataset(rows=300)
+    folds = walk_forward_splits(len(X), n_splits=2, test_size=50)
+    with pytest.raises(ValueError, match="random_state"):
+        search(X, y, [{"max_depth": 2, "random_state": 0}], folds, workers=1)
+
+    score_fold = hyperparameter_search.score_fold
+
+    def single_class_first_fold(fold, *args):
+        result = score_fold(fold, *args)
+        if fold.fold == 0:
+            result.update(precision=np.nan, recall=np.nan)
+        return result
+
+    monkeypatch.setattr(hyperparameter_search, "score_fold", single_class_first_fold)
+    results = search(X, y, [{"n_estimators": 5, "max_depth": 2}], folds, scoring="recall", workers=1)
+    expected = score_fold(folds[1], X.to_numpy(np.float32), y.to_numpy(), list(X.columns), 42,
+                          {"n_estimators": 5, "max_depth": 2})
+    assert results["mean_recall"].iloc[0] == results["mean_score"].iloc[0] == pytest.approx(expected["recall"])
+    assert results["mean_precision"].iloc[0] == pytest.approx(expected["precision"])
@@ -0,0 +1,98 @@
+"""
+test_indicator_registry.py
+
+This module contains unit tests for the `indicator_registry` module, which computes indicators
+requested by name through a dependency graph with shared intermediates and a memo cache.
+
+Tests:
+    - test_registry_matches_batch_indicators: Verifies the default request set equals `add_technical_indicators`.
+    - test_plan_shares_intermediates: Verifies each unique intermediate appears once in the plan.
+    - test_cache_reuses_and_invalidates: Verifies cache hits for unchanged inputs and misses for changed ones.
+
+Usage:
+    Run this script using pytest:
+        pytest test_indicator_registry.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.indicators import add_technical_indicators
+from src.indicator_registry import compute_indicators, plan_indicators, parse_request, IndicatorCache
+
+
+def make_data(count=500, seed=0):
+    """
+    Build a DataFrame with a random-walk 'Close_1h' column.
+
+    Args:
+        count (int): Number of rows.
+        seed (int): Random seed.
+
+    Returns:
+        pd.DataFrame: Hourly close prices.
+    """
+    return pd.DataFrame({"Close_1h": 100 + np.cumsum(np.random.default_rng(seed).normal(size=count))})
+
+
+def test_registry_matches_batch_indicators():
+    """
+    Test that the registry reproduces `add_technical_indicators`.
+
+    Asserts:
+        - The default names with dropna=True give an identical DataFrame.
+        - Explicit parameters ("rsi_14", "macd_12_26") give the same values as the defaults.
+    """
+    expected = add_technical_indicators(make_data())
+    result = compute_indicators(make_data(), ["sma_20", "sma_50", "rsi", "macd", "signal_line"], dropna=True)
+    pd.testing.assert_frame_equal(result, expected)
+
+    explicit = compute_indicators(make_data(), ["rsi_14", "macd_12_26", "rsi", "macd"])
+    np.testing.assert_array_equal(explicit["rsi_14"], explicit["rsi"])
+    np.testing.assert_array_equal(explicit["macd_12_26"], explicit["macd"])
+
+
+def test_plan_shares_intermediates():
+    """
+    Test the planner's dependency graph.
+
+    Asserts:
+        - close_diff is planned once for two RSI periods, and ema_12 once for two MACD variants.
+        - Dependencies come before the indicators that use them.
+        - Unknown names and wrong parameter counts raise errors.
+    """
+    plan, targets, sources = plan_indicators(["rsi_14", "rsi_7", "macd_12_26", "macd_12_30", "signal_line"])
+    assert plan.count(("close_diff", ())) == 1
+    assert plan.count(("ema", (12,))) == 1
+    assert plan.index(("gain", (7,))) < plan.index(("rsi", (7,)))
+    assert plan.index(("macd", (12, 26))) < plan.index(("signal_line", (12, 26, 9)))
+    assert sources[targets["signal_line"]] == frozenset({"close"})
+
+    with pytest.raises(KeyError):
+        parse_request("bollinger_20")
+    with pytest.raises(ValueError):
+        parse_request("macd_12")
+
+
+def test_cache_reuses_and_invalidates():
+    """
+    Test the memo cache across calls.
+
+    Asserts:
+        - A second request sharing indicators with the first is served from the cache.
+        - Cached arrays are read-only, so callers cannot corrupt them through the result.
+        - Changed input values miss the cache.
+    """
+    cache = IndicatorCache()
+    compute_indicators(make_data(), ["sma_20", "macd"], cache=cache)
+    misses = cache.misses
+    result = compute_indicators(make_data(), ["sma_20", "macd", "signal_line"], cache=cache)
+    assert cache.hits == 2 and cache.misses == misses + 1
+    assert all(not values.flags.writeable for values in cache.entries.values())
+
+    result.loc[result.index[-1], "sma_20"] = -1.0
+    again = compute_indicators(make_data(), ["sma_20"], cache=cache)
+    assert again["sma_20"].iloc[-1] != -1.0
+
+    hits = cache.hits
+    compute_indicators(make_data(seed=1), ["sma_20"], cache=cache)
+    assert cache.hits == hits
@@ -9,14 +9,25 @@ Tests:
     - Ensures the DataFrame includes the expected indicator columns.
     - Validates that rows with insufficient data for indicators are dropped.
     - Optionally checks the accuracy of specific indicator calculations.
+    - test_sma_batch_matches_rolling: Verifies batched SMAs equal per-window pandas rolling means.
+    - test_ema_batch_matches_ewm: Verifies batched EMAs equal per-span pandas ewm, with and without NaNs.
+    - test_numpy_backend_matches_pandas: Verifies the numpy backend gives the pandas backend's rows and values.
+    - test_panel_indicators_match_per_symbol: Verifies panel mode equals per-symbol indicators despite different listings.
+    - test_rolling_extrema_match_pandas: Verifies O(n) rolling max/min equal pandas for short and long windows.
+    - test_range_indicators_match_pandas: Verifies Donchian, stochastic, Williams %R and ATR against pandas formulas.
+    - test_volume_indicators_match_pandas: Verifies VWAP, session VWAP, OBV, MFI and average trade size against pandas.
 
 Usage:
     Run this script using pytest:
         pytest test_indicators.py
 """
 import os
+import numpy as np
 import pandas as pd
-from src.indicators import add_technical_indicators
+import pytest
+from src.indicators import add_technical_indicators, sma_batch, ema_batch, add_panel_indicators, add_range_indicators
+from src.indicators import add_volume_indicators, segmented_cumsum
+from src.indicators_numpy import compute_indicator_arrays, allocate_outputs, rolling_max, rolling_min
 
 def test_add_technical_indicators():
     """
@@ -62,3 +73,177 @@ def test_add_technical_indicators():
         sma_20_calculated = data_with_indicators["sma_20"].iloc[-1]
         expected_sma_20 = data["Close_1h"].iloc[-20:].mean()
         assert abs(sma_20_calculated - expected_sma_20) < 1e-6, "SMA_20 is not calculated correctly."
+
+def test_sma_batch_matches_rolling():
+    """
+    Test the `sma_batch` function against pandas rolling means.
+
+    Asserts:
+        - The result has one column per window, and each column matches `rolling(window).mean()`,
+          including NaN warmups, NaN prices and windows longer than the series.
+    """
+    close = 100 + np.cumsum(np.random.default_rng(0).normal(size=1000))
+    close[[300, 301]] = np.nan
+    windows = [1, 5, 20, 50, 200, 2000]
+    result = sma_batch(close, windows)
+    assert result.shape == (len(close), len(windows))
+    for column, window in enumerate(windows):
+        expected = pd.Series(close).rolling(window).mean().to_numpy()
+        np.testing.assert_allclose(result[:, column], expected, rtol=1e-10, atol=1e-9, err_msg=f"window {window}")
+
+def test_ema_batch_matches_ewm():
+    """
+    Test the `ema_batch` function against pandas ewm.
+
+    Asserts:
+        - Each column matches `ewm(span, adjust=False).mean()` for clean prices and for prices with NaNs.
+    """
+    close = 100 + np.cumsum(np.random.default_rng(1).normal(size=1000))
+    spans = [5, 12, 26, 100]
+    for prices in (close, np.where(np.arange(len(close)) == 400, np.nan, close)):
+        result = ema_batch(prices, spans)
+        for column, span in enumerate(spans):
+            expected = pd.Series(prices).ewm(span=span, adjust=False).mean().to_numpy()
+            np.testing.assert_allclose(result[:, column], expected, rtol=1e-10, err_msg=f"span {span}")
+
+def test_numpy_backend_matches_pandas():
+    """
+    Test the numpy backend of `add_technical_indicators` against the pandas backend.
+
+    Asserts:
+        - Both backends keep the same rows (including flat stretches where RSI is undefined).
+        - Indicator values match; float32 input stays float32 within float32 tolerance.
+        - Preallocated buffers are filled in place; an unknown backend raises ValueError.
+    """
+    close = 100 + np.cumsum(np.random.default_rng(2).normal(size=3000))
+    close[1000:1030] = close[999]
+    expected = add_technical_indicators(pd.DataFrame({"Close_1h": close}))
+    result = add_technical_indicators(pd.DataFrame({"Close_1h": close}), backend="numpy")
+    assert result.index.equals(expected.index)
+    pd.testing.assert_frame_equal(result, expected, rtol=1e-9)
+
+    result32 = add_technical_indicators(pd.DataFrame({"Close_1h": close.astype(np.float32)}), backend="numpy")
+    assert result32.index.equals(expected.index)
+    assert (result32.dtypes == np.float32).all()
+    np.testing.assert_allclose(result32["macd"], expected["macd"], atol=1e-3)
+
+    buffers = allocate_outputs(len(close))
+    arrays = compute_indicator_arrays(close, out=buffers)
+    assert all(arrays[column] is buffers[column] for column in buffers)
+
+    with pytest.raises(ValueError):
+        add_technical_indicators(pd.DataFrame({"Close_1h": close}), backend="polars")
+
+def test_panel_indicators_match_per_symbol():
+    """
+    Test `add_panel_indicators` against `add_technical_indicators` run per symbol.
+
+    Asserts:
+        - The long output holds, per symbol, the same rows and values as the per-symbol path,
+          for symbols listed at different times (leading NaNs).
+        - A symbol with too little history contributes no rows.
+        - The panel output keeps every row with (field, symbol) columns.
+    """
+    rows = 400
+    index = pd.date_range("2024-01-01", periods=rows, freq="h", name="time")
+    matrix = 100 + np.cumsum(np.random.default_rng(3).normal(size=(rows, 4)), axis=0)
+    matrix[:120, 1] = np.nan
+    matrix[:300, 2] = np.nan
+    matrix[:380, 3] = np.nan
+    closes = pd.DataFrame(matrix, index=index, columns=["AAA", "BBB", "CCC", "DDD"])
+
+    long = add_panel_indicators(closes)
+    assert list(long.index.names) == ["symbol", "time"]
+    assert "DDD" not in long.index.get_level_values("symbol")
+    for symbol in ["AAA", "BBB", "CCC"]:
+        expected = add_technical_indicators(closes[[symbol]].dropna().rename(columns={symbol: "Close_1h"}))
+        result = long.loc[symbol]
+        assert result.index.equals(expected.index), f"Rows differ for {symbol}."
+        np.testing.assert_allclose(result.to_numpy(), expected[result.columns].to_numpy(), rtol=1e-9, atol=1e-9)
+
+    panel = add_panel_indicators(closes, output="panel")
+    assert panel.shape == (rows, 6 * 4)
+    assert panel[("rsi", "CCC")].isna().sum() == 300 + 14
+
+def test_rolling_extrema_match_pandas():
+    """
+    Test `rolling_max` and `rolling_min` against pandas rolling max/min.
+
+    Asserts:
+        - Results are identical for windows from 1 to longer than the series, with NaNs in the data.
+        - 2-D inputs are processed per column.
+    """
+    values = np.random.default_rng(4).normal(size=(300, 2))
+    values[[10, 150], 0] = np.nan
+    frame = pd.DataFrame(values)
+    for window in [1, 2, 3, 7, 64, 299, 300, 301]:
+        np.testing.assert_array_equal(rolling_max(values[:, 0], window), frame[0].rolling(window).max().to_numpy())
+        np.testing.assert_array_equal(rolling_min(values, window), frame.rolling(window).min().to_numpy())
+
+def test_range_indicators_match_pandas():
+    """
+    Test `add_range_indicators` against the textbook formulas written with pandas.
+
+    Asserts:
+        - Donchian channels, %K, %D, Williams %R and ATR (Wilder's smoothing) match the references.
+        - The 19 warmup rows of the 20-bar Donchian channels are dropped.
+    """
+    rng = np.random.default_rng(5)
+    close = pd.Series(100 + np.cumsum(rng.normal(size=400)))
+    data = pd.DataFrame({"High_1h": close + rng.random(400), "Low_1h": close - rng.random(400), "Close_1h": close})
+    result = add_range_indicators(data.copy())
+    assert len(result) == 400 - 19
+
+    high, low = data["High_1h"], data["Low_1h"]
+    highest, lowest = high.rolling(14).max(), low.rolling(14).min()
+    stoch_k = 100 * (close - lowest) / (highest - lowest)
+    previous = close.shift()
+    true_range = pd.concat([high - low, (high - previous).abs(), (low - previous).abs()], axis=1).max(axis=1)
+    expected = pd.DataFrame({
+        "donchian_upper": high.rolling(20).max(),
+        "donchian_lower": low.rolling(20).min(),
+        "stoch_k": stoch_k,
+        "stoch_d": stoch_k.rolling(3).mean(),
+        "williams_r": -100 * (highest - close) / (highest - lowest),
+        "atr": true_range.ewm(alpha=1 / 14, adjust=False).mean(),
+    }).loc[result.index]
+    np.testing.assert_allclose(result[expected.columns].to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
+
+def test_volume_indicators_match_pandas():
+    """
+    Test `add_volume_indicators` against pandas rolling sums and groupby cumulative sums.
+
+    Asserts:
+        - `segmented_cumsum` restarts at every segment start.
+        - Rolling VWAP, daily session VWAP (reset at 00:00 UTC), OBV, MFI and average trade size
+          match the pandas references.
+    """
+    np.testing.assert_array_equal(segmented_cumsum(np.arange(1.0, 7.0), np.array([0, 2, 5])),
+                                  [1, 3, 3, 7, 12, 6])
+
+    rows = 200
+    rng = np.random.default_rng(6)
+    close = 100 + np.cumsum(rng.normal(size=rows))
+    index = pd.date_range("2024-01-01 05:00", periods=rows, freq="h", name="time")
+    data = pd.DataFrame({
+        "High_1h": close + rng.random(rows), "Low_1h": close - rng.random(rows), "Close_1h": close,
+        "Volume BTC_1h": rng.random(rows) * 10, "tradecount_1h": rng.integers(1, 500, rows),
+    }, index=index)
+    result = add_volume_indicators(data.copy())
+
+    typical = (data["High_1h"] + data["Low_1h"] + data["Close_1h"]) / 3
+    volume = data["Volume BTC_1h"]
+    flow = typical * volume
+    day = data.index.floor("D")
+    change = typical.diff()
+    positive = flow.where(change > 0, 0).where(change.notna()).rolling(14).sum()
+    negative = flow.where(change < 0, 0).where(change.notna()).rolling(14).sum()
+    expected = pd.DataFrame({
+        "vwap": flow.rolling(24).sum() / volume.rolling(24).sum(),
+        "session_vwap": flow.groupby(day).cumsum() / volume.groupby(day).cumsum(),
+        "obv": (np.sign(data["Close_1h"].diff()).fillna(0) * volume).cumsum(),
+        "mfi": 100 - 100 / (1 + positive / negative),
+        "avg_trade_size": volume / data["tradecount_1h"],
+    }).loc[result.index]
+    assert len(result) == rows - 23
+    np.testing.assert_allclose(result[expected.columns].to_numpy(), expected.to_numpy(), rtol=1e-9)
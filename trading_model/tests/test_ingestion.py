@@ -0,0 +1,195 @@
+"""
+test_ingestion.py
+
+This module contains unit tests for the `ingestion` module, which incrementally ingests
+CSV exports into a persistent binary store.
+
+Tests:
+    - test_parse_symbol_timeframe: Verifies symbol/timeframe inference from export file names.
+    - test_ingest_newest_first_export: Verifies incremental ingestion of newest-first exports.
+    - test_ingest_oldest_first_export: Verifies incremental ingestion of exports appended at the end.
+    - test_append_rejects_lossy_values: Verifies appends raise instead of truncating values to the store dtypes.
+    - test_header_only_first_ingest: Verifies an export without rows creates no store entry.
+    - test_load_csv_data_with_store: Verifies `load_csv_data` can serve data from the store.
+
+Usage:
+    Run this script using pytest:
+        pytest test_ingestion.py
+"""
+import io
+
+import pandas as pd
+import pytest
+from src.ingestion import (STRING_WIDTH, parse_symbol_timeframe, ingest_csv, append_frame, store_entry_dir,
+                           read_store, read_store_state)
+from src.data_pipeline import load_csv_data
+
+HEADER = "Unix,Date,Symbol,Open,High,Low,Close,Volume BTC,Volume USDT,tradecount"
+HOUR_MS = 3600000
+
+
+def make_lines(start, stop):
+    """
+    Build hourly CSV data lines for bar indices in [start, stop), oldest first.
+
+    Args:
+        start (int): First bar index.
+        stop (int): One past the last bar index.
+
+    Returns:
+        list: CSV data lines.
+    """
+    lines = []
+    for i in range(start, stop):
+        unix = 1700000000000 + i * HOUR_MS
+        date = pd.to_datetime(unix, unit="ms").strftime("%Y-%m-%d %H:%M:%S")
+        price = 100.0 + i
+        lines.append(f"{unix},{date},BTCUSDT,{price},{price + 1},{price - 1},{price + 0.5},1.5,{price * 1.5},{10 + i}")
+    return lines
+
+
+def write_csv(path, lines):
+    """
+    Write CSV data lines below the CryptoDataDownload source line and header.
+
+    Args:
+        path (str): Destination path.
+        lines (list): CSV data lines in file order.
+    """
+    with open(path, "w") as handle:
+        handle.write("\n".join(["https://www.CryptoDataDownload.com", HEADER] + lines) + "\n")
+
+
+def test_parse_symbol_timeframe():
+    """
+    Test the `parse_symbol_timeframe` function.
+
+    Asserts:
+        - Symbol and timeframe are parsed from CryptoDataDownload file names.
+        - Unrecognized file names raise ValueError.
+    """
+    assert parse_symbol_timeframe("data/Binance_BTCUSDT_1h.csv") == ("BTCUSDT", "1h")
+    assert parse_symbol_timeframe("Binance_ETHUSDT_d.csv") == ("ETHUSDT", "d")
+    with pytest.raises(ValueError):
+        parse_symbol_timeframe("prices.csv")
+
+
+def test_ingest_newest_first_export(tmp_path):
+    """
+    Test incremental ingestion of a newest-first export (new rows inserted below the header).
+
+    Asserts:
+        - The first ingest stores the full history in ascending order.
+        - A refresh appends only the new rows and updates the last ingested Unix value.
+        - Historical rows are not re-parsed (a corrupted old row does not break the refresh).
+    """
+    csv_file = str(tmp_path / "Binance_BTCUSDT_1h.csv")
+    store_dir = str(tmp_path / "store")
+    write_csv(csv_file, make_lines(0, 10)[::-1])
+
+    history = ingest_csv(csv_file, store_dir)
+    assert len(history) == 10
+    assert history["Unix"].is_monotonic_increasing
+
+    lines = make_lines(0, 13)[::-1]
+    lines[-1] = "garbage,row,that,would,fail,validation,,,,"
+    write_csv(csv_file, lines)
+    history = ingest_csv(csv_file, store_dir)
+
+    expected = pd.read_csv(csv_file, skiprows=1).iloc[:-1].iloc[::-1]
+    assert len(history) == 13
+    assert history["Unix"].tolist() == sorted(history["Unix"].tolist())
+    assert history["Close"].tolist()[-3:] == expected["Close"].astype(float).tolist()[-3:]
+    assert history["Date"].iloc[-1] == expected["Date"].iloc[-1]
+    state = read_store_state(store_entry_dir(store_dir, "BTCUSDT", "1h"))
+    assert state["last_unix"] == int(history["Unix"].iloc[-1])
+
+
+def test_ingest_oldest_first_export(tmp_path):
+    """
+    Test incremental ingestion of an export that grows at the end of the file.
+
+    Asserts:
+        - New rows appended to the file are ingested, and re-ingesting without changes is a no-op.
+    """
+    csv_file = str(tmp_path / "Binance_BTCUSDT_1h.csv")
+    store_dir = str(tmp_path / "store")
+    write_csv(csv_file, make_lines(0, 50))
+    ingest_csv(csv_file, store_dir)
+
+    write_csv(csv_file, make_lines(0, 55))
+    history = ingest_csv(csv_file, store_dir)
+    assert len(history) == 55
+    assert history["tradecount"].tolist() == [10 + i for i in range(55)]
+
+    history = ingest_csv(csv_file, store_dir)
+    assert len(history) == 55, "Re-ingesting an unchanged file should not add rows."
+
+
+def test_append_rejects_lossy_values(tmp_path):
+    """
+    Test that appends never truncate values to the store dtypes fixed by the first ingest.
+
+    Asserts:
+        - A fractional value in an integer column and text longer than STRING_WIDTH UTF-8 bytes raise
+          ValueError and leave the stored history unchanged.
+        - Values that convert exactly (integral floats in an integer column) are accepted.
+    """
+    store_dir = str(tmp_path / "store")
+    frame = pd.read_csv(io.StringIO("\n".join([HEADER] + make_lines(0, 5))))
+    assert append_frame(frame, store_dir, "BTCUSDT", "1h") == 5
+    entry_dir = store_entry_dir(store_dir, "BTCUSDT", "1h")
+
+    fractional = pd.read_csv(io.StringIO("\n".join([HEADER] + make_lines(5, 7))))
+    fractional["tradecount"] = [15.5, 16.0]
+    long_symbol = pd.read_csv(io.StringIO("\n".join([HEADER] + make_lines(5, 7))))
+    long_symbol["Symbol"] = "\u00e9" * (STRING_WIDTH // 2 + 1)
+    for bad in (fractional, long_symbol):
+        with pytest.raises(ValueError):
+            append_frame(bad, store_dir, "BTCUSDT", "1h")
+        assert read_store_state(entry_dir)["rows"] == 5
+        assert len(read_store(entry_dir)) == 5
+
+    integral = fractional.assign(tradecount=[15.0, 16.0])
+    assert append_frame(integral, store_dir, "BTCUSDT", "1h") == 2
+    assert read_store(entry_dir)["tradecount"].tolist()[-2:] == [15, 16]
+
+
+def test_header_only_first_ingest(tmp_path):
+    """
+    Test a first ingest of an export that only holds the header.
+
+    Asserts:
+        - It returns an empty frame with the required columns and writes no store entry (no dtypes).
+        - A later ingest with rows creates the entry with numeric dtypes and appends every row.
+    """
+    csv_file = str(tmp_path / "Binance_BTCUSDT_1h.csv")
+    store_dir = str(tmp_path / "store")
+    entry_dir = store_entry_dir(store_dir, "BTCUSDT", "1h")
+    write_csv(csv_file, [])
+
+    history = ingest_csv(csv_file, store_dir)
+    assert history.empty and list(history.columns) == HEADER.split(",")
+    assert read_store_state(entry_dir) is None
+
+    write_csv(csv_file, make_lines(0, 3)[::-1])
+    history = ingest_csv(csv_file, store_dir)
+    assert len(history) == 3 and history["Close"].dtype.kind == "f" and history["Unix"].dtype.kind == "i"
+
+
+def test_load_csv_data_with_store(tmp_path):
+    """
+    Test `load_csv_data` with a store directory.
+
+    Asserts:
+        - Both frames contain all required columns and the full history.
+    """
+    hourly_file = str(tmp_path / "Binance_BTCUSDT_1h.csv")
+    daily_file = str(tmp_path / "Binance_BTCUSDT_d.csv")
+    write_csv(hourly_file, make_lines(0, 24)[::-1])
+    write_csv(daily_file, make_lines(0, 3)[::-1])
+
+    hourly_data, daily_data = load_csv_data(hourly_file, daily_file, store_dir=str(tmp_path / "store"))
+    expected_columns = HEADER.split(",")
+    assert list(hourly_data.columns) == expected_columns
+    assert len(hourly_data) == 24 and len(daily_data) == 3
@@ -0,0 +1,145 @@
+"""
+test_model_store.py
+
+This module contains unit tests for the `model_store` module, which saves, loads and hot-swaps
+trained models.
+
+Tests:
+    - test_save_and_load_model: Verifies a round trip keeps predictions, columns, normalizer and metadata.
+    - test_model_cache_and_find_model: Verifies LRU reuse and lookup by training data fingerprint.
+    - test_live_model_hot_swap: Verifies a live handle switches to a newly promoted version and rolls back.
+    - test_live_model_keeps_serving_on_failed_load: Verifies a broken promoted version does not
+      interrupt predictions.
+
+Usage:
+    Run this script using pytest:
+        pytest test_model_store.py
+"""
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_normalize import Normalizer
+from src.model_store import (MODEL_FILE, ModelCache, LiveModel, find_model, latest_version, list_versions, load_model,
+                             predict, promote_model, save_model)
+from src.models import train_model
+
+
+def _train(seed=0, rows=300, **params):
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame(rng.normal(10, 3, size=(rows, 3)), columns=["a", "b", "c"])
+    y = (data["a"] > 10).astype(int)
+    normalizer = Normalizer("zscore", ["a", "b", "c"]).fit(data)
+    X = normalizer.transform(data)[["c", "a"]]
+    return train_model(X, y, n_estimators=10, **params), data, normalizer
+
+
+def test_save_and_load_model(tmp_path):
+    """
+    Test `save_model` and `load_model`.
+
+    Asserts:
+        - Versions are numbered from 1 and the latest save is promoted.
+        - The memory-mapped and fully read loads predict like the trained model, on raw data, with the
+          stored column order and normalizer.
+        - Metadata keeps the fingerprint and metrics; a missing version raises FileNotFoundError.
+    """
+    model, data, normalizer = _train()
+    expected = model.predict(normalizer.transform(data)[["c", "a"]])
+
+    assert save_model(model, tmp_path, "forest", ["c", "a"], normalizer, "abc", {"accuracy": 0.5}) == 1
+    assert list_versions(tmp_path, "forest") == [1] and latest_version(tmp_path, "forest") == 1
+
+    for mmap_mode in ("r", None):
+        artifact = load_model(tmp_path, "forest", mmap_mode=mmap_mode, cache=None)
+        assert artifact.version == 1 and artifact.columns == ["c", "a"]
+        assert artifact.metadata["fingerprint"] == "abc" and artifact.metadata["metrics"] == {"accuracy": 0.5}
+        np.testing.assert_array_equal(predict(artifact, data), expected)
+
+    with pytest.raises(FileNotFoundError):
+        load_model(tmp_path, "forest", version=2, cache=None)
+    with pytest.raises(FileNotFoundError):
+        load_model(tmp_path, "missing", cache=None)
+
+
+def test_model_cache_and_find_model(tmp_path):
+    """
+    Test `ModelCache` and `find_model`.
+
+    Asserts:
+        - A second load of the same version is a cache hit returning the same object.
+        - The least recently used model is evicted beyond maxsize.
+        - find_model returns the version trained on the given fingerprint (and columns), else None.
+    """
+    model, _, normalizer = _train()
+    save_model(model, tmp_path, "forest", ["c", "a"], normalizer, fingerprint="first")
+    save_model(model, tmp_path, "forest", ["c", "a"], normalizer, fingerprint="second")
+
+    cache = ModelCache(maxsize=1)
+    first = load_model(tmp_path, "forest", 1, cache=cache)
+    assert load_model(tmp_path, "forest", 1, cache=cache) is first and cache.hits == 1
+    load_model(tmp_path, "forest", 2, cache=cache)
+    assert load_model(tmp_path, "forest", 1, cache=cache) is not first
+
+    assert find_model(tmp_path, "forest", "first", cache=None).version == 1
+    assert find_model(tmp_path, "forest", "second", columns=["c", "a"], cache=None).version == 2
+    assert find_model(tmp_path, "forest", "second", columns=["a", "c"], cache=None) is None
+    assert find_model(tmp_path, "forest", "other", cache=None) is None
+
+
+def test_live_model_hot_swap(tmp_path):
+    """
+    Test `LiveModel`.
+
+    Asserts:
+        - The handle serves the promoted version and swaps to a newly promoted one on refresh.
+        - An unpromoted save does not swap; promote_model rolls back to an older version.
+        - Without a promoted version it raises FileNotFoundError.
+    """
+    with pytest.raises(FileNotFoundError):
+        LiveModel(tmp_path, "forest")
+
+    model, data, normalizer = _train()
+    save_model(model, tmp_path, "forest", ["c", "a"], normalizer)
+    live = LiveModel(tmp_path, "forest", check_interval=0)
+    assert live.version == 1 and len(live.predict(data)) == len(data)
+
+    shallow, _, _ = _train(seed=1, max_depth=1)
+    save_model(shallow, tmp_path, "forest", ["c", "a"], normalizer, promote=False)
+    live.predict(data)
+    assert live.version == 1
+
+    promote_model(tmp_path, "forest", 2)
+    live.predict(data)
+    assert live.version == 2 and live.current().model.estimators_[0].get_depth() == 1
+    assert not live.refresh()
+
+    promote_model(tmp_path, "forest", 1)
+    assert live.refresh() and live.version == 1
+
+
+def test_live_model_keeps_serving_on_failed_load(tmp_path, caplog):
+    """
+    Test `LiveModel` when a promoted version cannot be loaded.
+
+    Asserts:
+        - Predictions continue with the current version and the failure is logged.
+        - Once the version is repaired, the next check swaps to it.
+    """
+    model, data, normalizer = _train()
+    save_model(model, tmp_path, "forest", ["c", "a"], normalizer)
+    live = LiveModel(tmp_path, "forest", check_interval=0, cache=None)
+    expected = live.predict(data)
+
+    save_model(model, tmp_path, "forest", ["c", "a"], normalizer)
+    model_path = os.path.join(tmp_path, "forest", "v0002", MODEL_FILE)
+    os.rename(model_path, model_path + ".bak")
+    with caplog.at_level(logging.ERROR, logger="src.model_store"):
+        np.testing.assert_array_equal(live.predict(data), expected)
+    assert live.version == 1 and "keeping version 1" in caplog.text
+
+    os.rename(model_path + ".bak", model_path)
+    live.predict(data)
+    assert live.version == 2
@@ -6,6 +6,7 @@ for preparing data, training, and evaluating machine learning models.
 
 Tests:
     - test_prepare_features_and_target: Validates feature and target preparation.
+    - test_prepare_lagged_features: Validates lagged features stay aligned with the target.
     - test_split_data: Ensures correct splitting of data into training and testing sets.
     - test_train_model: Verifies the training of a Random Forest Classifier.
     - test_evaluate_model: Checks the evaluation metrics generated by the model.
@@ -15,6 +16,7 @@ Usage:
         pytest test_models.py
 """
 import os
+import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from src.models import prepare_features_and_target, split_data, train_model, evaluate_model
@@ -44,6 +46,28 @@ def test_prepare_features_and_target():
     assert len(y) == len(data), "Target (y) length should match input data length."
     assert X.shape[1] == len(data.columns) - 1, "Feature set (X) should exclude the target column."
 
+def test_prepare_lagged_features():
+    """
+    Test `prepare_features_and_target` with `lags`.
+
+    Asserts:
+        - Rows with an incomplete window (the first return) are dropped from X and y alike.
+        - Each row's lag-0 close equals the close of the row the target belongs to.
+        - The target column is not lagged into the features.
+    """
+    data = pd.DataFrame({
+        "Close_1h": np.linspace(100, 120, 50),
+        "rsi": np.linspace(30, 70, 50),
+        "target": np.arange(50) % 2,
+    })
+    X, y = prepare_features_and_target(data, "target", lags=4)
+
+    assert len(X) == len(y) == 50 - 4
+    assert X.index.equals(y.index)
+    np.testing.assert_allclose(X["Close_1h_lag0"], data.loc[y.index, "Close_1h"], rtol=1e-6)
+    assert not any(column.startswith("target") for column in X.columns)
+    assert not np.isnan(X.to_numpy()).any()
+
 def test_split_data():
     """
     Test the `split_data` function.
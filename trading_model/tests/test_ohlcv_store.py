@@ -0,0 +1,123 @@
+"""
+test_ohlcv_store.py
+
+This module contains unit tests for the `ohlcv_store` module, which provides memory-mapped,
+zero-copy access to the binary OHLCV store.
+
+Tests:
+    - test_store_range_and_views: Verifies binary-search windows and zero-copy column views.
+    - test_store_pickles_by_path: Verifies a store is pickled as its location, not its data.
+    - test_store_frames_feed_pipeline: Verifies store frames run through the pipeline functions.
+
+Usage:
+    Run this script using pytest:
+        pytest test_ohlcv_store.py
+"""
+import pickle
+import numpy as np
+import pandas as pd
+from src.ingestion import append_frame
+from src.ohlcv_store import OHLCVStore
+from src.data_pipeline import merge_and_clean_data
+from src.indicators import add_technical_indicators
+from src.backtesting import simulate_trading
+
+HOUR_MS = 3600000
+
+
+def make_bars(count, step_ms, start=1700006400000):
+    """
+    Build a DataFrame of synthetic bars with the required OHLCV columns.
+
+    Args:
+        count (int): Number of bars.
+        step_ms (int): Bar interval in milliseconds.
+        start (int): Unix time of the first bar in milliseconds.
+
+    Returns:
+        pd.DataFrame: Bars in ascending time order.
+    """
+    unix = start + np.arange(count, dtype=np.int64) * step_ms
+    close = 100 + np.sin(np.arange(count) / 5.0) * 5 + np.arange(count) * 0.1
+    return pd.DataFrame({
+        "Unix": unix,
+        "Date": pd.to_datetime(unix, unit="ms").strftime("%Y-%m-%d %H:%M:%S"),
+        "Symbol": "BTCUSDT",
+        "Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+        "Volume BTC": 1.0, "Volume USDT": close, "tradecount": 10,
+    })
+
+
+def test_store_range_and_views(tmp_path):
+    """
+    Test windows and zero-copy views of an OHLCVStore.
+
+    Asserts:
+        - A time window returns exactly the matching rows.
+        - Returned arrays and DataFrame columns share memory with the mapped files.
+        - refresh picks up appended rows.
+    """
+    bars = make_bars(500, HOUR_MS)
+    append_frame(bars.iloc[:400], str(tmp_path), "BTCUSDT", "1h")
+    store = OHLCVStore.open(str(tmp_path), "BTCUSDT", "1h")
+    assert len(store) == 400
+
+    start, end = int(bars["Unix"].iloc[100]), int(bars["Unix"].iloc[149])
+    arrays = store.arrays(start, end)
+    assert arrays["Unix"].tolist() == bars["Unix"].iloc[100:150].tolist()
+    assert np.shares_memory(arrays["Close"], store.arrays()["Close"])
+
+    frame = store.frame(start, end, suffix="_1h", time_index=True)
+    assert np.shares_memory(frame["Close_1h"].to_numpy(), store.arrays()["Close"])
+    assert frame.index[0] == pd.Timestamp(start, unit="ms")
+    assert store.frame(columns=["Symbol"])["Symbol"].iloc[0] == "BTCUSDT"
+
+    append_frame(bars.iloc[400:], str(tmp_path), "BTCUSDT", "1h")
+    store.refresh()
+    assert len(store) == 500
+
+
+def test_store_pickles_by_path(tmp_path):
+    """
+    Test that pickling a store sends its location rather than its data.
+
+    Asserts:
+        - The pickled store is small and the unpickled store maps the same rows.
+    """
+    append_frame(make_bars(20000, HOUR_MS), str(tmp_path), "BTCUSDT", "1h")
+    store = OHLCVStore.open(str(tmp_path), "BTCUSDT", "1h")
+    payload = pickle.dumps(store)
+    assert len(payload) < 1000, "A pickled store should not contain the mapped data."
+    restored = pickle.loads(payload)
+    assert len(restored) == len(store)
+    assert restored.unix[-1] == store.unix[-1]
+
+
+def test_store_frames_feed_pipeline(tmp_path):
+    """
+    Test merge_and_clean_data, add_technical_indicators and simulate_trading on store frames.
+
+    Asserts:
+        - Merging store frames succeeds.
+        - Indicators are computed from a zero-copy close column.
+        - The backtest result shares its price column with the store.
+    """
+    append_frame(make_bars(24 * 10, HOUR_MS), str(tmp_path), "BTCUSDT", "1h")
+    append_frame(make_bars(10, 24 * HOUR_MS), str(tmp_path), "BTCUSDT", "d")
+    hourly = OHLCVStore.open(str(tmp_path), "BTCUSDT", "1h")
+    daily = OHLCVStore.open(str(tmp_path), "BTCUSDT", "d")
+
+    merged = merge_and_clean_data(hourly.frame(), daily.frame())
+    assert "Close_d" in merged.columns and not merged.empty
+
+    data = add_technical_indicators(hourly.frame(columns=["Close"], suffix="_1h"))
+    assert not data.isnull().values.any()
+
+    class AlwaysBuy:
+        def predict(self, X):
+            return np.ones(len(X), dtype=int)
+
+    frame = hourly.frame(columns=["Close"], suffix="_1h")
+    metrics, results = simulate_trading(frame, AlwaysBuy())
+    assert np.shares_memory(results["Close_1h"].to_numpy(), hourly.arrays()["Close"])
+    assert "final_balance" in metrics
@@ -0,0 +1,117 @@
+"""
+test_resampling.py
+
+This module contains unit tests for the `resampling` module, which derives higher-timeframe
+OHLCV bars from hourly bars.
+
+Tests:
+    - test_resample_matches_pandas: Verifies 4h, daily and weekly bars against pandas resampling.
+    - test_resample_drop_partial: Verifies the incomplete last bucket can be dropped.
+    - test_streaming_resampler_matches_batch: Verifies streaming updates reproduce the batch result.
+
+Usage:
+    Run this script using pytest:
+        pytest test_resampling.py
+"""
+import numpy as np
+import pandas as pd
+from src.resampling import resample_ohlcv, StreamingResampler, OHLCV_COLUMNS
+
+HOUR_MS = 3600000
+
+
+def make_hourly(count, start=1700006400000 + 5 * HOUR_MS, seed=0):
+    """
+    Build synthetic hourly bars (newest first, as in the exchange exports).
+
+    Args:
+        count (int): Number of bars.
+        start (int): Open time of the first bar in milliseconds.
+        seed (int): Random seed.
+
+    Returns:
+        pd.DataFrame: Hourly bars with the required OHLCV columns.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, count))
+    open_ = close + rng.normal(0, 0.5, count)
+    return pd.DataFrame({
+        "Unix": start + np.arange(count, dtype=np.int64) * HOUR_MS,
+        "Symbol": "BTCUSDT",
+        "Open": open_,
+        "High": np.maximum(open_, close) + rng.random(count),
+        "Low": np.minimum(open_, close) - rng.random(count),
+        "Close": close,
+        "Volume BTC": rng.random(count),
+        "Volume USDT": rng.random(count) * 100,
+        "tradecount": rng.integers(1, 100, count),
+    }).iloc[::-1]
+
+
+def pandas_reference(hourly, rule):
+    """
+    Resample with pandas as a reference implementation.
+
+    Args:
+        hourly (pd.DataFrame): Hourly bars.
+        rule (str): pandas resample rule.
+
+    Returns:
+        pd.DataFrame: Reference bars with a Unix column.
+    """
+    frame = hourly.set_index(pd.to_datetime(hourly["Unix"], unit="ms")).sort_index()
+    agg = {"Open": "first", "High": "max", "Low": "min", "Close": "last",
+           "Volume BTC": "sum", "Volume USDT": "sum", "tradecount": "sum"}
+    reference = frame.resample(rule, label="left", closed="left").agg(agg).dropna()
+    reference.insert(0, "Unix", reference.index.as_unit("ms").asi8)
+    return reference.reset_index(drop=True)
+
+
+def test_resample_matches_pandas():
+    """
+    Test `resample_ohlcv` against pandas resampling.
+
+    Asserts:
+        - 4h, daily and weekly (Monday-aligned) bars match pandas for every OHLCV column.
+    """
+    hourly = make_hourly(24 * 30)
+    for timeframe, rule in [("4h", "4h"), ("1d", "1D"), ("1w", "W-MON")]:
+        resampled = resample_ohlcv(hourly, timeframe)
+        reference = pandas_reference(hourly, rule)
+        assert resampled["Unix"].tolist() == reference["Unix"].tolist(), f"Bucket mismatch for {timeframe}."
+        for column in OHLCV_COLUMNS:
+            np.testing.assert_allclose(resampled[column].to_numpy(dtype=float),
+                                       reference[column].to_numpy(dtype=float), err_msg=f"{timeframe} {column}")
+    assert (resample_ohlcv(hourly, "1w")["Unix"].pipe(pd.to_datetime, unit="ms").dt.dayofweek == 0).all()
+
+
+def test_resample_drop_partial():
+    """
+    Test the `drop_partial` option of `resample_ohlcv`.
+
+    Asserts:
+        - The last daily bar is kept by default and dropped when its day is not complete.
+    """
+    hourly = make_hourly(24 * 3, start=1700006400000)
+    assert len(resample_ohlcv(hourly, "d", drop_partial=True)) == 3
+    assert len(resample_ohlcv(hourly.iloc[1:], "d")) == 3
+    assert len(resample_ohlcv(hourly.iloc[1:], "d", drop_partial=True)) == 2
+
+
+def test_streaming_resampler_matches_batch():
+    """
+    Test that `StreamingResampler` reproduces the batch resampler bar by bar.
+
+    Asserts:
+        - Completed bars equal the batch bars except the last one, which is still open.
+        - The open bar equals the batch's last bar.
+    """
+    hourly = make_hourly(24 * 10).iloc[::-1]
+    batch = resample_ohlcv(hourly, "12h")
+    resampler = StreamingResampler("12h")
+    completed = resampler.update_many(hourly)
+
+    assert len(completed) == len(batch) - 1
+    for column in ["Unix"] + OHLCV_COLUMNS:
+        np.testing.assert_allclose(completed[column].to_numpy(dtype=float), batch[column].iloc[:-1].to_numpy(dtype=float))
+        assert np.isclose(float(resampler.open_bar[column]), float(batch[column].iloc[-1]))
@@ -0,0 +1,124 @@
+"""
+test_streaming_indicators.py
+
+This module contains unit tests for the `streaming_indicators` module, which updates SMA, RSI,
+MACD and signal line values one close price at a time.
+
+Tests:
+    - test_matches_batch_indicators: Verifies streaming values equal `add_technical_indicators`.
+    - test_resume_from_saved_state: Verifies a restored engine continues exactly like an uninterrupted one.
+    - test_range_indicators_match_batch: Verifies streaming range indicators equal `add_range_indicators`
+      across a save/restore.
+    - test_ema_matches_pandas_with_nan: Verifies EMA weights values after interior NaNs like pandas.
+
+Usage:
+    Run this script using pytest:
+        pytest test_streaming_indicators.py
+"""
+import numpy as np
+import pandas as pd
+from src.indicators import add_technical_indicators, add_range_indicators
+from src.streaming_indicators import EMA, IncrementalIndicators, RangeIndicators
+
+
+def make_closes(count, seed=0):
+    """
+    Build a random-walk close price series with flat stretches (zero gains and losses).
+
+    Args:
+        count (int): Number of closes.
+        seed (int): Random seed.
+
+    Returns:
+        np.ndarray: Close prices.
+    """
+    steps = np.random.default_rng(seed).normal(0, 1, count)
+    steps[100:130] = 0.0
+    return 100 + np.cumsum(steps)
+
+
+def test_matches_batch_indicators():
+    """
+    Test that the streaming engine reproduces the batch indicators.
+
+    Asserts:
+        - Rows where the engine is ready are exactly the rows kept by `add_technical_indicators`.
+        - Every indicator matches the batch value, including the NaN RSI of flat stretches.
+    """
+    closes = make_closes(2000)
+    batch = add_technical_indicators(pd.DataFrame({"Close_1h": closes}))
+
+    engine = IncrementalIndicators()
+    streamed = engine.update_many(closes)
+    ready = streamed.dropna()
+    assert ready.index.equals(batch.index)
+    for column in streamed.columns:
+        np.testing.assert_allclose(ready[column], batch[column], rtol=1e-10, atol=1e-9, err_msg=column)
+    assert engine.ready
+
+
+def test_resume_from_saved_state(tmp_path):
+    """
+    Test saving and restoring the engine state.
+
+    Asserts:
+        - After save/load, updates continue with the same values as an engine that never stopped.
+        - The state file stays small (ring buffers only, no history).
+    """
+    closes = make_closes(500, seed=1)
+    uninterrupted = IncrementalIndicators()
+    expected = uninterrupted.update_many(closes)
+
+    engine = IncrementalIndicators()
+    engine.update_many(closes[:321])
+    path = tmp_path / "indicators.json"
+    engine.save(str(path))
+    assert path.stat().st_size < 5000
+
+    resumed = IncrementalIndicators.load(str(path))
+    continued = resumed.update_many(closes[321:], index=expected.index[321:])
+    pd.testing.assert_frame_equal(continued, expected.iloc[321:], rtol=1e-12)
+
+
+def test_range_indicators_match_batch():
+    """
+    Test `RangeIndicators` against the batch `add_range_indicators`.
+
+    Asserts:
+        - After the warmup, streaming values equal the batch values row for row, including when the state
+          is round-tripped through `to_dict`/`from_dict` halfway.
+        - `ready` is False during the warmup and True afterwards.
+    """
+    close = make_closes(300)
+    rng = np.random.default_rng(1)
+    data = pd.DataFrame({"High_1h": close + rng.random(300), "Low_1h": close - rng.random(300), "Close_1h": close})
+    expected = add_range_indicators(data.copy())
+
+    ranges = RangeIndicators()
+    first = ranges.update_many(data["High_1h"][:150], data["Low_1h"][:150], data["Close_1h"][:150])
+    ranges = RangeIndicators.from_dict(ranges.to_dict())
+    assert ranges.ready
+    second = ranges.update_many(data["High_1h"][150:], data["Low_1h"][150:], data["Close_1h"][150:])
+    streamed = pd.concat([first, second]).dropna()
+
+    assert not RangeIndicators().update_many([1.0] * 5, [0.5] * 5, [0.8] * 5).notna().all().all()
+    assert streamed.index.equals(expected.index)
+    np.testing.assert_allclose(streamed.to_numpy(), expected[streamed.columns].to_numpy(), rtol=1e-9, atol=1e-9)
+
+
+def test_ema_matches_pandas_with_nan():
+    """
+    Test `EMA` on values with leading and interior NaNs.
+
+    Asserts:
+        - Every output equals pandas `ewm(span, adjust=False).mean()`, including the value after a run
+          of NaNs, across a save/restore in the middle of that run.
+    """
+    values = [np.nan, 10.0, 11.0, np.nan, np.nan, 20.0, 21.0, np.nan, 19.0]
+    expected = pd.Series(values).ewm(span=4, adjust=False).mean().to_numpy()
+
+    ema = EMA(4)
+    streamed = [ema.update(value) for value in values[:4]]
+    ema = EMA.from_dict(ema.to_dict())
+    streamed += [ema.update(value) for value in values[4:]]
+    np.testing.assert_allclose(streamed, expected, rtol=1e-12)
@@ -7,6 +7,9 @@ testing the `add_target` function for correct binary target creation.
 Tests:
     - test_add_target: Ensures that the `add_target` function correctly assigns binary
       target values based on specified indicator confluence conditions.
+    - test_triple_barrier_matches_loop: Verifies vectorized triple-barrier labels against a per-bar scan
+      with `simulate_trading`'s exit rule, across horizons and chunk sizes.
+    - test_add_triple_barrier_target: Verifies the target columns and dropping of unresolved last bars.
 
 Usage:
     Run this script using pytest:
@@ -14,8 +17,35 @@ Usage:
 """
 
 import os
+import numpy as np
 import pandas as pd
-from src.target_creation import add_target
+from src.target_creation import add_target, triple_barrier_labels, add_triple_barrier_target
+
+
+def scan_barriers(close, profit_target, stop_loss, horizon):
+    """
+    Reference triple-barrier labels from a per-bar scan.
+
+    Args:
+        close (np.ndarray): Close prices.
+        profit_target (float): Upper barrier return.
+        stop_loss (float): Lower barrier return.
+        horizon (int): Maximum holding period in bars.
+
+    Returns:
+        tuple: (labels, bars) arrays.
+    """
+    labels = np.zeros(len(close), dtype=int)
+    bars = np.zeros(len(close), dtype=int)
+    for entry in range(len(close)):
+        bars[entry] = min(horizon, len(close) - 1 - entry)
+        for position in range(entry + 1, entry + bars[entry] + 1):
+            change = close[position] / close[entry] - 1
+            if change >= profit_target or change <= -stop_loss:
+                labels[entry] = 1 if change >= profit_target else -1
+                bars[entry] = position - entry
+                break
+    return labels, bars
 
 def test_add_target():
     """
@@ -57,3 +87,44 @@ def test_add_target():
 
     print("All tests passed for add_target!")
 
+
+def test_triple_barrier_matches_loop():
+    """
+    Test `triple_barrier_labels` against a per-bar scan.
+
+    Asserts:
+        - Labels and bars to exit equal the scan for short, odd and power-of-two horizons, with small
+          chunks (entries whose windows cross chunk boundaries) and a NaN close.
+        - Exit returns are the close-to-close returns at the exit bar.
+    """
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.005, 400)))
+    close[70] = np.nan
+    for horizon in [1, 3, 16, 37]:
+        for chunk_rows in [9, 1000]:
+            result = triple_barrier_labels(close, 0.02, 0.01, horizon, chunk_rows=chunk_rows)
+            labels, bars = scan_barriers(close, 0.02, 0.01, horizon)
+            np.testing.assert_array_equal(result["label"], labels, err_msg=f"horizon {horizon}")
+            np.testing.assert_array_equal(result["bars"], bars, err_msg=f"horizon {horizon}")
+    exits = np.arange(len(close)) + result["bars"]
+    np.testing.assert_allclose(result["exit_return"], close[exits] / close - 1)
+
+
+def test_add_triple_barrier_target():
+    """
+    Test `add_triple_barrier_target`.
+
+    Asserts:
+        - 'target' is 1 exactly where the profit barrier is hit first.
+        - Last bars without a barrier hit and without a full horizon are dropped, others kept.
+        - The look-ahead barrier columns are only added with details=True.
+    """
+    close = [100.0, 101.0, 103.0, 102.0, 100.5, 99.0, 100.0, 100.2, 100.1, 100.3]
+    data = pd.DataFrame({"Close_1h": close})
+    assert list(add_triple_barrier_target(data.copy(), horizon=3).columns) == ["Close_1h", "target"]
+    result = add_triple_barrier_target(data.copy(), profit_target=0.02, stop_loss=0.01, horizon=3, details=True)
+
+    assert result["barrier"].tolist()[:6] == [1, 0, -1, -1, -1, 0]
+    assert (result["target"] == (result["barrier"] == 1)).all()
+    assert result.index.tolist() == [0, 1, 2, 3, 4, 5, 6]
+    assert len(add_triple_barrier_target(data.copy(), horizon=3, drop_incomplete=False)) == len(close)
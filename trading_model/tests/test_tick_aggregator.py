@@ -0,0 +1,100 @@
+"""
+test_tick_aggregator.py
+
+This module contains unit tests for the `tick_aggregator` module, which builds OHLCV bars
+from trade prints processed in chunks.
+
+Tests:
+    - test_chunking_does_not_change_bars: Verifies bars are identical for any chunking of the ticks.
+    - test_bars_match_pandas: Verifies bars against a pandas resampling reference.
+    - test_out_of_order_ticks_rejected: Verifies ticks going back in time raise ValueError.
+
+Usage:
+    Run this script using pytest:
+        pytest test_tick_aggregator.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.tick_aggregator import TickAggregator, aggregate_ticks, BAR_COLUMNS
+
+MINUTE_MS = 60000
+
+
+def make_ticks(count, seed=0):
+    """
+    Build synthetic trade prints with irregular spacing.
+
+    Args:
+        count (int): Number of ticks.
+        seed (int): Random seed.
+
+    Returns:
+        pd.DataFrame: Ticks with 'timestamp' (ms), 'price' and 'qty' columns in time order.
+    """
+    rng = np.random.default_rng(seed)
+    timestamp = 1700006400000 + np.cumsum(rng.integers(0, 5000, count))
+    return pd.DataFrame({
+        "timestamp": timestamp,
+        "price": 100 + np.cumsum(rng.normal(0, 0.1, count)),
+        "qty": rng.random(count),
+    })
+
+
+def test_chunking_does_not_change_bars():
+    """
+    Test that chunk boundaries do not affect the aggregated bars.
+
+    Asserts:
+        - One big chunk and many uneven chunks (split inside bars) give identical bars.
+        - The output has the pipeline's OHLCV columns plus Date and Symbol.
+    """
+    ticks = make_ticks(5000)
+    whole = pd.concat(aggregate_ticks([ticks], "1m", symbol="BTCUSDT"), ignore_index=True)
+    cuts = [0, 1, 7, 500, 501, 2333, 4999, 5000]
+    chunks = [ticks.iloc[a:b] for a, b in zip(cuts[:-1], cuts[1:])]
+    chunked = pd.concat(aggregate_ticks(chunks, "1m", symbol="BTCUSDT"), ignore_index=True)
+
+    pd.testing.assert_frame_equal(whole, chunked)
+    assert list(whole.columns) == ["Unix", "Date", "Symbol"] + BAR_COLUMNS[1:]
+    assert whole["tradecount"].sum() == len(ticks)
+
+
+def test_bars_match_pandas():
+    """
+    Test the aggregated bars against pandas resampling of the same ticks.
+
+    Asserts:
+        - Unix, OHLC, volumes and trade counts match the reference for 5m bars.
+    """
+    ticks = make_ticks(3000, seed=1)
+    bars = pd.concat(aggregate_ticks([ticks.iloc[:1000], ticks.iloc[1000:]], "5m"), ignore_index=True)
+
+    frame = ticks.assign(quote=ticks["price"] * ticks["qty"])
+    frame.index = pd.to_datetime(frame["timestamp"], unit="ms")
+    grouped = frame.resample("5min")
+    reference = pd.DataFrame({
+        "Open": grouped["price"].first(), "High": grouped["price"].max(), "Low": grouped["price"].min(),
+        "Close": grouped["price"].last(), "Volume BTC": grouped["qty"].sum(),
+        "Volume USDT": grouped["quote"].sum(), "tradecount": grouped["price"].count(),
+    })
+    reference = reference[reference["tradecount"] > 0]
+
+    assert bars["Unix"].tolist() == reference.index.as_unit("ms").asi8.tolist()
+    for column in BAR_COLUMNS[1:]:
+        np.testing.assert_allclose(bars[column].to_numpy(dtype=float), reference[column].to_numpy(dtype=float))
+
+
+def test_out_of_order_ticks_rejected():
+    """
+    Test that ticks going back in time are rejected.
+
+    Asserts:
+        - An unsorted chunk and a chunk older than the previous one raise ValueError.
+    """
+    aggregator = TickAggregator("1m")
+    with pytest.raises(ValueError):
+        aggregator.process_chunk([2 * MINUTE_MS, MINUTE_MS], [1.0, 1.0], [1.0, 1.0])
+    aggregator.process_chunk([5 * MINUTE_MS], [1.0], [1.0])
+    with pytest.raises(ValueError):
+        aggregator.process_chunk([4 * MINUTE_MS], [1.0], [1.0])
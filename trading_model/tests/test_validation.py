@@ -0,0 +1,73 @@
+"""
+test_validation.py
+
+This module contains unit tests for the `validation` module, which runs walk-forward
+cross-validation.
+
+Tests:
+    - test_walk_forward_splits: Verifies expanding/rolling windows and purge/embargo gaps.
+    - test_walk_forward_validate_parallel_matches_serial: Verifies per-fold metrics from memory-mapped
+      worker processes equal the serial run.
+
+Usage:
+    Run this script using pytest:
+        pytest test_validation.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.validation import walk_forward_splits, walk_forward_validate
+
+
+def test_walk_forward_splits():
+    """
+    Test `walk_forward_splits`.
+
+    Asserts:
+        - Test windows are consecutive, end at the last row and always follow their training window.
+        - Expanding windows start at row 0; rolling windows keep `train_size` rows.
+        - `purge` rows separate training from the test window and `embargo` rows open the test window.
+        - Impossible layouts raise ValueError.
+    """
+    expanding = walk_forward_splits(120, n_splits=5)
+    assert [(f.test_start, f.test_stop) for f in expanding] == [(20, 40), (40, 60), (60, 80), (80, 100), (100, 120)]
+    assert all(f.train_start == 0 and f.train_stop == f.test_start for f in expanding)
+
+    rolling = walk_forward_splits(120, n_splits=4, test_size=20, train_size=30, mode="rolling", purge=5, embargo=2)
+    for fold in rolling:
+        window_start = fold.test_start - 2
+        assert fold.train_stop == window_start - 5
+        assert fold.train_stop - fold.train_start == min(30, fold.train_stop)
+        assert fold.test_stop == window_start + 20
+    assert rolling[-1].test_stop == 120
+
+    with pytest.raises(ValueError):
+        walk_forward_splits(120, n_splits=5, purge=30)
+    with pytest.raises(ValueError):
+        walk_forward_splits(120, mode="rolling")
+
+
+def test_walk_forward_validate_parallel_matches_serial():
+    """
+    Test `walk_forward_validate` in a process pool against a serial run.
+
+    Asserts:
+        - One row per fold with the fold ranges and metrics; window times come from the DatetimeIndex.
+        - Workers reading the memory-mapped matrix give exactly the serial metrics.
+        - A learnable target scores well above chance.
+    """
+    rows = 600
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(rows, 3)), columns=["a", "b", "c"],
+                     index=pd.date_range("2024-01-01", periods=rows, freq="h"))
+    y = pd.Series((X["a"] + 0.1 * rng.normal(size=rows) > 0).astype(int), index=X.index)
+    folds = walk_forward_splits(rows, n_splits=3, purge=2)
+
+    serial = walk_forward_validate(X, y, folds, workers=1)
+    parallel = walk_forward_validate(X, y, folds, workers=2)
+
+    assert len(serial) == 3
+    assert serial["test_from"].iloc[0] == X.index[folds[0].test_start]
+    columns = ["fold", "train_rows", "test_rows", "accuracy", "precision", "recall", "positive_rate"]
+    pd.testing.assert_frame_equal(serial[columns], parallel[columns])
+    assert (serial["accuracy"] > 0.8).all()